@@ -0,0 +1,76 @@
+"""Benchmark loading a large lockfile as records and as full requirements.
+
+Builds a synthetic lockfile of named, hashed and marked entries and compares
+the time and peak memory of :meth:`Lockfile.iter_records` against
+:meth:`Lockfile.get_requirements`::
+
+    python benchmarks/bench_lockfile_records.py
+"""
+import json
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+
+from requirementslib.models.lockfile import Lockfile
+
+PACKAGE_COUNT = 1000
+
+
+def synthetic_lockfile(count=PACKAGE_COUNT):
+    entries = {}
+    for index in range(count):
+        entry = {
+            "version": "=={0}.{1}.0".format(index % 7, index % 13),
+            "hashes": [
+                "sha256:{0:064x}".format(index * 2),
+                "sha256:{0:064x}".format(index * 2 + 1),
+            ],
+        }
+        if index % 3 == 0:
+            entry["markers"] = "python_version >= '3.{0}'".format(index % 10)
+        if index % 11 == 0:
+            entry["extras"] = ["extra"]
+        entries["package-{0}".format(index)] = entry
+    return {
+        "_meta": {
+            "hash": {"sha256": "0" * 64},
+            "pipfile-spec": 6,
+            "requires": {},
+            "sources": [
+                {"name": "pypi", "url": "https://pypi.org/simple", "verify_ssl": True}
+            ],
+        },
+        "default": entries,
+        "develop": {},
+    }
+
+
+def measure(load, repeat):
+    elapsed = min(timeit.repeat(load, number=1, repeat=repeat))
+    tracemalloc.start()
+    result = load()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def main(repeat=5):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "Pipfile.lock"
+        path.write_text(json.dumps(synthetic_lockfile()))
+        lockfile = Lockfile.load(tmpdir)
+        slow, slow_peak = measure(lambda: list(lockfile.get_requirements()), repeat)
+        fast, fast_peak = measure(lambda: list(lockfile.iter_records()), repeat)
+    print("{0} lockfile entries".format(PACKAGE_COUNT))
+    print("requirements: {0:.4f}s, peak {1:.1f} KiB".format(slow, slow_peak / 1024.0))
+    print(
+        "records: {0:.4f}s ({1:.1f}x), peak {2:.1f} KiB".format(
+            fast, slow / fast, fast_peak / 1024.0
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark deep merging lockfile categories.
+
+Compares :func:`requirementslib.utils.merge_items` against the previous
+implementation built on :func:`requirementslib.utils.remap`, merging several
+synthetic lockfile categories with overlapping packages::
+
+    python benchmarks/bench_merge_items.py
+"""
+import timeit
+
+from requirementslib.utils import (
+    default_visit,
+    dict_path_enter,
+    dict_path_exit,
+    get_path,
+    merge_items,
+    remap,
+)
+
+CATEGORIES = 3
+PACKAGE_COUNT = 2000
+
+
+def remap_merge_items(target_list, sourced=False):
+    if not sourced:
+        target_list = [(id(t), t) for t in target_list]
+
+    ret = None
+    source_map = {}
+
+    def remerge_enter(path, key, value):
+        new_parent, new_items = dict_path_enter(path, key, value)
+        if ret and not path and key is None:
+            new_parent = ret
+        try:
+            cur_val = get_path(ret, path + (key,))
+        except KeyError:
+            pass
+        else:
+            new_parent = cur_val
+        return new_parent, new_items
+
+    def remerge_exit(path, key, old_parent, new_parent, new_items):
+        return dict_path_exit(path, key, old_parent, new_parent, new_items)
+
+    for t_name, target in target_list:
+        if sourced:
+
+            def remerge_visit(path, key, value):
+                source_map[path + (key,)] = t_name  # noqa: B023
+                return True
+
+        else:
+            remerge_visit = default_visit
+
+        ret = remap(target, enter=remerge_enter, visit=remerge_visit, exit=remerge_exit)
+
+    if not sourced:
+        return ret
+    return ret, source_map
+
+
+def synthetic_categories(categories=CATEGORIES, count=PACKAGE_COUNT):
+    sections = []
+    for category in range(categories):
+        section = {}
+        for index in range(category * count // 2, category * count // 2 + count):
+            section["package-{0}".format(index)] = {
+                "version": "=={0}.0".format(category),
+                "hashes": ["sha256:{0:064x}".format(index * 2 + n) for n in range(2)],
+                "markers": "python_version >= '3.{0}'".format(index % 10),
+            }
+        sections.append(section)
+    return sections
+
+
+def main(repeat=5):
+    sections = synthetic_categories()
+    named = [("category-{0}".format(i), s) for i, s in enumerate(sections)]
+    assert merge_items(sections) == remap_merge_items(sections)
+    assert merge_items(named, sourced=True) == remap_merge_items(named, sourced=True)
+    print("{0} categories of {1} packages".format(CATEGORIES, PACKAGE_COUNT))
+    for label, args, kwargs in (
+        ("merge", (sections,), {}),
+        ("sourced merge", (named,), {"sourced": True}),
+    ):
+        slow = min(
+            timeit.repeat(
+                lambda: remap_merge_items(*args, **kwargs), number=1, repeat=repeat
+            )
+        )
+        fast = min(
+            timeit.repeat(lambda: merge_items(*args, **kwargs), number=1, repeat=repeat)
+        )
+        print(
+            "{0}: remap {1:.4f}s, merge_items {2:.4f}s ({3:.1f}x)".format(
+                label, slow, fast, slow / fast
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
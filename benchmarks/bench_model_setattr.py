@@ -0,0 +1,68 @@
+"""Benchmark attribute assignment on the requirementslib models.
+
+Compares :meth:`Requirement.from_line` throughput, and the cost of a single
+assignment, with the per-class attribute set of
+:class:`~requirementslib.models.common.ReqLibBaseModel` against the previous
+implementation which rebuilt the set of private attributes on every assignment::
+
+    python benchmarks/bench_model_setattr.py
+"""
+import sys
+import timeit
+from pathlib import Path
+from unittest import mock
+
+from pydantic import Extra
+
+from requirementslib.models.common import ReqLibBaseModel
+from requirementslib.models.requirements import Line, Requirement
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_named_requirements import lockfile_lines  # noqa: E402
+
+
+def per_assignment_setattr(self, name, value):
+    private_attributes = {
+        field_name for field_name in self.__annotations__ if field_name.startswith("_")
+    }
+    if name in private_attributes or name in self.__fields__:
+        return object.__setattr__(self, name, value)
+    if self.__config__.extra is not Extra.allow and name not in self.__fields__:
+        raise ValueError(f'"{self.__class__.__name__}" object has no field "{name}"')
+    object.__setattr__(self, name, value)
+
+
+def parse_all(lines):
+    return [Requirement.from_line(line, parse_setup_info=False) for line in lines]
+
+
+def assign(line, count=1000):
+    for _ in range(count):
+        line._name = "requests"
+        line.markers = None
+
+
+def main(repeat=5):
+    lines = lockfile_lines()
+    line = Line("requests")
+    current = min(timeit.repeat(lambda: parse_all(lines), number=1, repeat=repeat))
+    current_set = min(timeit.repeat(lambda: assign(line), number=1, repeat=repeat))
+    with mock.patch.object(ReqLibBaseModel, "__setattr__", per_assignment_setattr):
+        legacy = min(timeit.repeat(lambda: parse_all(lines), number=1, repeat=repeat))
+        legacy_set = min(timeit.repeat(lambda: assign(line), number=1, repeat=repeat))
+    print("{0} lines".format(len(lines)))
+    print(
+        "from_line: {0:.0f} lines/s, previously {1:.0f} lines/s ({2:.2f}x)".format(
+            len(lines) / current, len(lines) / legacy, legacy / current
+        )
+    )
+    print(
+        "2000 assignments: {0:.4f}s, previously {1:.4f}s ({2:.1f}x)".format(
+            current_set, legacy_set, legacy_set / current_set
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
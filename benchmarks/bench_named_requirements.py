@@ -0,0 +1,47 @@
+"""Benchmark parsing plain named requirement lines.
+
+Compares the PEP 508 fast path in :meth:`Requirement.from_line` against the
+generic :class:`Line` parser, using the entries of the lockfile fixture::
+
+    python benchmarks/bench_named_requirements.py
+"""
+import json
+import timeit
+from pathlib import Path
+from unittest import mock
+
+from requirementslib.models import requirements
+from requirementslib.models.requirements import Requirement
+
+LOCKFILE = Path(__file__).parent.parent / "tests/fixtures/lockfile/Pipfile.lock"
+
+
+def lockfile_lines(path=LOCKFILE):
+    lockfile = json.loads(path.read_text())
+    lines = []
+    for section in ("default", "develop"):
+        for name, entry in lockfile.get(section, {}).items():
+            line = "{0}{1}".format(name, entry.get("version", ""))
+            if entry.get("markers"):
+                line = "{0} ; {1}".format(line, entry["markers"])
+            hashes = " ".join("--hash={0}".format(h) for h in entry.get("hashes", []))
+            lines.append("{0} {1}".format(line, hashes).strip())
+    return lines
+
+
+def parse_all(lines):
+    return [Requirement.from_line(line, parse_setup_info=False) for line in lines]
+
+
+def main(repeat=5):
+    lines = lockfile_lines()
+    fast = min(timeit.repeat(lambda: parse_all(lines), number=1, repeat=repeat))
+    with mock.patch.object(requirements, "is_named_requirement_line", return_value=False):
+        slow = min(timeit.repeat(lambda: parse_all(lines), number=1, repeat=repeat))
+    print("{0} lines from {1}".format(len(lines), LOCKFILE.name))
+    print("generic parser: {0:.4f}s".format(slow))
+    print("named fast path: {0:.4f}s ({1:.1f}x)".format(fast, slow / fast))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+Setup info, index JSON responses and isolated build environments are now cached on disk beneath ``REQUIREMENTSLIB_CACHE_DIR``, so repeated runs avoid rebuilding and refetching them.  The caches are bounded by ``REQUIREMENTSLIB_SETUP_INFO_CACHE_SIZE``, ``REQUIREMENTSLIB_HTTP_CACHE_SIZE`` and ``REQUIREMENTSLIB_BUILD_ENV_CACHE_SIZE``, and setting a size to ``0`` disables that cache.
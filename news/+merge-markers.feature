@@ -0,0 +1 @@
+``merge_markers`` now simplifies the combined marker, dropping comparisons already implied by the other marker, so merging the same markers repeatedly no longer grows the result.
@@ -0,0 +1 @@
+``Pipfile.load`` and ``Lockfile.load`` accept ``parallel`` and ``max_workers`` to resolve the setup info of path, file and VCS requirements in a pool of worker processes.
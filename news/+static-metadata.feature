@@ -0,0 +1 @@
+Metadata is read statically from ``pyproject.toml``, ``setup.cfg`` or literal ``setup.py`` arguments when possible instead of running a build.  Set ``REQUIREMENTSLIB_STATIC_METADATA=0`` to always build the package.
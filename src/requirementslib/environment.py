@@ -15,3 +15,26 @@ REQUIREMENTSLIB_CACHE_DIR = os.getenv(
     "REQUIREMENTSLIB_CACHE_DIR", user_cache_dir("pipenv")
 )
 MYPY_RUNNING = os.environ.get("MYPY_RUNNING", is_type_checking())
+REQUIREMENTSLIB_SETUP_INFO_CACHE_SIZE = int(
+    os.getenv("REQUIREMENTSLIB_SETUP_INFO_CACHE_SIZE", 32 * 1024 * 1024)
+)
+REQUIREMENTSLIB_BUILD_ENV_CACHE_SIZE = int(
+    os.getenv("REQUIREMENTSLIB_BUILD_ENV_CACHE_SIZE", 1024 * 1024 * 1024)
+)
+REQUIREMENTSLIB_HTTP_RETRIES = int(os.getenv("REQUIREMENTSLIB_HTTP_RETRIES", 3))
+REQUIREMENTSLIB_HTTP_BACKOFF = float(os.getenv("REQUIREMENTSLIB_HTTP_BACKOFF", 0.5))
+REQUIREMENTSLIB_HTTP_POOL_SIZE = int(os.getenv("REQUIREMENTSLIB_HTTP_POOL_SIZE", 10))
+REQUIREMENTSLIB_HTTP_TIMEOUT = float(os.getenv("REQUIREMENTSLIB_HTTP_TIMEOUT", 30))
+REQUIREMENTSLIB_ASYNC_CONCURRENCY = int(
+    os.getenv("REQUIREMENTSLIB_ASYNC_CONCURRENCY", REQUIREMENTSLIB_HTTP_POOL_SIZE)
+)
+REQUIREMENTSLIB_HTTP_CACHE_SIZE = int(
+    os.getenv("REQUIREMENTSLIB_HTTP_CACHE_SIZE", 128 * 1024 * 1024)
+)
+REQUIREMENTSLIB_HTTP_CACHE_TTL = int(os.getenv("REQUIREMENTSLIB_HTTP_CACHE_TTL", 600))
+REQUIREMENTSLIB_MARKER_CACHE_SIZE = int(
+    os.getenv("REQUIREMENTSLIB_MARKER_CACHE_SIZE", 4096)
+)
+REQUIREMENTSLIB_STATIC_METADATA = os.getenv(
+    "REQUIREMENTSLIB_STATIC_METADATA", "1"
+).lower() not in ("0", "false", "no", "off")
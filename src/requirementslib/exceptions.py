@@ -94,3 +94,7 @@ class PipfileNotFound(FileNotFoundError):
         self.errno = errno.ENOENT
         self.filename = path
         super(PipfileNotFound, self).__init__(self.filename)
+
+
+class HTTPRangeRequestUnsupported(Exception):
+    pass
@@ -5,11 +5,12 @@ import os
 import posixpath
 import sys
 import warnings
+from bisect import bisect_left, bisect_right
 from contextlib import closing, contextmanager
 from http.client import HTTPResponse as Urllib_HTTPResponse
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import IO, Any, ContextManager, Iterator, Optional, Text, TypeVar, Union
+from tempfile import SpooledTemporaryFile, TemporaryDirectory, TemporaryFile
+from typing import IO, Any, ContextManager, Iterator, List, Optional, Text, TypeVar, Union
 from urllib import parse as urllib_parse
 from urllib import request as urllib_request
 from urllib.parse import quote, urlparse
@@ -17,7 +18,11 @@ from urllib.parse import quote, urlparse
 from requests import Session
 from urllib3.response import HTTPResponse as Urllib3_HTTPResponse
 
+from .exceptions import HTTPRangeRequestUnsupported
+from .sessions import get_session
+
 _T = TypeVar("_T")
+CONTENT_CHUNK_SIZE = 10 * 1024
 
 
 @contextmanager
@@ -143,16 +148,164 @@ def path_to_url(path):
     return "file://{}".format(quote(path, errors="backslashreplace"))
 
 
+class HTTPRangeFile(io.RawIOBase):
+    """A read-only, seekable file object for a remote URL which fetches only
+    the byte ranges that are actually read, using HTTP range requests.
+
+    Downloaded ranges are stored in a sparse temporary file so that no byte is
+    fetched twice.  This allows reading a single member of a large zip archive,
+    such as the ``METADATA`` file of a wheel, without downloading the whole file.
+
+    :param str url: The URL of the remote file
+    :param Session session: A :class:`~requests.Session` instance
+    :param int chunk_size: The minimum number of bytes to request at a time
+    :raises HTTPRangeRequestUnsupported: If the server does not report the length
+        of the file or does not accept byte range requests.
+    """
+
+    def __init__(self, url, session, chunk_size=CONTENT_CHUNK_SIZE):
+        # type: (str, Session, int) -> None
+        super(HTTPRangeFile, self).__init__()
+        headers = {"Accept-Encoding": "identity"}
+        head = session.head(url, headers=headers, allow_redirects=True)
+        if not head.ok:
+            raise HTTPRangeRequestUnsupported(
+                "HEAD request failed with status {0}".format(head.status_code)
+            )
+        if head.headers.get("Accept-Ranges", "none").lower() != "bytes":
+            raise HTTPRangeRequestUnsupported("range requests are not supported")
+        try:
+            self._length = int(head.headers["Content-Length"])
+        except (KeyError, ValueError):
+            raise HTTPRangeRequestUnsupported("content length is not available")
+        self._url = head.url
+        self._session = session
+        self._chunk_size = chunk_size
+        self._pos = 0
+        self._complete = False
+        self._left = []  # type: List[int]
+        self._right = []  # type: List[int]
+        self._file = TemporaryFile()
+        self._file.truncate(self._length)
+
+    @property
+    def url(self):
+        # type: () -> str
+        return self._url
+
+    def __len__(self):
+        # type: () -> int
+        return self._length
+
+    def readable(self):
+        # type: () -> bool
+        return True
+
+    def seekable(self):
+        # type: () -> bool
+        return True
+
+    def tell(self):
+        # type: () -> int
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # type: (int, int) -> int
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._length + offset
+        else:
+            raise ValueError("Invalid whence value: {0!r}".format(whence))
+        if pos < 0:
+            raise ValueError("Negative seek position {0}".format(pos))
+        self._pos = pos
+        return self._pos
+
+    def read(self, size=-1):
+        # type: (int) -> bytes
+        start = self._pos
+        stop = self._length if size is None or size < 0 else start + size
+        stop = min(stop, self._length)
+        if start >= stop:
+            return b""
+        self._ensure_downloaded(start, max(stop, start + self._chunk_size) - 1)
+        self._file.seek(start)
+        data = self._file.read(stop - start)
+        self._pos = start + len(data)
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self):
+        # type: () -> None
+        if not self.closed:
+            self._file.close()
+        super(HTTPRangeFile, self).close()
+
+    def _ensure_downloaded(self, start, end):
+        # type: (int, int) -> None
+        """Download every byte in the inclusive range ``start..end`` which has
+        not already been fetched."""
+        end = min(end, self._length - 1)
+        left = bisect_left(self._right, start)
+        right = bisect_right(self._left, end)
+        cursor = start
+        for fetched_start, fetched_end in zip(
+            self._left[left:right], self._right[left:right]
+        ):
+            if fetched_start > cursor:
+                self._fetch(cursor, fetched_start - 1)
+            cursor = fetched_end + 1
+        if cursor <= end:
+            self._fetch(cursor, end)
+        if self._complete:
+            self._left, self._right = [0], [self._length - 1]
+            return
+        self._left[left:right] = [min([start] + self._left[left:right])]
+        self._right[left:right] = [max([end] + self._right[left:right])]
+
+    def _fetch(self, start, end):
+        # type: (int, int) -> None
+        if self._complete:
+            return
+        headers = {
+            "Accept-Encoding": "identity",
+            "Range": "bytes={0}-{1}".format(start, end),
+        }
+        with self._session.get(self._url, headers=headers, stream=True) as resp:
+            resp.raise_for_status()
+            if resp.status_code != 206:
+                # The server ignored the range and sent the entire file instead
+                start = 0
+                self._complete = True
+            self._file.seek(start)
+            for chunk in resp.iter_content(self._chunk_size):
+                self._file.write(chunk)
+
+
 @contextmanager
 def open_file(
-    link: Union[_T, str], session: Optional[Session] = None, stream: bool = True
+    link: Union[_T, str],
+    session: Optional[Session] = None,
+    stream: bool = True,
+    seekable: bool = False,
 ) -> ContextManager[Union[IO[bytes], Urllib3_HTTPResponse, Urllib_HTTPResponse]]:
     """Open local or remote file for reading.
 
     :param pip._internal.index.Link link: A link object from resolving dependencies with
         pip, or else a URL.
-    :param Optional[Session] session: A :class:`~requests.Session` instance
+    :param Optional[Session] session: A :class:`~requests.Session` instance, defaults
+        to the shared pooled session
     :param bool stream: Whether to stream the content if remote, default True
+    :param bool seekable: Whether a remote file must support random access, default
+        False.  When set, the content is fetched lazily with HTTP range requests
+        where the server supports them, or downloaded in full otherwise.
     :raises ValueError: If link points to a local directory.
     :return: a context manager to the opened file-like object
     """
@@ -177,27 +330,24 @@ def open_file(
         # Remote URL
         headers = {"Accept-Encoding": "identity"}
         if not session:
+            session = get_session()
+        if seekable:
             try:
-                from requests import Session  # noqa
-            except ImportError:
-                session = None
-            else:
-                session = Session()
-        if session is None:
-            with closing(urllib_request.urlopen(link)) as f:
-                yield f
+                remote_file = HTTPRangeFile(link, session)
+            except HTTPRangeRequestUnsupported:
+                remote_file = SpooledTemporaryFile(max_size=CONTENT_CHUNK_SIZE * 100)
+                with session.get(link, headers=headers, stream=True) as resp:
+                    resp.raise_for_status()
+                    for chunk in resp.iter_content(CONTENT_CHUNK_SIZE):
+                        remote_file.write(chunk)
+                remote_file.seek(0)
+            with closing(remote_file):
+                yield remote_file
         else:
+            # Closing the response hands a fully read connection back to the pool
             with session.get(link, headers=headers, stream=stream) as resp:
-                try:
-                    raw = getattr(resp, "raw", None)
-                    result = raw if raw else resp
-                    yield result
-                finally:
-                    if raw:
-                        conn = raw._connection
-                        if conn is not None:
-                            conn.close()
-                    result.close()
+                raw = getattr(resp, "raw", None)
+                yield raw if raw else resp
 
 
 @contextmanager
@@ -252,6 +402,19 @@ def create_tracked_tempdir(*args: Any, **kwargs: Any) -> str:
     return tempdir.name
 
 
+def release_tracked_tempdirs() -> None:
+    """Stop tracking the temporary directories created so far.
+
+    The directories are left on disk when the program exits, so their
+    removal becomes the responsibility of whoever owns the parent
+    directory.
+    """
+    while TRACKED_TEMPORARY_DIRECTORIES:
+        tempdir = TRACKED_TEMPORARY_DIRECTORIES.pop()
+        atexit.unregister(tempdir.cleanup)
+        tempdir._finalizer.detach()
+
+
 def check_for_unc_path(path):
     # type: (Path) -> bool
     """Checks to see if a pathlib `Path` object is a unc path or not."""
@@ -0,0 +1,609 @@
+"""Persistent caches stored beneath :data:`~requirementslib.environment.REQUIREMENTSLIB_CACHE_DIR`."""
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import sysconfig
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from pip._vendor.packaging.requirements import InvalidRequirement, Requirement
+
+from ..environment import (
+    REQUIREMENTSLIB_BUILD_ENV_CACHE_SIZE,
+    REQUIREMENTSLIB_CACHE_DIR,
+    REQUIREMENTSLIB_HTTP_CACHE_SIZE,
+    REQUIREMENTSLIB_HTTP_CACHE_TTL,
+    REQUIREMENTSLIB_SETUP_INFO_CACHE_SIZE,
+)
+from ..fileutils import url_to_path
+from ..sessions import get_session
+from .utils import split_ref_from_uri
+
+COMMIT_SHA_RE = re.compile(r"^[0-9a-fA-F]{40}([0-9a-fA-F]{24})?$")
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def hash_file(path: str, hash_name: str = "sha256", chunk_size: int = 65536) -> str:
+    """Compute the hex digest of the file at **path** in fixed-size chunks.
+
+    :param str path: The path to the file to hash
+    :param str hash_name: The name of the :mod:`hashlib` algorithm, default sha256
+    :param int chunk_size: The number of bytes to read at a time
+    :return: The hex digest of the file contents
+    :rtype: str
+    """
+    digest = hashlib.new(hash_name)
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class JSONFileCache(object):
+    """A bounded on-disk cache storing one JSON document per key, evicting the
+    least recently used entries first.
+
+    :param str cache_dir: The directory to store entries in
+    :param int max_size: The maximum size of the cache in bytes, ``0`` disables it
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_dir, max_size):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+
+    def __repr__(self):
+        return "{0}(cache_dir={1!r}, max_size={2!r})".format(
+            self.__class__.__name__, self.cache_dir.as_posix(), self.max_size
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _path_for(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.cache_dir.joinpath("{0}.json".format(digest))
+
+    def _iter_entries(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        if not self.cache_dir.is_dir():
+            return
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                yield path, path.stat()
+            except OSError:
+                continue
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retrieve the cached document for **key**, marking it as recently
+        used.
+
+        :param str key: The cache key
+        :return: The cached dictionary or None on a miss
+        :rtype: Optional[Dict[str, Any]]
+        """
+        if not self.enabled:
+            return None
+        path = self._path_for(key)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if payload.get("version") != self.VERSION or payload.get("key") != key:
+            self.invalidate(key)
+            return None
+        try:
+            os.utime(path.as_posix(), None)
+        except OSError:
+            pass
+        return payload.get("info")
+
+    def set(self, key: str, info: Dict[str, Any]) -> None:
+        """Store **info** under **key** and evict old entries if the cache
+        exceeds its size limit.
+
+        :param str key: The cache key
+        :param Dict[str, Any] info: A JSON serializable dictionary
+        """
+        if not self.enabled:
+            return
+        path = self._path_for(key)
+        payload = json.dumps(
+            {"version": self.VERSION, "key": key, "info": info}, sort_keys=True
+        )
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".{0}.tmp".format(os.getpid()))
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path.as_posix(), path.as_posix())
+        except OSError:
+            return
+        self.evict()
+
+    def invalidate(self, key: str) -> bool:
+        """Remove the entry for **key** from the cache.
+
+        :param str key: The cache key
+        :return: Whether an entry was removed
+        :rtype: bool
+        """
+        try:
+            self._path_for(key).unlink()
+        except OSError:
+            return False
+        return True
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        for path, _ in list(self._iter_entries()):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits within
+        ``max_size``."""
+        entries = sorted(self._iter_entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_size:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= stat.st_size
+
+
+class SetupInfoCache(JSONFileCache):
+    """A content-addressed on-disk cache of
+    :class:`~requirementslib.models.setup_info.SetupInfo` metadata.
+
+    Entries are keyed by the hash of the source archive or the commit sha of a
+    VCS checkout (plus the subdirectory and requested extras), so a cached entry
+    can never go stale: different content always produces a different key.  The
+    cache is bounded by ``max_size`` bytes and the least recently used entries
+    are evicted first.
+
+    :param Optional[str] cache_dir: The directory to store entries in, defaults to
+        ``REQUIREMENTSLIB_CACHE_DIR/setup-info``
+    :param int max_size: The maximum size of the cache in bytes, ``0`` disables it
+    """
+
+    def __init__(self, cache_dir=None, max_size=REQUIREMENTSLIB_SETUP_INFO_CACHE_SIZE):
+        if cache_dir is None:
+            cache_dir = os.path.join(REQUIREMENTSLIB_CACHE_DIR, "setup-info")
+        super(SetupInfoCache, self).__init__(cache_dir, max_size)
+
+    @staticmethod
+    def make_key(ireq, subdirectory: Optional[str] = None) -> Optional[str]:
+        """Build a content-addressed cache key for an
+        :class:`~pip._internal.req.req_install.InstallRequirement`.
+
+        Only immutable sources produce a key: archives with a known hash (either
+        from the link fragment or by hashing a local file) and VCS links pinned
+        to a full commit sha.  Everything else returns ``None``.
+
+        :param ireq: The install requirement to build a key for
+        :param Optional[str] subdirectory: The subdirectory containing the project
+        :return: A cache key, or None if the source is not content-addressable
+        :rtype: Optional[str]
+        """
+        link = getattr(ireq, "link", None)
+        if link is None:
+            return None
+        if link.is_vcs:
+            _, ref = split_ref_from_uri(link.url_without_fragment)
+            if not ref or not COMMIT_SHA_RE.match(ref):
+                return None
+            source = "vcs:{0}".format(ref.lower())
+        elif link.hash_name and link.hash:
+            source = "archive:{0}={1}".format(link.hash_name, link.hash)
+        elif link.scheme == "file" and not link.is_existing_dir():
+            path = url_to_path(link.url_without_fragment)
+            if not os.path.isfile(path):
+                return None
+            source = "archive:sha256={0}".format(hash_file(path))
+        else:
+            return None
+        if subdirectory is None:
+            subdirectory = link.subdirectory_fragment
+        extras = ",".join(sorted(getattr(ireq, "extras", None) or ()))
+        return "{0}:{1}:{2}".format(source, subdirectory or "", extras)
+
+
+class HTTPCache(JSONFileCache):
+    """An on-disk cache of JSON API responses, revalidated with conditional
+    requests.
+
+    Responses are stored with their ``ETag``, ``Last-Modified`` and
+    ``X-PyPI-Last-Serial`` headers.  A stored response is served without touching
+    the network until it is older than the ``Cache-Control: max-age`` the server
+    sent (or ``ttl`` if it sent none); after that the next request carries
+    ``If-None-Match`` / ``If-Modified-Since`` and a ``304`` simply refreshes the
+    stored copy.  Documents are also memoized in-process, so a single run
+    does not request the same URL twice; the memo holds the serialized documents
+    of the most recently used URLs up to ``max_size`` bytes and decodes a fresh
+    copy for every caller.
+
+    :param Optional[str] cache_dir: The directory to store entries in, defaults to
+        ``REQUIREMENTSLIB_CACHE_DIR/http-json``
+    :param int max_size: The maximum size of the cache in bytes, which also bounds
+        the in-process memo, ``0`` disables both
+    :param int ttl: The freshness lifetime in seconds of responses which do not
+        specify one
+    """
+
+    def __init__(
+        self,
+        cache_dir=None,
+        max_size=REQUIREMENTSLIB_HTTP_CACHE_SIZE,
+        ttl=REQUIREMENTSLIB_HTTP_CACHE_TTL,
+    ):
+        if cache_dir is None:
+            cache_dir = os.path.join(REQUIREMENTSLIB_CACHE_DIR, "http-json")
+        super(HTTPCache, self).__init__(cache_dir, max_size)
+        self.ttl = ttl
+        self._memo = OrderedDict()  # type: OrderedDict[str, str]
+        self._memo_size = 0
+        self._url_locks = {}  # type: Dict[str, threading.Lock]
+        self._lock = threading.Lock()
+
+    def clear_memo(self) -> None:
+        """Forget every document memoized by this process."""
+        with self._lock:
+            self._memo.clear()
+            self._memo_size = 0
+            self._url_locks.clear()
+
+    def _get_memo(self, url):
+        # type: (str) -> Optional[str]
+        text = self._memo.get(url)
+        if text is not None:
+            self._memo.move_to_end(url)
+        return text
+
+    def _set_memo(self, url, body):
+        # type: (str, Any) -> None
+        text = json.dumps(body)
+        with self._lock:
+            old = self._memo.pop(url, None)
+            if old is not None:
+                self._memo_size -= len(old)
+            if len(text) <= self.max_size:
+                self._memo[url] = text
+                self._memo_size += len(text)
+            while self._memo_size > self.max_size:
+                _, evicted = self._memo.popitem(last=False)
+                self._memo_size -= len(evicted)
+            self._url_locks.pop(url, None)
+
+    def _max_age(self, headers) -> int:
+        match = MAX_AGE_RE.search(headers.get("Cache-Control", ""))
+        if match is not None:
+            return int(match.group(1))
+        return self.ttl
+
+    def get_json(self, url: str, session=None) -> Any:
+        """Retrieve the JSON document at **url**, from memory, from disk or over
+        the network as needed.
+
+        :param str url: The URL of the JSON document
+        :param Optional[Session] session: A :class:`~requests.Session` instance,
+            defaults to the shared pooled session
+        :raises requests.exceptions.HTTPError: If the server responds with an error
+        :return: The decoded JSON document, which the caller is free to modify
+        """
+        with self._lock:
+            text = self._get_memo(url)
+            if text is None:
+                url_lock = self._url_locks.setdefault(url, threading.Lock())
+        if text is not None:
+            return json.loads(text)
+        # Concurrent callers asking for the same URL wait for a single fetch
+        with url_lock:
+            with self._lock:
+                text = self._get_memo(url)
+            if text is not None:
+                return json.loads(text)
+            entry = self.get(url)
+            if entry is not None and entry["expires"] > time.time():
+                body = entry["body"]
+            else:
+                body = self._fetch(url, entry, session=session)
+            self._set_memo(url, body)
+        return body
+
+    def _fetch(self, url, entry=None, session=None):
+        # type: (str, Optional[Dict[str, Any]], Optional[Any]) -> Any
+        if session is None:
+            session = get_session()
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        with session.get(url, headers=headers) as r:
+            if r.status_code != 304:
+                return self._store_response(url, r)
+            if entry is not None:
+                entry["expires"] = time.time() + self._max_age(r.headers)
+                self.set(url, entry)
+                return entry["body"]
+        # There is no stored body to reuse, so ask again without any conditional
+        # headers, including those the session itself may be sending.
+        headers = {
+            "If-None-Match": None,
+            "If-Modified-Since": None,
+            "Cache-Control": "no-cache",
+        }
+        with session.get(url, headers=headers) as r:
+            return self._store_response(url, r)
+
+    def _store_response(self, url, response):
+        # type: (str, Any) -> Any
+        response.raise_for_status()
+        body = response.json()
+        last_serial = response.headers.get("X-PyPI-Last-Serial")
+        if last_serial is None and isinstance(body, dict):
+            last_serial = body.get("last_serial")
+        self.set(
+            url,
+            {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "last_serial": last_serial,
+                "expires": time.time() + self._max_age(response.headers),
+                "body": body,
+            },
+        )
+        return body
+
+
+class BuildEnvCache(object):
+    """A bounded on-disk cache of isolated build environments, each holding the
+    packages pip installed for one set of build requirements.
+
+    Environments are keyed by the sorted, normalized requirements along with the
+    interpreter and platform they were installed for, so packages sharing a
+    build backend share a single environment across runs.  New environments are
+    installed into a staging directory and only renamed into place once pip
+    succeeds; the least recently used environments are evicted once the cache
+    exceeds ``max_size`` bytes.  Builds hold a lease on every environment they
+    use, and leased environments are never evicted, so concurrent builds in
+    other processes cannot remove an environment out from under each other.
+
+    :param Optional[str] cache_dir: The directory to store environments in,
+        defaults to ``REQUIREMENTSLIB_CACHE_DIR/build-envs``
+    :param int max_size: The maximum size of the cache in bytes, ``0`` disables it
+    """
+
+    VERSION = 1
+    MARKER = "requirementslib-build-env.json"
+    LEASES = ".leases"
+    #: Leases older than this many seconds were left behind by a dead process
+    LEASE_TIMEOUT = 24 * 60 * 60
+
+    def __init__(self, cache_dir=None, max_size=REQUIREMENTSLIB_BUILD_ENV_CACHE_SIZE):
+        if cache_dir is None:
+            cache_dir = os.path.join(REQUIREMENTSLIB_CACHE_DIR, "build-envs")
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+
+    def __repr__(self):
+        return "{0}(cache_dir={1!r}, max_size={2!r})".format(
+            self.__class__.__name__, self.cache_dir.as_posix(), self.max_size
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @staticmethod
+    def make_key(requires: Iterable[str]) -> str:
+        """Build the cache key for a set of build requirements.
+
+        :param Iterable[str] requires: The requirements to install
+        :return: A key which is the same for any ordering or spelling of the same
+            requirements on this interpreter and platform
+        :rtype: str
+        """
+        normalized = set()
+        for req in requires:
+            try:
+                normalized.add(str(Requirement(req)))
+            except InvalidRequirement:
+                normalized.add(req.strip())
+        return "{0}:{1}:{2}".format(
+            sys.implementation.cache_tag,
+            sysconfig.get_platform(),
+            ",".join(sorted(normalized)),
+        )
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir.joinpath(hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def _iter_entries(self) -> Iterator[Tuple[Path, os.stat_result, int]]:
+        if not self.cache_dir.is_dir():
+            return
+        for marker in self.cache_dir.glob("*/{0}".format(self.MARKER)):
+            if marker.parent.name.startswith("."):
+                continue
+            try:
+                stat = marker.stat()
+                size = json.loads(marker.read_text(encoding="utf-8"))["size"]
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            yield marker.parent, stat, size
+
+    def get(self, requires: Iterable[str]) -> Optional[str]:
+        """Retrieve the prepared environment for **requires**, marking it as
+        recently used.
+
+        :param Iterable[str] requires: The build requirements
+        :return: The prefix of the environment or None on a miss
+        :rtype: Optional[str]
+        """
+        if not self.enabled:
+            return None
+        key = self.make_key(requires)
+        path = self._path_for(key)
+        marker = path.joinpath(self.MARKER)
+        try:
+            payload = json.loads(marker.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if payload.get("version") != self.VERSION or payload.get("key") != key:
+            return None
+        try:
+            os.utime(marker.as_posix(), None)
+        except OSError:
+            pass
+        return path.as_posix()
+
+    def stage(self) -> str:
+        """Create an empty directory within the cache to install a new
+        environment into.
+
+        :return: The path of the staging directory
+        :rtype: str
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        return tempfile.mkdtemp(prefix=".staging-", dir=self.cache_dir.as_posix())
+
+    def add(self, requires: Iterable[str], staging_dir: str) -> str:
+        """Move an environment installed into **staging_dir** into the cache and
+        evict old environments if the cache exceeds its size limit.
+
+        :param Iterable[str] requires: The build requirements installed
+        :param str staging_dir: A directory returned by :meth:`stage`
+        :return: The prefix of the cached environment
+        :rtype: str
+        """
+        key = self.make_key(requires)
+        path = self._path_for(key)
+        size = sum(
+            os.path.getsize(os.path.join(root, fn))
+            for root, _, files in os.walk(staging_dir)
+            for fn in files
+            if not os.path.islink(os.path.join(root, fn))
+        )
+        marker = os.path.join(staging_dir, self.MARKER)
+        with open(marker, "w", encoding="utf-8") as fh:
+            json.dump({"version": self.VERSION, "key": key, "size": size}, fh)
+        try:
+            os.rename(staging_dir, path.as_posix())
+        except OSError:
+            # Another process prepared the same environment first
+            self.discard(staging_dir)
+            if not path.joinpath(self.MARKER).exists():
+                raise
+        self.evict(keep=path)
+        return path.as_posix()
+
+    def discard(self, staging_dir: str) -> None:
+        """Remove a staging directory which will not be added to the cache."""
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def clear(self) -> None:
+        """Remove every environment from the cache."""
+        for path, _, _ in list(self._iter_entries()):
+            shutil.rmtree(path.as_posix(), ignore_errors=True)
+
+    def lease(self, requires: Iterable[str]) -> str:
+        """Mark the environment for **requires** as in use, whether or not it has
+        been prepared yet, so that :meth:`evict` leaves it alone.
+
+        :param Iterable[str] requires: The build requirements
+        :return: The lease, to be passed to :meth:`release` once the build is done
+        :rtype: str
+        """
+        lease_dir = self.cache_dir.joinpath(
+            self.LEASES, self._path_for(self.make_key(requires)).name
+        )
+        while True:
+            lease_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                fd, lease = tempfile.mkstemp(
+                    prefix="{0}-".format(os.getpid()), dir=lease_dir.as_posix()
+                )
+            except FileNotFoundError:
+                # An eviction removed the empty lease directory, try again
+                continue
+            os.close(fd)
+            return lease
+
+    def release(self, lease: str) -> None:
+        """Release a lease returned by :meth:`lease`."""
+        try:
+            os.remove(lease)
+        except OSError:
+            pass
+
+    def _is_leased(self, path: Path) -> bool:
+        lease_dir = self.cache_dir.joinpath(self.LEASES, path.name)
+        if not lease_dir.is_dir():
+            return False
+        expired = time.time() - self.LEASE_TIMEOUT
+        leased = False
+        for lease in lease_dir.iterdir():
+            try:
+                mtime = lease.stat().st_mtime
+            except OSError:
+                continue
+            if mtime > expired:
+                leased = True
+            else:
+                self.release(lease.as_posix())
+        if not leased:
+            try:
+                lease_dir.rmdir()
+            except OSError:
+                pass
+        return leased
+
+    def evict(self, keep: Optional[Path] = None) -> None:
+        """Remove the least recently used environments until the cache fits
+        within ``max_size``, skipping environments leased by a running build.
+
+        :param Optional[Path] keep: An environment which must not be removed
+        """
+        entries = sorted(self._iter_entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_size:
+                break
+            if path == keep or self._is_leased(path):
+                continue
+            # Move the environment aside before checking its leases again, so
+            # a build leasing it in the meantime either sees it missing and
+            # prepares it anew or keeps it from being removed
+            evicting = path.with_name(".evicting-{0}-{1}".format(path.name, os.getpid()))
+            try:
+                os.rename(path.as_posix(), evicting.as_posix())
+            except OSError:
+                continue
+            if self._is_leased(path):
+                try:
+                    os.rename(evicting.as_posix(), path.as_posix())
+                except OSError:
+                    # The environment was prepared again in the meantime
+                    shutil.rmtree(evicting.as_posix(), ignore_errors=True)
+                continue
+            shutil.rmtree(evicting.as_posix(), ignore_errors=True)
+            total -= size
+
+
+SETUP_INFO_CACHE = SetupInfoCache()
+HTTP_CACHE = HTTPCache()
+BUILD_ENV_CACHE = BuildEnvCache()
@@ -1,24 +1,42 @@
-from typing import Any, Dict
+from typing import Any, Dict, FrozenSet
 
 from pydantic import BaseModel, Extra
 
 
 class ReqLibBaseModel(BaseModel):
-    def __setattr__(self, name, value):  # noqa: C901 (ignore complexity)
+    #: The fields and private attributes of the class, computed once per subclass
+    __assignable_attributes__ = frozenset()  # type: FrozenSet[str]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
         private_attributes = {
             field_name
-            for field_name in self.__annotations__
-            if field_name.startswith("_")
+            for klass in cls.__mro__
+            for field_name in vars(klass).get("__annotations__", {})
+            if field_name.startswith("_") and not field_name.startswith("__")
         }
+        cls.__assignable_attributes__ = frozenset(private_attributes).union(
+            cls.__fields__
+        )
 
-        if name in private_attributes or name in self.__fields__:
+    def __setattr__(self, name, value):
+        if name in self.__assignable_attributes__:
             return object.__setattr__(self, name, value)
 
-        if self.__config__.extra is not Extra.allow and name not in self.__fields__:
+        if self.__config__.extra is not Extra.allow:
             raise ValueError(f'"{self.__class__.__name__}" object has no field "{name}"')
 
         object.__setattr__(self, name, value)
 
+    def _set_trusted(self, **values):
+        # type: (Any) -> None
+        """Assign several fields or private attributes at once, skipping
+        validation and the field lookup of :meth:`__setattr__`.
+
+        Only for internal writes of values which are already known to be valid.
+        """
+        self.__dict__.update(values)
+
     def dict(self, *args, **kwargs) -> Dict[str, Any]:
         """The requirementslib classes make use of a lot of private attributes
         which do not get serialized out to the dict by default in pydantic."""
@@ -1,20 +1,59 @@
-import copy
+import io
 import itertools
+import json
 import os
+import re
 from json import JSONDecodeError
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+from pip._vendor.packaging.utils import canonicalize_name
 from plette import lockfiles
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from ..exceptions import LockfileCorruptException, MissingParameter, PipfileNotFound
 from ..utils import is_editable, is_vcs, merge_items
 from .common import ReqLibBaseModel
+from .markers import CompiledMarkers
 from .project import ProjectFile
+from .records import RequirementRecord
 from .requirements import Requirement
 
 DEFAULT_NEWLINES = "\n"
+LOCKFILE_SECTIONS = ("_meta", "default", "develop")
+LOCKFILE_CHUNK_SIZE = 64 * 1024
+
+LockfileEntry = Tuple[str, str, Any]
+
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _copy_entry(entry):
+    # type: (Any) -> Any
+    if isinstance(entry, dict):
+        return {key: _copy_entry(value) for key, value in entry.items()}
+    if isinstance(entry, list):
+        return [_copy_entry(value) for value in entry]
+    return entry
+
+
+def _merge_sections(sections):
+    # type: (Iterable[Dict[str, Any]]) -> Dict[str, Any]
+    """Merge lockfile sections by package name.
+
+    Entries are copied, so the result can be changed without touching the
+    lockfile; only the entries of packages which appear in several sections are
+    merged with :func:`~requirementslib.utils.merge_items`.
+    """
+    deps = {}  # type: Dict[str, Any]
+    for section in sections:
+        for name, entry in section.items():
+            if name in deps:
+                deps[name] = merge_items([{name: deps[name]}, {name: entry}])[name]
+            else:
+                deps[name] = _copy_entry(entry)
+    return deps
 
 
 def preferred_newlines(f):
@@ -23,15 +62,302 @@ def preferred_newlines(f):
     return DEFAULT_NEWLINES
 
 
+class _JSONStream(object):
+    """Decode JSON incrementally from a file, holding only the unread part of the
+    current chunk in memory."""
+
+    def __init__(self, f, chunk_size=LOCKFILE_CHUNK_SIZE):
+        # type: (IO, int) -> None
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read_chunk(self):
+        # type: () -> bool
+        chunk = self.f.read(self.chunk_size)
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("utf-8")
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        # type: () -> str
+        """Skip any whitespace and return the next character, or an empty string
+        at the end of the file."""
+        while True:
+            self.pos = _JSON_WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read_chunk():
+                return ""
+
+    def expect(self, chars):
+        # type: (str) -> str
+        char = self.peek()
+        if not char or char not in chars:
+            raise JSONDecodeError(
+                "Expecting one of {0!r}".format(chars), self.buffer, self.pos
+            )
+        self.pos += 1
+        return char
+
+    def value(self):
+        # type: () -> Any
+        self.peek()
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self.buffer, self.pos)
+            except JSONDecodeError:
+                if self._read_chunk():
+                    continue
+                raise
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self._read_chunk():
+                continue
+            self.pos = end
+            return value
+
+    def keys(self):
+        # type: () -> Iterator[str]
+        """Iterate over the keys of an object, the caller must consume each value
+        before advancing."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise JSONDecodeError("Expecting a string key", self.buffer, self.pos)
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+
+def iter_lockfile_entries(f, chunk_size=LOCKFILE_CHUNK_SIZE):
+    # type: (IO, int) -> Iterator[LockfileEntry]
+    """Stream the entries of a **Pipfile.lock** without loading the whole
+    document.
+
+    Only a single entry is decoded at a time, so the memory used depends on the
+    largest entry rather than on the size of the file.  The keys of ``_meta`` are
+    yielded as entries of the ``_meta`` section.
+
+    :param f: A text or binary file object positioned at the start of the lockfile
+    :param int chunk_size: The number of characters to read at a time
+    :raises JSONDecodeError: If the lockfile is not a JSON object of objects
+    :return: An iterator of ``(section, name, entry)`` tuples in file order
+    """
+    stream = _JSONStream(f, chunk_size=chunk_size)
+    for section in stream.keys():
+        for name in stream.keys():
+            yield section, name, stream.value()
+    if stream.peek():
+        raise JSONDecodeError("Extra data", stream.buffer, stream.pos)
+
+
+def iter_lockfile_chunks(entries, sections=LOCKFILE_SECTIONS):
+    # type: (Iterable[LockfileEntry], Sequence[str]) -> Iterator[str]
+    """Serialize lockfile entries to JSON text one entry at a time.
+
+    Entries are written in the order given, so they should be grouped by section
+    and sorted by section and name to match the output of
+    :meth:`plette.lockfiles.Lockfile.dump`.  Each of **sections** is written even
+    when it has no entries.
+
+    :param entries: An iterable of ``(section, name, entry)`` tuples
+    :param sections: The sections to always include
+    :raises ValueError: If the entries of a section are not contiguous
+    :return: An iterator of chunks of the lockfile text
+    """
+    encoder = json.JSONEncoder(indent=4, separators=(",", ": "), sort_keys=True)
+    required = sorted(sections, reverse=True)
+    seen = set()
+    current = None
+    count = 0
+
+    def section_header(section):
+        header = "{0}\n    {1}: {{".format("," if seen else "", encoder.encode(section))
+        seen.add(section)
+        return header
+
+    yield "{"
+    for section, name, entry in entries:
+        if section != current:
+            if section in seen:
+                raise ValueError(
+                    "Entries of lockfile section {0!r} must be contiguous".format(section)
+                )
+            if current is not None:
+                yield "\n    }" if count else "}"
+            while required and required[-1] <= section:
+                empty = required.pop()
+                if empty != section and empty not in seen:
+                    yield section_header(empty) + "}"
+            yield section_header(section)
+            current, count = section, 0
+        yield "{0}\n        {1}: {2}".format(
+            "," if count else "",
+            encoder.encode(name),
+            encoder.encode(entry).replace("\n", "\n        "),
+        )
+        count += 1
+    if current is not None:
+        yield "\n    }" if count else "}"
+    for empty in reversed(required):
+        if empty not in seen:
+            yield section_header(empty) + "}"
+    yield "\n}\n" if seen else "}\n"
+
+
+def dump_lockfile_entries(entries, f, sections=LOCKFILE_SECTIONS):
+    # type: (Iterable[LockfileEntry], IO[str], Sequence[str]) -> None
+    """Write lockfile entries to a text file without building the document.
+
+    :param entries: An iterable of ``(section, name, entry)`` tuples, see
+        :func:`iter_lockfile_chunks`
+    :param f: The text file to write to
+    :param sections: The sections to always include
+    """
+    for chunk in iter_lockfile_chunks(entries, sections=sections):
+        f.write(chunk)
+
+
+_ObjectMember = Tuple[str, int, int, int]
+
+
+def _skip_whitespace(text, pos):
+    # type: (str, int) -> int
+    return _JSON_WHITESPACE.match(text, pos).end()
+
+
+def _scan_object(text, pos):
+    # type: (str, int) -> Tuple[List[_ObjectMember], int]
+    """Find the members of the JSON object starting at **pos** in **text**.
+
+    :return: A list of ``(key, key_start, value_start, value_end)`` offsets and the
+        offset just past the closing brace
+    """
+    pos = _skip_whitespace(text, pos)
+    if text[pos : pos + 1] != "{":
+        raise JSONDecodeError("Expecting '{'", text, pos)
+    members = []  # type: List[_ObjectMember]
+    pos = _skip_whitespace(text, pos + 1)
+    if text[pos : pos + 1] == "}":
+        return members, pos + 1
+    while True:
+        key_start = pos
+        key, pos = _JSON_DECODER.raw_decode(text, pos)
+        pos = _skip_whitespace(text, pos)
+        if text[pos : pos + 1] != ":":
+            raise JSONDecodeError("Expecting ':' delimiter", text, pos)
+        value_start = _skip_whitespace(text, pos + 1)
+        _, pos = _JSON_DECODER.raw_decode(text, value_start)
+        members.append((key, key_start, value_start, pos))
+        pos = _skip_whitespace(text, pos)
+        char = text[pos : pos + 1]
+        if char == "}":
+            return members, pos + 1
+        if char != ",":
+            raise JSONDecodeError("Expecting ',' delimiter", text, pos)
+        pos = _skip_whitespace(text, pos + 1)
+
+
+def _line_indent(text, pos):
+    # type: (str, int) -> str
+    line_start = text.rfind("\n", 0, pos) + 1
+    return text[line_start:pos]
+
+
+def _encode_lockfile_value(value, indent, newline):
+    # type: (Any, str, str) -> str
+    content = json.dumps(value, indent=4, separators=(",", ": "), sort_keys=True)
+    return content.replace("\n", newline + indent)
+
+
+def _patch_object_text(text, start, updates, newline):
+    # type: (str, int, Dict[str, Optional[Any]], str) -> Tuple[int, int, str]
+    """Render the JSON object at **start** with **updates** applied to its
+    members, reusing the original text of every other member.
+
+    A value of None in **updates** removes the member, new members are inserted
+    before the first member which sorts after them.
+
+    :return: The start and end offsets of the object and its replacement text
+    """
+    members, end = _scan_object(text, start)
+    start = _skip_whitespace(text, start)
+    if members:
+        indent = _line_indent(text, members[0][1])
+        opening = text[start + 1 : members[0][1]]
+        closing = text[members[-1][3] : end - 1]
+    else:
+        line = _line_indent(text, start)
+        parent_indent = line[: len(line) - len(line.lstrip())]
+        indent = parent_indent + "    "
+        opening, closing = newline + indent, newline + parent_indent
+    if len(members) > 1:
+        separator = text[members[0][3] : members[1][1]]
+    else:
+        separator = "," + newline + indent
+
+    def render(key, value):
+        return "{0}: {1}".format(
+            json.dumps(key), _encode_lockfile_value(value, indent, newline)
+        )
+
+    rendered = []  # type: List[Tuple[str, str]]
+    for key, key_start, _, value_end in members:
+        if key not in updates:
+            rendered.append((key, text[key_start:value_end]))
+        elif updates[key] is not None:
+            rendered.append((key, render(key, updates[key])))
+    existing = {member[0] for member in members}
+    for key in sorted(set(updates) - existing):
+        if updates[key] is None:
+            continue
+        index = next(
+            (i for i, (other, _) in enumerate(rendered) if other > key), len(rendered)
+        )
+        rendered.insert(index, (key, render(key, updates[key])))
+    if not rendered:
+        return start, end, "{}"
+    body = separator.join(member for _, member in rendered)
+    return start, end, "{" + opening + body + closing + "}"
+
+
+def _patch_lockfile_text(text, section, updates, newline):
+    # type: (str, str, Dict[str, Optional[Any]], str) -> str
+    members, _ = _scan_object(text, 0)
+    for key, _, value_start, _ in members:
+        if key == section:
+            start, end, content = _patch_object_text(text, value_start, updates, newline)
+            break
+    else:
+        entries = {name: entry for name, entry in updates.items() if entry is not None}
+        start, end, content = _patch_object_text(text, 0, {section: entries}, newline)
+    return text[:start] + content + text[end:]
+
+
 class Lockfile(ReqLibBaseModel):
     path: Path = Field(
         default_factory=lambda: Path(os.curdir).joinpath("Pipfile.lock").absolute()
     )
     _requirements: Optional[list] = Field(default_factory=list)
     _dev_requirements: Optional[list] = Field(default_factory=list)
+    _index: Optional[Dict[str, Dict[str, Any]]] = None
     projectfile: ProjectFile = None
     lockfile: lockfiles.Lockfile
     newlines: str = DEFAULT_NEWLINES
+    _parallel: bool = PrivateAttr(default=False)
+    _max_workers: Optional[int] = PrivateAttr(default=None)
 
     class Config:
         validate_assignment = True
@@ -42,7 +368,7 @@ class Lockfile(ReqLibBaseModel):
 
     @property
     def section_keys(self):
-        return set(self.lockfile.keys()) - {"_meta"}
+        return set(self.lockfile._data) - {"_meta"}
 
     @property
     def extended_keys(self):
@@ -52,14 +378,77 @@ class Lockfile(ReqLibBaseModel):
         return self.__getitem__(k)
 
     def __contains__(self, k):
-        check_lockfile = k in self.extended_keys or self.lockfile.__contains__(k)
-        if check_lockfile:
-            return True
-        return super(Lockfile, self).__contains__(k)
+        if isinstance(k, tuple):
+            return k in self.extended_keys
+        return k in self.lockfile._data or canonicalize_name(k) in self.index
 
     def __setitem__(self, k, v):
         lockfile = self.lockfile
         lockfile.__setitem__(k, v)
+        if self._index is not None:
+            self._reindex_section(k)
+
+    @property
+    def index(self) -> Dict[str, Dict[str, Any]]:
+        """A mapping of normalized package names to their entries in each section.
+
+        The index is built on first use and kept up to date by
+        :meth:`__setitem__` and :meth:`update_entries`.
+        """
+        if self._index is None:
+            self._index = {}
+            for section in self.section_keys:
+                self._reindex_section(section)
+        return self._index
+
+    def _index_entry(self, section: str, name: str, entry: Optional[Any]) -> None:
+        key = canonicalize_name(name)
+        if entry is not None:
+            self._index.setdefault(key, {})[section] = entry
+        elif section in self._index.get(key, {}):
+            del self._index[key][section]
+            if not self._index[key]:
+                del self._index[key]
+
+    def _reindex_section(self, section: str) -> None:
+        stale = [name for name, entries in self._index.items() if section in entries]
+        for name in stale:
+            self._index_entry(section, name, None)
+        entries = self.lockfile._data.get(section)
+        if section != "_meta" and isinstance(entries, dict):
+            for name, entry in entries.items():
+                self._index_entry(section, name, entry)
+
+    def _resolve_name(self, section: str, name: str) -> str:
+        """Find the key a package is locked under in **section**, or its canonical
+        name if it isn't locked there."""
+        section_data = self.lockfile._data.get(section) or {}
+        if name in section_data:
+            return name
+        key = canonicalize_name(name)
+        if section not in self.index.get(key, {}):
+            return key
+        return next(k for k in section_data if canonicalize_name(k) == key)
+
+    def get_entry(
+        self, name: str, section: Optional[str] = None
+    ) -> Optional[Tuple[str, Any]]:
+        """Look up the lockfile entry of a package by its normalized name.
+
+        :param str name: The name of the package, in any normalization
+        :param section: The section to look in, by default ``default``, then
+            ``develop``, then any other section which contains the package
+        :return: A tuple of the section and the entry, or None if it isn't locked
+        """
+        entries = self.index.get(canonicalize_name(name), {})
+        if section is None:
+            section = next(
+                (key for key in ("default", "develop") if key in entries),
+                next(iter(entries), None),
+            )
+        if section not in entries:
+            return None
+        return section, entries[section]
 
     def __getitem__(self, k, *args, **kwargs):
         retval = None
@@ -75,7 +464,10 @@ class Lockfile(ReqLibBaseModel):
                 elif pkg_type == "editable":
                     retval = {k: v for k, v in vals.items() if is_editable(v)}
             if retval is None:
-                raise
+                entry = self.get_entry(k)
+                if entry is None:
+                    raise
+                retval = entry[1]
         else:
             retval = getattr(retval, "_data", retval)
         return retval
@@ -91,13 +483,11 @@ class Lockfile(ReqLibBaseModel):
         return super(Lockfile, self).__getattribute__(k, *args, **kwargs)
 
     def get_deps(self, dev=False, only=True):
-        deps = {}
-        if dev:
-            deps.update(self.develop._data)
-            if only:
-                return deps
-        deps = merge_items([deps, self.default._data])
-        return deps
+        if dev and only:
+            return _merge_sections([self.develop._data])
+        sections = [self.develop._data] if dev else []
+        sections.append(self.default._data)
+        return _merge_sections(sections)
 
     @classmethod
     def read_projectfile(cls, path):
@@ -178,7 +568,13 @@ class Lockfile(ReqLibBaseModel):
         )
 
     @classmethod
-    def load(cls, path: Optional[str], create: bool = True) -> "Lockfile":
+    def load(
+        cls,
+        path: Optional[str],
+        create: bool = True,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> "Lockfile":
         try:
             projectfile = cls.load_projectfile(path, create=create)
         except JSONDecodeError:
@@ -198,11 +594,20 @@ class Lockfile(ReqLibBaseModel):
             "newlines": projectfile.line_ending,
             "path": lockfile_path,
         }
-        return cls(**creation_args)
+        loaded = cls(**creation_args)
+        loaded._parallel = parallel
+        loaded._max_workers = max_workers
+        return loaded
 
     @classmethod
-    def create(cls, path: Optional[str], create: bool = True) -> "Lockfile":
-        return cls.load(path, create=create)
+    def create(
+        cls,
+        path: Optional[str],
+        create: bool = True,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> "Lockfile":
+        return cls.load(path, create=create, parallel=parallel, max_workers=max_workers)
 
     def get_section(self, name: str) -> Optional[Dict]:
         return self.lockfile.get(name)
@@ -215,26 +620,53 @@ class Lockfile(ReqLibBaseModel):
     def default(self) -> Dict:
         return self.lockfile.default
 
-    def get_requirements(
+    def _get_category_deps(
         self, dev: bool = True, only: bool = False, categories: Optional[List[str]] = None
-    ) -> Iterator[Requirement]:
+    ) -> Dict:
         if categories:
-            deps = {}
+            sections = []
             for category in categories:
                 if category == "packages":
                     category = "default"
                 elif category == "dev-packages":
                     category = "develop"
-                try:
-                    category_deps = self[category]
-                except KeyError:
-                    category_deps = {}
-                    self.lockfile[category] = category_deps
-                deps = merge_items([deps, category_deps])
+                if category not in self.section_keys:
+                    self[category] = {}
+                sections.append(self[category])
+            deps = _merge_sections(sections)
         else:
             deps = self.get_deps(dev=dev, only=only)
+        return deps
+
+    def get_requirements(
+        self, dev: bool = True, only: bool = False, categories: Optional[List[str]] = None
+    ) -> Iterator[Requirement]:
+        deps = self._get_category_deps(dev=dev, only=only, categories=categories)
+        if self._parallel:
+            yield from Requirement.from_pipfile_entries(
+                deps.items(), parallel=True, max_workers=self._max_workers
+            )
+        else:
+            for k, v in deps.items():
+                yield Requirement.from_pipfile(k, v)
+
+    def iter_records(
+        self, dev: bool = True, only: bool = False, categories: Optional[List[str]] = None
+    ) -> Iterator[RequirementRecord]:
+        """Iterate over the lockfile entries as immutable records.
+
+        Records are far cheaper to create than full requirements, call
+        :meth:`~requirementslib.models.records.RequirementRecord.as_requirement` on a
+        record to parse it fully.
+
+        :param bool dev: Whether to include the develop section
+        :param bool only: Whether to include only the develop section
+        :param categories: The categories to include, overriding ``dev`` and ``only``
+        :return: An iterator of records in lockfile order
+        """
+        deps = self._get_category_deps(dev=dev, only=only, categories=categories)
         for k, v in deps.items():
-            yield Requirement.from_pipfile(k, v)
+            yield RequirementRecord.from_pipfile(k, v)
 
     def requirements_list(self, category: str) -> List[Dict]:
         if self.lockfile.get(category):
@@ -244,16 +676,123 @@ class Lockfile(ReqLibBaseModel):
         return []
 
     def as_requirements(self, category: str, include_hashes: bool = False) -> List[str]:
-        lines = []
-        section = list(self.get_requirements(categories=[category]))
-        for req in section:
-            kwargs = {"include_hashes": include_hashes}
-            if req.editable:
-                kwargs["include_markers"] = False
-            r = req.as_line(**kwargs)
-            lines.append(r.strip())
-        return lines
+        return [
+            record.as_line(include_hashes=include_hashes).strip()
+            for record in self.iter_records(categories=[category])
+        ]
+
+    def as_environment_requirements(
+        self,
+        category: str,
+        environments: List[Dict[str, str]],
+        include_hashes: bool = False,
+    ) -> List[List[str]]:
+        """Build the requirement lines of a category for several target
+        environments.
+
+        The markers of the whole category are compiled and evaluated against every
+        environment at once, and each environment gets only the requirements whose
+        markers it satisfies, without the markers.
+
+        :param str category: The lockfile category to use
+        :param environments: The marker environments to build requirements for, each
+            overriding the values of the current environment
+        :param bool include_hashes: Whether to include the hashes of each requirement
+        :return: A list of requirement lines for each environment, in order
+        """
+        section = list(self.iter_records(categories=[category]))
+        lines = [
+            record.as_line(include_hashes=include_hashes, include_markers=False).strip()
+            for record in section
+        ]
+        matrix = CompiledMarkers(record.markers for record in section).evaluate(
+            environments
+        )
+        return [
+            [line for line, row in zip(lines, matrix) if row[column]]
+            for column in range(len(environments))
+        ]
+
+    def iter_entries(self) -> Iterator[LockfileEntry]:
+        """Iterate over every entry of the lockfile, sorted by section and name.
+
+        :return: An iterator of ``(section, name, entry)`` tuples
+        """
+        data = self.lockfile._data
+        for section in sorted(data):
+            for name in sorted(data[section]):
+                yield section, name, data[section][name]
+
+    def _get_pipfile_hash(self) -> Optional[Dict[str, str]]:
+        pipfile_path = Path(self.projectfile.location).parent / "Pipfile"
+        if not pipfile_path.is_file():
+            return None
+        from .pipfile import Pipfile
+
+        pipfile = Pipfile.load(pipfile_path.parent.as_posix())
+        return dict(pipfile.pipfile.get_hash()._data)
+
+    def update_entries(
+        self,
+        entries: Dict[str, Optional[Dict[str, Any]]],
+        section: str = "default",
+        update_hash: bool = False,
+    ) -> None:
+        """Update or remove entries of a section, writing only those changes.
+
+        The lockfile on disk is patched in place: every other entry keeps its
+        original text and nothing is parsed into a requirement.  ``_meta.hash`` is
+        left alone unless ``update_hash`` is set, so a partial update does not mark
+        the lockfile as up to date with a Pipfile it was not fully locked against.
+
+        Packages are matched by their normalized names, so an entry updates the
+        package however its name is spelled in the lockfile; new packages are added
+        under their canonical names.
+
+        :param entries: A mapping of package names to their new lockfile entries, or
+            to None to remove a package
+        :param str section: The section to update, e.g. ``default`` or ``develop``
+        :param bool update_hash: Whether to recompute ``_meta.hash`` from the Pipfile
+            next to the lockfile, when there is one
+        """
+        if section == "packages":
+            section = "default"
+        elif section == "dev-packages":
+            section = "develop"
+        entries = {
+            self._resolve_name(section, name): entry for name, entry in entries.items()
+        }
+        data = self.lockfile._data
+        section_data = data.setdefault(section, {})
+        for name, entry in entries.items():
+            if entry is None:
+                section_data.pop(name, None)
+            else:
+                section_data[name] = entry
+        if self._index is not None:
+            for name, entry in entries.items():
+                self._index_entry(section, name, entry)
+        meta = data.setdefault("_meta", {})
+        meta_hash = self._get_pipfile_hash() if update_hash else None
+        hash_changed = meta_hash is not None and meta_hash != meta.get("hash")
+        if hash_changed:
+            meta["hash"] = meta_hash
+        location = self.projectfile.location
+        if not os.path.exists(location):
+            self.write()
+            return
+        self.projectfile.model = self.lockfile
+        with io.open(location, encoding="utf-8", newline="") as f:
+            text = f.read()
+        newline = "\r\n" if "\r\n" in text else "\n"
+        if hash_changed:
+            text = _patch_lockfile_text(text, "_meta", {"hash": meta_hash}, newline)
+        text = _patch_lockfile_text(text, section, entries, newline)
+        with io.open(location, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
 
     def write(self) -> None:
-        self.projectfile.model = copy.deepcopy(self.lockfile)
-        self.projectfile.write()
+        self.projectfile.model = self.lockfile
+        kwargs = {"encoding": "utf-8", "newline": self.projectfile.line_ending}
+        with io.open(self.projectfile.location, "w", **kwargs) as f:
+            dump_lockfile_entries(self.iter_entries(), f)
@@ -1,20 +1,53 @@
+import copy
 import itertools
 import operator
 import re
+import threading
+from collections import OrderedDict, namedtuple
 from collections.abc import Mapping, Set
-from functools import reduce
-from typing import Any, AnyStr, Iterator, List, Optional, Tuple, Type, Union
-
-from pip._vendor.distlib import markers
-from pip._vendor.packaging.markers import InvalidMarker, Marker
-from pip._vendor.packaging.specifiers import LegacySpecifier, Specifier, SpecifierSet
+from functools import lru_cache, reduce
+from typing import (
+    Any,
+    AnyStr,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pip._vendor.packaging.markers import (
+    InvalidMarker,
+    Marker,
+    Op,
+    UndefinedComparison,
+    UndefinedEnvironmentName,
+    Variable,
+    _eval_op,
+    default_environment,
+)
+from pip._vendor.packaging.specifiers import (
+    InvalidSpecifier,
+    LegacySpecifier,
+    Specifier,
+    SpecifierSet,
+)
+from pip._vendor.packaging.version import InvalidVersion, Version
 from pydantic import BaseModel
 
+from ..environment import REQUIREMENTSLIB_MARKER_CACHE_SIZE
 from ..exceptions import RequirementError
 
 MAX_VERSIONS = {1: 7, 2: 7, 3: 11, 4: 0}
 DEPRECATED_VERSIONS = ["3.0", "3.1", "3.2", "3.3"]
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize", "hit_rate"])
+_MISSING = object()
+
 
 def is_instance(item, cls):
     # type: (Any, Type) -> bool
@@ -23,6 +56,171 @@ def is_instance(item, cls):
     return False
 
 
+class InternCache(object):
+    """A thread-safe, bounded LRU cache which interns the objects built from
+    strings.
+
+    Equal inputs always return the same shared instance.  Cached objects must be
+    treated as immutable.
+
+    :param Callable factory: Builds a new object from a cache key
+    :param int maxsize: The maximum number of cached keys, ``0`` disables caching
+    :param bool hash_cons: Whether the string form of a built object parses back to
+        an equal object.  If so, a newly built object whose string form is already
+        cached is swapped for the cached instance, so ``python_version >= '3.6'``
+        and ``python_version >= "3.6"`` share one object.
+    """
+
+    def __init__(
+        self, factory, maxsize=REQUIREMENTSLIB_MARKER_CACHE_SIZE, hash_cons=False
+    ):
+        # type: (Callable[[str], Any], int, bool) -> None
+        self.factory = factory
+        self.maxsize = maxsize
+        self.hash_cons = hash_cons
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # type: Dict[str, Any]
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "{0}(factory={1!r}, maxsize={2!r})".format(
+            self.__class__.__name__, self.factory, self.maxsize
+        )
+
+    def _lookup(self, key):
+        value = self._data.get(key, _MISSING)
+        if value is not _MISSING:
+            self._data.move_to_end(key)
+        return value
+
+    def _store(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get(self, key: str) -> Any:
+        """Return the shared object for **key**, building it on a miss."""
+        if self.maxsize <= 0:
+            return self.factory(key)
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = self.factory(key)
+        with self._lock:
+            if self.hash_cons and value is not None:
+                canonical = self._lookup(str(value))
+                if canonical is not _MISSING:
+                    value = canonical
+                else:
+                    self._store(str(value), value)
+            self._store(key, value)
+        return value
+
+    def intern(self, value: Any) -> Any:
+        """Return the cached instance equal to **value**, caching a new instance
+        built from its string form if there is none.
+
+        **value** itself is never cached, as its owner may still modify it.
+        """
+        if value is None or self.maxsize <= 0:
+            return value
+        key = str(value)
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not _MISSING and cached is not None:
+                self.hits += 1
+                return cached
+        return self.get(key)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            total = self.hits + self.misses
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.maxsize,
+                len(self._data),
+                float(self.hits) / total if total else 0.0,
+            )
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+def _build_specifierset(spec: str) -> SpecifierSet:
+    return SpecifierSet(spec)
+
+
+MARKER_CACHE = InternCache(Marker, hash_cons=True)
+SPECIFIER_CACHE = InternCache(_build_specifierset, hash_cons=True)
+
+
+def get_marker(marker) -> Optional[Marker]:
+    """Get a shared, interned :class:`~packaging.markers.Marker`.
+
+    :param Union[str, Marker] marker: A marker or marker string
+    :raises InvalidMarker: If the string is not a valid marker
+    :return: The interned marker, or None for an empty marker string
+    """
+    if marker is None:
+        return None
+    if is_instance(marker, Marker):
+        return MARKER_CACHE.intern(marker)
+    marker = str(marker).strip()
+    if not marker:
+        return None
+    return MARKER_CACHE.get(marker)
+
+
+def get_specifierset(spec) -> SpecifierSet:
+    """Get a shared, interned :class:`~packaging.specifiers.SpecifierSet`.
+
+    :param Union[str, SpecifierSet] spec: A specifier set or its string form
+    :raises InvalidSpecifier: If the string is not a valid specifier
+    :return: The interned specifier set
+    """
+    if isinstance(spec, SpecifierSet):
+        return SPECIFIER_CACHE.intern(spec)
+    return SPECIFIER_CACHE.get(str(spec if spec is not None else "").strip())
+
+
+def get_cache_info() -> Dict[str, CacheInfo]:
+    """Report the hit rates of the marker and specifier caches.
+
+    :return: A mapping of cache name to its :data:`CacheInfo`
+    """
+    return {
+        "markers": MARKER_CACHE.cache_info(),
+        "specifiers": SPECIFIER_CACHE.cache_info(),
+        "normalized_markers": _NORMALIZED_MARKER_CACHE.cache_info(),
+        "specifier_markers": _SPECIFIER_MARKER_CACHE.cache_info(),
+        "marker_expressions": _MARKER_EXPRESSION_CACHE.cache_info(),
+        "pyversion_sets": _PYVERSION_SET_CACHE.cache_info(),
+        "contained_pyversions": _CONTAINED_PYVERSIONS_CACHE.cache_info(),
+    }
+
+
+def clear_caches() -> None:
+    """Empty every marker and specifier cache."""
+    for cache in (
+        MARKER_CACHE,
+        SPECIFIER_CACHE,
+        _NORMALIZED_MARKER_CACHE,
+        _SPECIFIER_MARKER_CACHE,
+        _MARKER_EXPRESSION_CACHE,
+        _PYVERSION_SET_CACHE,
+        _CONTAINED_PYVERSIONS_CACHE,
+    ):
+        cache.cache_clear()
+
+
 class PipenvMarkers(BaseModel):
     os_name: Optional[str] = None
     sys_platform: Optional[str] = None
@@ -282,10 +480,352 @@ def fix_version_tuple(version_tuple):
     return (op, version)
 
 
+_Bound = namedtuple("_Bound", ["version", "inclusive"])
+
+
+def _lower_key(bound):
+    # type: (Optional[_Bound]) -> Tuple
+    if bound is None:
+        return (0,)
+    return (1, bound.version, 0 if bound.inclusive else 1)
+
+
+def _upper_key(bound):
+    # type: (Optional[_Bound]) -> Tuple
+    if bound is None:
+        return (2,)
+    return (1, bound.version, 1 if bound.inclusive else 0)
+
+
+def _is_empty_interval(lower, upper):
+    # type: (Optional[_Bound], Optional[_Bound]) -> bool
+    if lower is None or upper is None:
+        return False
+    if lower.version != upper.version:
+        return lower.version > upper.version
+    return not (lower.inclusive and upper.inclusive)
+
+
+def _intervals_touch(upper, lower):
+    # type: (Optional[_Bound], Optional[_Bound]) -> bool
+    """Whether an interval ending at **upper** overlaps or abuts one starting
+    at **lower**."""
+    if upper is None or lower is None:
+        return True
+    if upper.version != lower.version:
+        return upper.version > lower.version
+    return upper.inclusive or lower.inclusive
+
+
+def _bump_release(release):
+    # type: (Tuple[int, ...]) -> Version
+    """The first version after every version starting with **release**."""
+    release = tuple(release[:-1]) + (release[-1] + 1,)
+    return Version(".".join(str(part) for part in release))
+
+
+class PyVersionSet(object):
+    """An immutable set of Python versions, stored as sorted, disjoint intervals.
+
+    Intersection and union are linear merges of the interval lists and the
+    complement simply swaps intervals for the gaps between them, so combining the
+    ``requires_python`` of many packages stays cheap.  Bounds which cannot be
+    parsed as versions are treated as unconstrained.
+
+    :param intervals: ``(lower, upper)`` bound pairs, where ``None`` is unbounded
+    """
+
+    __slots__ = ("intervals",)
+
+    def __init__(self, intervals=()):
+        # type: (Iterable[Tuple[Optional[_Bound], Optional[_Bound]]]) -> None
+        merged = []  # type: List[Tuple[Optional[_Bound], Optional[_Bound]]]
+        for lower, upper in sorted(
+            (i for i in intervals if not _is_empty_interval(*i)),
+            key=lambda interval: _lower_key(interval[0]),
+        ):
+            if merged and _intervals_touch(merged[-1][1], lower):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], upper, key=_upper_key))
+            else:
+                merged.append((lower, upper))
+        self.intervals = tuple(merged)
+
+    def __repr__(self):
+        return "<{0}({1!r})>".format(self.__class__.__name__, str(self))
+
+    def __str__(self):
+        if self.is_empty:
+            return "<empty>"
+        return " || ".join(self._format_interval(*i) or "*" for i in self.intervals)
+
+    @staticmethod
+    def _format_interval(lower, upper):
+        # type: (Optional[_Bound], Optional[_Bound]) -> str
+        if lower is not None and upper is not None and lower.version == upper.version:
+            return "=={0}".format(lower.version)
+        specs = []
+        if lower is not None:
+            specs.append("{0}{1}".format(">=" if lower.inclusive else ">", lower.version))
+        if upper is not None:
+            specs.append("{0}{1}".format("<=" if upper.inclusive else "<", upper.version))
+        return ",".join(specs)
+
+    def __eq__(self, other):
+        if not isinstance(other, PyVersionSet):
+            return NotImplemented
+        return self.intervals == other.intervals
+
+    def __hash__(self):
+        return hash(self.intervals)
+
+    def __contains__(self, version):
+        # type: (Union[str, Version]) -> bool
+        if not isinstance(version, Version):
+            version = Version(str(version))
+        point = _Bound(version, True)
+        return any(
+            not _is_empty_interval(lower, point) and not _is_empty_interval(point, upper)
+            for lower, upper in self.intervals
+        )
+
+    def __and__(self, other):
+        # type: (PyVersionSet) -> PyVersionSet
+        if not isinstance(other, PyVersionSet):
+            return NotImplemented
+        intervals = []
+        left, right = self.intervals, other.intervals
+        i = j = 0
+        while i < len(left) and j < len(right):
+            lower = max(left[i][0], right[j][0], key=_lower_key)
+            upper = min(left[i][1], right[j][1], key=_upper_key)
+            if not _is_empty_interval(lower, upper):
+                intervals.append((lower, upper))
+            if _upper_key(left[i][1]) < _upper_key(right[j][1]):
+                i += 1
+            else:
+                j += 1
+        return PyVersionSet(intervals)
+
+    def __or__(self, other):
+        # type: (PyVersionSet) -> PyVersionSet
+        if not isinstance(other, PyVersionSet):
+            return NotImplemented
+        return PyVersionSet(self.intervals + other.intervals)
+
+    def __invert__(self):
+        # type: () -> PyVersionSet
+        gaps = []
+        start = None  # type: Optional[_Bound]
+        for lower, upper in self.intervals:
+            if lower is not None:
+                gaps.append((start, _Bound(lower.version, not lower.inclusive)))
+            if upper is None:
+                return PyVersionSet(gaps)
+            start = _Bound(upper.version, not upper.inclusive)
+        gaps.append((start, None))
+        return PyVersionSet(gaps)
+
+    @property
+    def is_empty(self):
+        # type: () -> bool
+        return not self.intervals
+
+    @property
+    def is_universal(self):
+        # type: () -> bool
+        return self.intervals == ((None, None),)
+
+    @classmethod
+    def universal(cls):
+        # type: () -> PyVersionSet
+        return cls([(None, None)])
+
+    @classmethod
+    def from_specifier(cls, specifier):
+        # type: (Union[str, Specifier, SpecifierSet]) -> PyVersionSet
+        """Build the set of versions matched by a specifier.
+
+        :param specifier: A specifier, specifier set or comma separated string
+        :return: The versions matching every specifier
+        """
+        result = cls.universal()
+        for spec in SpecifierSet(str(specifier)):
+            result &= cls._from_operator(spec.operator, spec.version)
+        return result
+
+    @classmethod
+    def _from_operator(cls, op, version):
+        # type: (str, str) -> PyVersionSet
+        if version.endswith("*"):
+            # 3.7.* and the broken but common 3.7* both mean the 3.7 series
+            prefix = version.rstrip("*").rstrip(".")
+            if not prefix or op not in ("==", "!="):
+                return cls.universal()
+            try:
+                lower = Version(prefix)
+            except InvalidVersion:
+                return cls.universal()
+            matching = cls(
+                [(_Bound(lower, True), _Bound(_bump_release(lower.release), False))]
+            )
+            return matching if op == "==" else ~matching
+        try:
+            parsed = Version(version)
+        except InvalidVersion:
+            return cls.universal()
+        if op in ("==", "==="):
+            return cls([(_Bound(parsed, True), _Bound(parsed, True))])
+        if op == "!=":
+            return ~cls([(_Bound(parsed, True), _Bound(parsed, True))])
+        if op == "~=" and len(parsed.release) > 1:
+            upper = _bump_release(parsed.release[:-1])
+            return cls([(_Bound(parsed, True), _Bound(upper, False))])
+        if op in ("<", "<="):
+            return cls([(None, _Bound(parsed, op == "<="))])
+        if op in (">", ">="):
+            return cls([(_Bound(parsed, op == ">="), None)])
+        return cls.universal()
+
+    @property
+    def hull(self):
+        # type: () -> PyVersionSet
+        """The smallest single interval containing the whole set."""
+        if self.is_empty:
+            return self
+        return PyVersionSet([(self.intervals[0][0], self.intervals[-1][1])])
+
+    def as_specifierset(self):
+        # type: () -> Optional[SpecifierSet]
+        """Express the set as a :class:`~packaging.specifiers.SpecifierSet`.
+
+        The set is written as the bounds of its hull followed by an exclusion for
+        each gap, which must either be a single version or span whole minor
+        releases.
+
+        :return: The specifier set, or None if the set is empty or a gap cannot be
+            expressed
+        """
+        if self.is_empty:
+            return None
+        specs = [self._format_interval(*self.hull.intervals[0])]
+        for (_, upper), (lower, _) in zip(self.intervals, self.intervals[1:]):
+            if upper.version == lower.version:
+                specs.append("!={0}".format(upper.version))
+                continue
+            if upper.inclusive or not lower.inclusive:
+                return None
+            minor_versions = _get_minor_versions_between(upper.version, lower.version)
+            if minor_versions is None:
+                return None
+            specs.extend("!={0}.*".format(version) for version in minor_versions)
+        return get_specifierset(",".join(spec for spec in specs if spec))
+
+
+def _get_minor_versions_between(start, end):
+    # type: (Version, Version) -> Optional[List[str]]
+    """List the ``X.Y`` releases from **start** up to but excluding **end**.
+
+    Releases past the last known minor version of a major version, per
+    :data:`MAX_VERSIONS`, are skipped.  Returns None unless both versions are
+    plain ``X.Y`` releases.
+    """
+    if any(
+        len(v.release) > 2 or v.pre or v.post or v.dev or v.local for v in (start, end)
+    ):
+        return None
+    major, minor = (start.release + (0,))[:2]
+    end_release = (end.release + (0,))[:2]
+    versions = []
+    while (major, minor) < end_release:
+        if major < end_release[0] and minor > MAX_VERSIONS.get(major, -1):
+            if major not in MAX_VERSIONS:
+                return None
+            major, minor = major + 1, 0
+            continue
+        versions.append("{0}.{1}".format(major, minor))
+        minor += 1
+    return versions
+
+
+def _python_version_specifier(op, version):
+    # type: (str, str) -> str
+    """Rewrite a ``python_version`` comparison as a full version specifier.
+
+    ``python_version`` only ever holds ``X.Y``, so ``python_version == "3.7"``
+    matches every ``3.7.*`` release and ``python_version <= "3.7"`` matches
+    everything below ``3.8``.
+    """
+    try:
+        parsed = Version(version)
+    except InvalidVersion:
+        return "{0}{1}".format(op, version)
+    if len(parsed.release) > 2 or parsed.is_prerelease or parsed.is_postrelease:
+        return "{0}{1}".format(op, version)
+    if op in ("==", "!="):
+        return "{0}{1}.*".format(op, version)
+    if op in ("<=", ">"):
+        return "{0}{1}".format(REPLACE_RANGES[op], _bump_release(parsed.release))
+    return "{0}{1}".format(op, version)
+
+
+def get_pyversion_set(specifier):
+    # type: (Union[str, Specifier, SpecifierSet, None]) -> PyVersionSet
+    """Get the shared :class:`PyVersionSet` for a specifier.
+
+    :param specifier: A specifier, specifier set or comma separated string
+    :raises InvalidSpecifier: If the string is not a valid specifier
+    :return: The versions matching every specifier, memoized per specifier string
+    """
+    return _PYVERSION_SET_CACHE.get(str(specifier) if specifier else "")
+
+
+_PYVERSION_SET_CACHE = InternCache(PyVersionSet.from_specifier)
+
+
+def _get_pyversion_set_from_markers(elements):
+    # type: (List[Any]) -> PyVersionSet
+    """The python versions for which a marker can hold, ignoring every other
+    variable."""
+    groups = [PyVersionSet.universal()]
+    for element in elements:
+        if isinstance(element, list):
+            groups[-1] &= _get_pyversion_set_from_markers(element)
+        elif isinstance(element, tuple):
+            groups[-1] &= _get_pyversion_set_from_atom(*element)
+        elif element == "or":
+            groups.append(PyVersionSet.universal())
+    return reduce(operator.or_, groups)
+
+
+def _get_pyversion_set_from_atom(lhs, op, rhs):
+    # type: (Any, Any, Any) -> PyVersionSet
+    if not is_instance(lhs, Variable) or lhs.value not in (
+        "python_version",
+        "python_full_version",
+    ):
+        return PyVersionSet.universal()
+    if op.value in ("in", "not in"):
+        prefix = "==" if op.value == "in" else "!="
+        specs = [
+            get_pyversion_set(
+                _python_version_specifier(prefix, spec.version)
+                if lhs.value == "python_version"
+                else str(spec)
+            )
+            for spec in _split_specifierset_str(rhs.value, prefix=prefix)
+        ]
+        if op.value == "in":
+            return reduce(operator.or_, specs, PyVersionSet())
+        return reduce(operator.and_, specs, PyVersionSet.universal())
+    if lhs.value == "python_version":
+        return get_pyversion_set(_python_version_specifier(op.value, rhs.value))
+    return get_pyversion_set("{0}{1}".format(op.value, rhs.value))
+
+
 def _ensure_marker(marker):
     # type: (Union[str, Marker]) -> Marker
     if not is_instance(marker, Marker):
-        return Marker(str(marker))
+        return MARKER_CACHE.get(str(marker))
     return marker
 
 
@@ -345,10 +885,13 @@ def _get_stripped_marker(marker, strip_func):
     if not marker:
         return None
     marker = _ensure_marker(marker)
-    elements = marker._markers
+    # markers may be shared through the intern cache, so never modify them in place
+    elements = copy.deepcopy(marker._markers)
     strip_func(elements)
     if elements:
-        return marker
+        stripped = Marker.__new__(Marker)
+        stripped._markers = elements
+        return stripped
     return None
 
 
@@ -384,20 +927,6 @@ def _markers_collect_extras(markers, collection):
             _markers_collect_extras(el, collection)
 
 
-def _markers_collect_pyversions(markers, collection):
-    local_collection = []
-    marker_format_str = "{0}"
-    for el in reversed(markers):
-        if isinstance(el, tuple) and el[0].value == "python_version":
-            new_marker = str(gen_marker(el))
-            local_collection.append(marker_format_str.format(new_marker))
-        elif isinstance(el, list):
-            _markers_collect_pyversions(el, local_collection)
-    if local_collection:
-        # local_collection = "{0}".format(" ".join(local_collection))
-        collection.extend(local_collection)
-
-
 def _markers_contains_extra(markers):
     # Optimization: the marker element is usually appended at the end.
     return _markers_contains_key(markers, "extra")
@@ -433,31 +962,41 @@ def get_contained_extras(marker):
 def get_contained_pyversions(marker):
     """Collect all `python_version` operands from a marker."""
 
-    collection = []
     if not marker:
         return set()
-    marker = _ensure_marker(marker)
-    # Collect the (Variable, Op, Value) tuples and string joiners from the marker
-    _markers_collect_pyversions(marker._markers, collection)
-    marker_str = " and ".join(sorted(collection))
-    if not marker_str:
+    # callers may modify the result, so never hand out the cached instance
+    return copy.copy(_CONTAINED_PYVERSIONS_CACHE.get(str(_ensure_marker(marker))))
+
+
+def _markers_contains_or(markers):
+    return any(
+        element == "or" or (isinstance(element, list) and _markers_contains_or(element))
+        for element in markers
+    )
+
+
+def _markers_collect_pyversion_atoms(markers, collection):
+    for element in markers:
+        if isinstance(element, tuple) and element[0].value == "python_version":
+            collection.append(element)
+        elif isinstance(element, list):
+            _markers_collect_pyversion_atoms(element, collection)
+
+
+def _get_contained_pyversions(marker_str):
+    marker = _ensure_marker(marker_str)
+    collection = []  # type: List[Tuple[Any, Any, Any]]
+    _markers_collect_pyversion_atoms(marker._markers, collection)
+    if not collection:
         return set()
-    # Use the distlib dictionary parser to create a dictionary 'trie' which is a bit
-    # easier to reason about
-    marker_dict = markers.parse_marker(marker_str)[0]
-    version_set = set()
-    pyversions, _ = parse_marker_dict(marker_dict)
-    if isinstance(pyversions, set):
-        version_set.update(pyversions)
-    elif pyversions is not None:
-        version_set.add(pyversions)
-    # Each distinct element in the set was separated by an "and" operator in the marker
-    # So we will need to reduce them with an intersection here rather than a union
-    # in order to find the boundaries
-    versions = set()
-    if version_set:
-        versions = reduce(lambda x, y: x & y, version_set)
-    return versions
+    if _markers_contains_or(marker._markers):
+        # the constraints are not simply joined with "and", so combine their
+        # version ranges as intervals
+        pyversions = _get_pyversion_set_from_markers(marker._markers)
+        specifiers = pyversions.as_specifierset() or pyversions.hull.as_specifierset()
+        if specifiers is not None:
+            return specifiers
+    return get_specset(collection)
 
 
 def contains_extra(marker):
@@ -584,9 +1123,15 @@ def parse_marker_dict(marker_dict):
                 finalized_marker = str(markers)
             specset._specs = frozenset(specs)
             return specset, finalized_marker
-        # Actually when we "or" things as well we can also just turn them into a reduced
-        # set using this logic now
-        sides = reduce(lambda x, y: set(x) & set(y), side_spec_list)
+        # When we "or" things together the result spans the union of both sides
+        pyversions = reduce(
+            operator.or_, (_get_pyversion_set_from_specs(s) for s in side_spec_list)
+        )
+        specifiers = pyversions.as_specifierset()
+        if specifiers is not None:
+            sides = set(specifiers)
+        else:
+            sides = reduce(lambda x, y: set(x) & set(y), side_spec_list)
         finalized_marker = " or ".join(
             [normalize_marker_str(m) for m in side_markers_list]
         )
@@ -607,6 +1152,19 @@ def parse_marker_dict(marker_dict):
         return specset, finalized_marker
 
 
+def _get_pyversion_set_from_specs(specs):
+    # type: (Iterable[Specifier]) -> PyVersionSet
+    """The versions matching every specifier of a ``python_version`` marker."""
+    return reduce(
+        operator.and_,
+        (
+            get_pyversion_set(_python_version_specifier(spec.operator, spec.version))
+            for spec in specs
+        ),
+        PyVersionSet.universal(),
+    )
+
+
 def _contains_micro_version(version_string):
     return re.search(r"\d+\.\d+\.\d+", version_string) is not None
 
@@ -620,11 +1178,14 @@ def format_pyversion(parts):
 
 
 def normalize_marker_str(marker) -> str:
-    marker_str = ""
     if not marker:
         return None
-    if not is_instance(marker, Marker):
-        marker = _ensure_marker(marker)
+    return _NORMALIZED_MARKER_CACHE.get(str(marker))
+
+
+def _normalize_marker_str(marker) -> str:
+    marker_str = ""
+    marker = _ensure_marker(marker)
     pyversion = get_contained_pyversions(marker)
     marker = get_without_pyversion(marker)
     if pyversion:
@@ -639,6 +1200,10 @@ def normalize_marker_str(marker) -> str:
 
 
 def marker_from_specifier(spec) -> Marker:
+    return _SPECIFIER_MARKER_CACHE.get(spec)
+
+
+def _marker_from_specifier(spec) -> Marker:
     if not any(spec.startswith(k) for k in Specifier._operators.keys()):
         if spec.strip().lower() in ["any", "<any>", "*"]:
             return None
@@ -648,20 +1213,567 @@ def marker_from_specifier(spec) -> Marker:
     if not spec:
         return None
     marker_segments = []
-    for marker_segment in cleanup_pyspecs(spec):
+    for marker_segment in cleanup_pyspecs(spec, joiner="and"):
         marker_segments.append(format_pyversion(marker_segment))
     marker_str = " and ".join(marker_segments).replace('"', "'")
-    return Marker(marker_str)
+    return MARKER_CACHE.get(marker_str)
+
+
+_NORMALIZED_MARKER_CACHE = InternCache(_normalize_marker_str)
+_SPECIFIER_MARKER_CACHE = InternCache(_marker_from_specifier)
+_CONTAINED_PYVERSIONS_CACHE = InternCache(_get_contained_pyversions)
+
+
+# Variables whose values are plain identifiers, compared as strings
+STRING_MARKER_VARIABLES = frozenset(
+    [
+        "extra",
+        "implementation_name",
+        "os_name",
+        "platform_machine",
+        "platform_python_implementation",
+        "platform_system",
+        "sys_platform",
+    ]
+)
+_ORDERED_OPS = frozenset(["<", "<=", ">", ">=", "==", "!="])
+_FLIPPED_OPS = {"<": ">", "<=": ">=", ">": "<", ">=": "<=", "==": "==", "!=": "!="}
+_COMPLEMENT_OPS = {
+    "<": ">=",
+    ">=": "<",
+    ">": "<=",
+    "<=": ">",
+    "==": "!=",
+    "!=": "==",
+    "in": "not in",
+    "not in": "in",
+}
+
+
+class MarkerAtom(namedtuple("MarkerAtom", ["variable", "op", "value", "reversed"])):
+    """A single ``variable op "value"`` comparison from a marker.
+
+    Comparisons are stored with the environment variable on the left whenever
+    swapping the operands preserves their meaning; otherwise ``reversed`` is set and
+    the atom reads ``"value" op variable``.
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        if self.reversed:
+            return '"{0}" {1} {2}'.format(self.value, self.op, self.variable)
+        return '{0} {1} "{2}"'.format(self.variable, self.op, self.value)
+
+    @classmethod
+    def from_nodes(cls, lhs, op, rhs):
+        # type: (Any, Any, Any) -> MarkerAtom
+        lhs_is_variable = is_instance(lhs, Variable)
+        if lhs_is_variable == is_instance(rhs, Variable):
+            raise ValueError(
+                "Cannot normalize a marker comparing {0!r} with {1!r}".format(lhs, rhs)
+            )
+        if lhs_is_variable:
+            return cls(lhs.value, op.value, rhs.value, False)
+        variable = rhs.value
+        if op.value in _FLIPPED_OPS and (
+            variable == "python_version" or variable in STRING_MARKER_VARIABLES
+        ):
+            return cls(variable, _FLIPPED_OPS[op.value], lhs.value, False)
+        return cls(variable, op.value, lhs.value, True)
+
+    def evaluate(self, environment):
+        # type: (Dict[str, str]) -> bool
+        try:
+            current = environment[self.variable]
+        except KeyError:
+            raise UndefinedEnvironmentName(
+                "{0!r} does not exist in evaluation environment.".format(self.variable)
+            )
+        if self.reversed:
+            return _eval_op(self.value, Op(self.op), current)
+        return _eval_op(current, Op(self.op), self.value)
+
+
+@lru_cache(maxsize=REQUIREMENTSLIB_MARKER_CACHE_SIZE)
+def _get_atom_kind(atom):
+    # type: (MarkerAtom) -> Optional[str]
+    """Classify how **atom** is evaluated by packaging.
+
+    ``"ordered"`` atoms compare ``python_version``, which is always a final
+    ``X.Y`` release, against a plain version, so they behave as a total order.
+    ``"string"`` atoms fall back to python's string operators.  Anything else
+    (``python_full_version``, which can be a pre-release, ``~=``, wildcards ...)
+    is only ever compared for identity.
+    """
+    if atom.op in ("in", "not in"):
+        return "string"
+    if atom.reversed or atom.op not in _ORDERED_OPS:
+        return None
+    try:
+        Specifier("{0}{1}".format(atom.op, atom.value))
+    except InvalidSpecifier:
+        valid_specifier = False
+    else:
+        valid_specifier = "*" not in atom.value
+    if atom.variable == "python_version":
+        return "ordered" if valid_specifier else None
+    if atom.op in ("==", "!=") and not valid_specifier and "*" not in atom.value:
+        return "string"
+    return None
+
+
+def _complement_atom(atom):
+    # type: (MarkerAtom) -> Optional[MarkerAtom]
+    if _get_atom_kind(atom) is None:
+        return None
+    return atom._replace(op=_COMPLEMENT_OPS[atom.op])
+
+
+@lru_cache(maxsize=REQUIREMENTSLIB_MARKER_CACHE_SIZE)
+def _atom_implies(atom, other):
+    # type: (MarkerAtom, MarkerAtom) -> bool
+    """Whether every environment satisfying **atom** also satisfies **other**."""
+    if atom == other:
+        return True
+    if atom.variable != other.variable:
+        return False
+    kind = _get_atom_kind(atom)
+    if kind == "string" and atom.op == "==":
+        # the variable is exactly atom.value, so just evaluate the other atom
+        try:
+            return other.evaluate({atom.variable: atom.value})
+        except UndefinedComparison:
+            return False
+    if kind != "ordered" or _get_atom_kind(other) != "ordered":
+        return False
+    value, other_value = Version(atom.value), Version(other.value)
+    if atom.op == "==":
+        return _ORDERING_OPERATORS[other.op](value, other_value)
+    if atom.op == "!=":
+        return False
+    if other.op == "!=":
+        if atom.op in (">", "<"):
+            return _ORDERING_OPERATORS[atom.op[0] + "="](value, other_value)
+        return _ORDERING_OPERATORS[atom.op](value, other_value) and value != other_value
+    if other.op[0] != atom.op[0]:
+        return False
+    # both are lower bounds or both are upper bounds
+    if value == other_value:
+        return other.op.endswith("=") or not atom.op.endswith("=")
+    return _ORDERING_OPERATORS[atom.op[0]](value, other_value)
+
+
+_ORDERING_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def _atoms_are_disjoint(atom, other):
+    # type: (MarkerAtom, MarkerAtom) -> bool
+    complement = _complement_atom(other)
+    return complement is not None and _atom_implies(atom, complement)
+
+
+def _atoms_are_exhaustive(atom, other):
+    # type: (MarkerAtom, MarkerAtom) -> bool
+    complement = _complement_atom(atom)
+    return complement is not None and _atom_implies(complement, other)
+
+
+def _conjoin_atoms(atoms):
+    # type: (Iterable[MarkerAtom]) -> Optional[Tuple[MarkerAtom, ...]]
+    """Simplify a conjunction of atoms, returning None if it can never hold."""
+    clause = []  # type: List[MarkerAtom]
+    for atom in atoms:
+        same_variable = [c for c in clause if c.variable == atom.variable]
+        if any(_atoms_are_disjoint(c, atom) for c in same_variable):
+            return None
+        if any(_atom_implies(c, atom) for c in same_variable):
+            continue
+        redundant = [c for c in same_variable if _atom_implies(atom, c)]
+        if redundant:
+            position = clause.index(redundant[0])
+            clause = [c for c in clause if c not in redundant]
+            clause.insert(position, atom)
+        else:
+            clause.append(atom)
+    return tuple(clause)
+
+
+def _clause_implies(clause, other):
+    # type: (Tuple[MarkerAtom, ...], Tuple[MarkerAtom, ...]) -> bool
+    return all(any(_atom_implies(a, o) for a in clause) for o in other)
+
+
+def _resolve_clauses(clause, other):
+    # type: (Tuple[MarkerAtom, ...], Tuple[MarkerAtom, ...]) -> Optional[Tuple]
+    """Combine ``X and a`` with ``X and b`` into ``X`` when ``a or b`` always
+    holds."""
+    if len(clause) != len(other):
+        return None
+    remaining = [a for a in clause if a not in other]
+    extra = [a for a in other if a not in clause]
+    if len(remaining) != 1 or len(extra) != 1:
+        return None
+    if not _atoms_are_exhaustive(remaining[0], extra[0]):
+        return None
+    return tuple(a for a in clause if a != remaining[0])
+
+
+def _simplify_clauses(clauses):
+    # type: (Iterable[Tuple[MarkerAtom, ...]]) -> Tuple[Tuple[MarkerAtom, ...], ...]
+    """Simplify a disjunction of clauses by absorption and resolution."""
+    result = []  # type: List[Tuple[MarkerAtom, ...]]
+    pending = list(clauses)
+    while pending:
+        clause = pending.pop(0)
+        if any(_clause_implies(clause, c) for c in result):
+            continue
+        resolved = None
+        for existing in result:
+            resolved = _resolve_clauses(existing, clause)
+            if resolved is not None:
+                result.remove(existing)
+                # the shorter clause may now absorb or resolve with others
+                pending.insert(0, resolved)
+                break
+        if resolved is None:
+            result = [c for c in result if not _clause_implies(c, clause)]
+            result.append(clause)
+    return tuple(result)
+
+
+class MarkerExpression(object):
+    """A marker in disjunctive normal form.
+
+    The expression is an ``or`` of clauses, each of which is an ``and`` of
+    :class:`MarkerAtom` instances.  Combining expressions with ``&`` and ``|``
+    simplifies the result: duplicate and implied comparisons are dropped,
+    contradictory clauses such as ``os_name == "nt" and os_name == "posix"`` are
+    removed and complementary clauses such as ``python_version < "3.7" or
+    python_version >= "3.7"`` are merged.  Simplification is sound but not
+    complete, an expression which is never satisfiable may not be reported as a
+    contradiction.
+
+    :param clauses: The clauses of the expression, an empty sequence never holds
+        and a sequence containing an empty clause always holds
+    """
+
+    __slots__ = ("clauses", "_hash")
+
+    def __init__(self, clauses=()):
+        # type: (Iterable[Iterable[MarkerAtom]]) -> None
+        conjoined = (_conjoin_atoms(clause) for clause in clauses)
+        self.clauses = _simplify_clauses(c for c in conjoined if c is not None)
+        self._hash = None  # type: Optional[int]
+
+    def __repr__(self):
+        return "<{0}({1!r})>".format(self.__class__.__name__, str(self))
+
+    def __str__(self):
+        if self.is_contradiction:
+            return "<never>"
+        if len(self.clauses) == 1:
+            return " and ".join(str(atom) for atom in self.clauses[0])
+        return " or ".join(
+            "({0})".format(" and ".join(str(a) for a in clause))
+            if len(clause) > 1
+            else str(clause[0])
+            for clause in self.clauses
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, MarkerExpression):
+            return NotImplemented
+        return set(map(frozenset, self.clauses)) == set(map(frozenset, other.clauses))
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(map(frozenset, self.clauses)))
+        return self._hash
+
+    def __and__(self, other):
+        # type: (MarkerExpression) -> MarkerExpression
+        if not isinstance(other, MarkerExpression):
+            return NotImplemented
+        if self.is_tautology or other.is_contradiction:
+            return other
+        if other.is_tautology or self.is_contradiction:
+            return self
+        return MarkerExpression(
+            left + right for left, right in itertools.product(self.clauses, other.clauses)
+        )
+
+    def __or__(self, other):
+        # type: (MarkerExpression) -> MarkerExpression
+        if not isinstance(other, MarkerExpression):
+            return NotImplemented
+        return MarkerExpression(self.clauses + other.clauses)
+
+    @classmethod
+    def from_marker(cls, marker):
+        # type: (Union[str, Marker, None]) -> MarkerExpression
+        """Build an expression from a marker, an empty marker always holds.
+
+        :param Union[str, Marker, None] marker: The marker to convert
+        :raises InvalidMarker: If the string is not a valid marker
+        :raises ValueError: If the marker compares two variables or two values
+        """
+        if not marker:
+            return cls([()])
+        return cls._from_elements(_ensure_marker(marker)._markers)
+
+    @classmethod
+    def _from_elements(cls, elements):
+        # type: (List[Any]) -> MarkerExpression
+        groups = [[]]  # type: List[List[MarkerExpression]]
+        for element in elements:
+            if isinstance(element, list):
+                groups[-1].append(cls._from_elements(element))
+            elif isinstance(element, tuple):
+                groups[-1].append(cls([(MarkerAtom.from_nodes(*element),)]))
+            elif element == "or":
+                groups.append([])
+        return reduce(
+            operator.or_, (reduce(operator.and_, group) for group in groups if group)
+        )
+
+    @property
+    def is_tautology(self):
+        # type: () -> bool
+        """Whether the expression holds in every environment."""
+        return () in self.clauses
+
+    @property
+    def is_contradiction(self):
+        # type: () -> bool
+        """Whether the expression holds in no environment."""
+        return not self.clauses
+
+    @property
+    def atoms(self):
+        # type: () -> Set[MarkerAtom]
+        return {atom for clause in self.clauses for atom in clause}
+
+    @property
+    def variables(self):
+        # type: () -> Set[str]
+        return {atom.variable for atom in self.atoms}
+
+    def as_marker(self):
+        # type: () -> Optional[Marker]
+        """Convert the expression back into an interned marker.
+
+        :raises ValueError: If the expression can never hold
+        :return: The marker, or None if the expression always holds
+        """
+        if self.is_contradiction:
+            raise ValueError("Cannot build a marker which never holds")
+        if self.is_tautology:
+            return None
+        return MARKER_CACHE.get(str(self))
+
+    def evaluate(self, environment=None):
+        # type: (Optional[Dict[str, str]]) -> bool
+        """Evaluate the expression like :meth:`~packaging.markers.Marker.evaluate`.
+
+        :param Optional[Dict[str, str]] environment: Values overriding the current
+            environment
+        """
+        return self.evaluate_many([environment or {}])[0]
+
+    def evaluate_many(self, environments):
+        # type: (Iterable[Dict[str, str]]) -> List[bool]
+        """Evaluate the expression against several environments at once.
+
+        Each distinct comparison is evaluated once per distinct value of its
+        variable, no matter how many environments share that value.
+
+        :param environments: Values overriding the current environment, one mapping
+            per environment to evaluate
+        :return: Whether the expression holds, in the order of **environments**
+        """
+        default_env = default_environment()
+        results = {}  # type: Dict[Tuple[MarkerAtom, Optional[str]], bool]
+
+        def evaluate_atom(atom, environment):
+            key = (atom, environment.get(atom.variable))
+            if key not in results:
+                results[key] = atom.evaluate(environment)
+            return results[key]
+
+        evaluated = []  # type: List[bool]
+        for environment in environments:
+            current = dict(default_env)
+            current.update(environment)
+            evaluated.append(
+                any(
+                    all(evaluate_atom(atom, current) for atom in clause)
+                    for clause in self.clauses
+                )
+            )
+        return evaluated
+
+
+_MARKER_EXPRESSION_CACHE = InternCache(MarkerExpression.from_marker)
+
+
+def get_marker_expression(marker):
+    # type: (Union[str, Marker, None]) -> MarkerExpression
+    """Get the shared, simplified :class:`MarkerExpression` for a marker.
+
+    :param Union[str, Marker, None] marker: A marker or marker string
+    :return: The expression, which always holds for an empty marker
+    """
+    return _MARKER_EXPRESSION_CACHE.get(str(marker) if marker else "")
+
+
+class CompiledMarkers(object):
+    """A batch of markers compiled once for evaluation against many environments.
+
+    Every marker is simplified into a :class:`MarkerExpression` and the distinct
+    comparisons of all of the markers are collected, so each comparison is
+    evaluated once per distinct value of its variable across a whole table of
+    environments.  The results are combined as bitmasks, or as NumPy arrays when
+    requested.
+
+    :param markers: The markers to compile, empty markers always hold
+    """
+
+    def __init__(self, markers):
+        # type: (Iterable[Union[str, Marker, None]]) -> None
+        self.expressions = [get_marker_expression(marker) for marker in markers]
+        atoms = OrderedDict()  # type: Dict[MarkerAtom, int]
+        self.clauses = [
+            [
+                tuple(atoms.setdefault(atom, len(atoms)) for atom in clause)
+                for clause in expression.clauses
+            ]
+            for expression in self.expressions
+        ]  # type: List[List[Tuple[int, ...]]]
+        self.atoms = list(atoms)  # type: List[MarkerAtom]
+
+    def __len__(self):
+        return len(self.expressions)
+
+    def __repr__(self):
+        return "<{0}(markers={1}, atoms={2})>".format(
+            self.__class__.__name__, len(self.expressions), len(self.atoms)
+        )
+
+    def _get_columns(self, environments):
+        # type: (List[Dict[str, str]]) -> Dict[str, List[Any]]
+        default_env = default_environment()
+        return {
+            variable: [
+                env.get(variable, default_env.get(variable, _MISSING))
+                for env in environments
+            ]
+            for variable in {atom.variable for atom in self.atoms}
+        }
+
+    @staticmethod
+    def _evaluate_atom(atom, value):
+        # type: (MarkerAtom, Any) -> bool
+        return atom.evaluate({} if value is _MISSING else {atom.variable: value})
+
+    def evaluate(self, environments, use_numpy=False):
+        """Evaluate every marker against every environment in one pass.
+
+        Like :meth:`~packaging.markers.Marker.evaluate`, each environment overrides
+        the values of the current one.
+
+        :param environments: The environments to evaluate against
+        :param bool use_numpy: Whether to return a NumPy array instead of a list of
+            lists, defaults to False
+        :raises ImportError: If **use_numpy** is set but NumPy is not installed
+        :raises UndefinedEnvironmentName: If a marker uses an unknown variable
+        :return: A boolean matrix with a row for each marker and a column for each
+            environment, as a NumPy array or a list of lists
+        """
+        environments = list(environments)
+        columns = self._get_columns(environments)
+        if use_numpy:
+            import numpy
+
+            return self._evaluate_arrays(numpy, columns, len(environments))
+        return self._evaluate_bitmasks(columns, len(environments))
+
+    def _evaluate_bitmasks(self, columns, size):
+        # type: (Dict[str, List[Any]], int) -> List[List[bool]]
+        # bit i of each mask is set when environment i matches
+        positions = {}  # type: Dict[str, Dict[Any, int]]
+        for variable, values in columns.items():
+            masks = positions[variable] = {}
+            for index, value in enumerate(values):
+                masks[value] = masks.get(value, 0) | 1 << index
+        atom_masks = []  # type: List[int]
+        for atom in self.atoms:
+            mask = 0
+            for value, value_mask in positions[atom.variable].items():
+                if self._evaluate_atom(atom, value):
+                    mask |= value_mask
+            atom_masks.append(mask)
+        every_environment = (1 << size) - 1
+        rows = []  # type: List[List[bool]]
+        for clauses in self.clauses:
+            result = 0
+            for clause in clauses:
+                clause_mask = every_environment
+                for index in clause:
+                    clause_mask &= atom_masks[index]
+                result |= clause_mask
+            rows.append([bool(result >> index & 1) for index in range(size)])
+        return rows
+
+    def _evaluate_arrays(self, numpy, columns, size):
+        codes = {}  # type: Dict[str, Tuple[List[Any], Any]]
+        for variable, values in columns.items():
+            distinct = {}  # type: Dict[Any, int]
+            inverse = [distinct.setdefault(value, len(distinct)) for value in values]
+            codes[variable] = (list(distinct), numpy.array(inverse, dtype=numpy.intp))
+        atom_matrix = numpy.empty((len(self.atoms), size), dtype=bool)
+        for row, atom in enumerate(self.atoms):
+            distinct, inverse = codes[atom.variable]
+            truth = numpy.array(
+                [self._evaluate_atom(atom, value) for value in distinct], dtype=bool
+            )
+            atom_matrix[row] = truth[inverse]
+        matrix = numpy.zeros((len(self.expressions), size), dtype=bool)
+        for row, clauses in enumerate(self.clauses):
+            for clause in clauses:
+                if not clause:
+                    matrix[row] = True
+                    break
+                matrix[row] |= numpy.logical_and.reduce(atom_matrix[list(clause)], axis=0)
+        return matrix
 
 
 def merge_markers(m1, m2):
     # type: (Marker, Marker) -> Optional[Marker]
+    """Combine two markers with ``and``, simplifying the result.
+
+    Comparisons already implied by the other marker are dropped, so merging the
+    same markers repeatedly does not grow the result.
+
+    :param m1: The first marker
+    :param m2: The second marker
+    :return: A marker satisfied where both markers are, only None if neither
+        marker is set
+    """
     if not all((m1, m2)):
         return next(iter(v for v in (m1, m2) if v), None)
     m1 = _ensure_marker(m1)
     m2 = _ensure_marker(m2)
-    _markers = []  # type: List[Marker]
-    for marker in (m1, m2):
-        _markers.append(str(marker))
-    marker_str = " and ".join([normalize_marker_str(m) for m in _markers if m])
-    return _ensure_marker(normalize_marker_str(marker_str))
+    merged = get_marker_expression(str(m1)) & get_marker_expression(str(m2))
+    if merged.is_contradiction or merged.is_tautology:
+        # there is no simpler marker which never or always holds, so keep the
+        # merged markers as they are
+        return _ensure_marker("({0!s}) and ({1!s})".format(m1, m2))
+    return merged.as_marker()
@@ -1,4 +1,8 @@
+import asyncio
+import functools
+import hashlib
 import io
+import itertools
 import json
 import logging
 import operator
@@ -6,10 +10,10 @@ import os
 import zipfile
 from collections import defaultdict
 from datetime import datetime
-from functools import reduce
+from functools import lru_cache, reduce
 from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
-import pip._vendor.requests as requests
+import requests
 from pip._vendor.distlib import wheel
 from pip._vendor.distlib.metadata import Metadata
 from pip._vendor.packaging.markers import Marker
@@ -17,10 +21,14 @@ from pip._vendor.packaging.requirements import Requirement as PackagingRequireme
 from pip._vendor.packaging.specifiers import Specifier, SpecifierSet
 from pip._vendor.packaging.tags import Tag
 from pip._vendor.packaging.version import _BaseVersion, parse
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
+from pydantic.datetime_parse import parse_datetime
 from pydantic.json import pydantic_encoder
 
+from ..environment import REQUIREMENTSLIB_ASYNC_CONCURRENCY
 from ..fileutils import open_file
+from ..sessions import get_session
+from .cache import HTTP_CACHE
 from .common import ReqLibBaseModel
 from .markers import (
     get_contained_extras,
@@ -126,25 +134,70 @@ def get_remote_sdist_metadata(line) -> SetupInfo:
         return req.line_instance.setup_info
 
 
-def get_remote_wheel_metadata(whl_file) -> Optional[Metadata]:
+def get_remote_wheel_metadata(whl_file, session=None) -> Optional[Metadata]:
     parsed_metadata = None
-    data = io.BytesIO()
-    with open_file(whl_file) as fp:
-        for chunk in iter(lambda: fp.read(8096), b""):
-            data.write(chunk)
-    with zipfile.ZipFile(data, mode="r", compression=zipfile.ZIP_DEFLATED) as zf:
-        metadata = None
-        for fn in zf.namelist():
-            if os.path.basename(fn) == "METADATA":
-                metadata = fn
-                break
-        if metadata is None:
-            raise RuntimeError("No metadata found in wheel: {0}".format(whl_file))
-        with zf.open(metadata, "r") as metadata_fh:
-            parsed_metadata = Metadata(fileobj=metadata_fh)
+    with open_file(whl_file, session=session, seekable=True) as fp:
+        with zipfile.ZipFile(fp, mode="r", compression=zipfile.ZIP_DEFLATED) as zf:
+            metadata = None
+            for fn in zf.namelist():
+                if os.path.basename(fn) == "METADATA":
+                    metadata = fn
+                    break
+            if metadata is None:
+                raise RuntimeError("No metadata found in wheel: {0}".format(whl_file))
+            with zf.open(metadata, "r") as metadata_fh:
+                parsed_metadata = Metadata(fileobj=metadata_fh)
     return parsed_metadata
 
 
+def verify_metadata_hashes(content: bytes, hashes: Dict[str, str]) -> bool:
+    """Check **content** against a mapping of ``{algorithm: hexdigest}``.
+
+    :param bytes content: The downloaded metadata file
+    :param Dict[str, str] hashes: The hashes advertised by the index
+    :return: Whether every supported hash matched, and at least one was checked
+        (an empty mapping is trivially valid)
+    :rtype: bool
+    """
+    if not hashes:
+        return True
+    checked = False
+    for algorithm, value in hashes.items():
+        if algorithm not in hashlib.algorithms_available:
+            continue
+        if hashlib.new(algorithm, content).hexdigest() != value.lower():
+            return False
+        checked = True
+    return checked
+
+
+def get_remote_metadata_sidecar(url, hashes=None, session=None) -> Optional[Metadata]:
+    """Fetch the :pep:`658` core metadata file served beside a distribution.
+
+    :param str url: The URL of the distribution file
+    :param Optional[Dict[str, str]] hashes: The hashes of the metadata file as
+        advertised by the index
+    :param Optional[Session] session: A :class:`~requests.Session` instance, defaults
+        to the shared pooled session
+    :return: The parsed metadata, or None if it is unavailable or fails
+        verification
+    :rtype: Optional[Metadata]
+    """
+    metadata_url = "{0}.metadata".format(url.split("#", 1)[0])
+    if session is None:
+        session = get_session()
+    try:
+        with session.get(metadata_url) as r:
+            r.raise_for_status()
+            content = r.content
+    except requests.exceptions.RequestException:
+        return None
+    if not verify_metadata_hashes(content, hashes or {}):
+        logger.warning("Hash mismatch for metadata file: {0}".format(metadata_url))
+        return None
+    return Metadata(fileobj=io.BytesIO(content))
+
+
 def create_specifierset(spec=None):
     # type: (Optional[str]) -> SpecifierSet
     if isinstance(spec, SpecifierSet):
@@ -209,29 +262,35 @@ class Dependency(ReqLibBaseModel):
     def pin(self):
         # type: () -> "Package"
         base_package = get_package(self.name)
-        sorted_releases = sorted(
-            base_package.releases.non_yanked_releases,
-            key=operator.attrgetter("parsed_version"),
-            reverse=True,
-        )
-        version = next(
-            iter(self.specifier.filter((r.version for r in sorted_releases))), None
-        )
+        version = self._get_pinned_version(base_package)
+        return get_package_version(self.name, str(version))
+
+    async def apin(self, semaphore=None):
+        # type: (Optional[asyncio.Semaphore]) -> "Package"
+        """Asynchronous variant of :meth:`pin`.
+
+        :param Optional[asyncio.Semaphore] semaphore: Bounds the number of
+            concurrent requests
+        :return: The package for the newest version matching the specifier
+        :rtype: :class:`Package`
+        """
+        base_package = await aget_package(self.name, semaphore=semaphore)
+        version = self._get_pinned_version(base_package)
+        return await aget_package_version(self.name, str(version), semaphore=semaphore)
+
+    def _get_pinned_version(self, base_package):
+        # type: ("Package") -> str
+        sorted_versions = base_package.releases.sorted_versions(include_yanked=False)
+        version = next(iter(self.specifier.filter(sorted_versions)), None)
         if not version:
             version = next(
-                iter(
-                    self.specifier.filter(
-                        (r.version for r in sorted_releases), prereleases=True
-                    )
-                ),
-                None,
+                iter(self.specifier.filter(sorted_versions, prereleases=True)), None
             )
         if not version:
             raise RuntimeError(
                 "Failed to resolve {0} ({1!s})".format(self.name, self.specifier)
             )
-        match = get_package_version(self.name, str(version))
-        return match
+        return version
 
     @classmethod
     def from_requirement(cls, req, parent=None):
@@ -383,23 +442,31 @@ class ParsedTag(BaseModel):
 def parse_tag(tag) -> ParsedTag:
     """Parse a :class:`~packaging.tags.Tag` instance.
 
+    The distinct tags seen on an index are few and repeat constantly, so results
+    are memoized by ``(interpreter, abi, platform)``.
+
     :param :class:`~packaging.tags.Tag` tag: A tag to parse
     :return: A parsed tag with combined markers, supported platform and python version
     """
+    return _parse_tag(tag.interpreter, tag.abi, tag.platform)
+
+
+@lru_cache(maxsize=None)
+def _parse_tag(interpreter: str, abi: str, platform: str) -> ParsedTag:
     platform_system = None
     python_version = None
     version = None
     marker_str = ""
-    if tag.platform.startswith("macos"):
+    if platform.startswith("macos"):
         platform_system = "Darwin"
-    elif tag.platform.startswith("manylinux") or tag.platform.startswith("linux"):
+    elif platform.startswith("manylinux") or platform.startswith("linux"):
         platform_system = "Linux"
-    elif tag.platform.startswith("win32"):
+    elif platform.startswith("win32"):
         platform_system = "Windows"
     if platform_system:
         marker_str = 'platform_system == "{}"'.format(platform_system)
-    if tag.interpreter:
-        version = tag.interpreter[2:]
+    if interpreter:
+        version = interpreter[2:]
         py_version_str = ""
         if len(version) == 1:
             py_version_str = ">={}.0,<{}".format(version, str(int(version) + 1))
@@ -424,10 +491,58 @@ def parse_tag(tag) -> ParsedTag:
         marker_string=marker_str,
         python_version=version,
         platform_system=platform_system,
-        abi=tag.abi,
+        abi=abi,
     )
 
 
+def parse_wheel_tags(filename: str) -> Tuple[ParsedTag, ...]:
+    """Parse every tag supported by the wheel named **filename**.
+
+    :param str filename: The filename (or URL) of a wheel
+    :return: The parsed tags
+    :rtype: Tuple[ParsedTag, ...]
+    """
+    whl = wheel.Wheel(filename)
+    return _parse_wheel_tags(tuple(whl.pyver), tuple(whl.abi), tuple(whl.arch))
+
+
+@lru_cache(maxsize=4096)
+def _parse_wheel_tags(pyver, abi, arch):
+    # type: (Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]) -> Tuple[ParsedTag, ...]
+    return tuple(parse_tag(Tag(*tag)) for tag in itertools.product(pyver, abi, arch))
+
+
+@lru_cache(maxsize=4096)
+def get_markers_from_tags(tags: Tuple[ParsedTag, ...]) -> str:
+    """Combine the markers of a wheel's parsed tags into a single marker string.
+
+    :param Tuple[ParsedTag, ...] tags: The parsed tags of a wheel
+    :return: A marker string, or an empty string if the wheel is universal
+    :rtype: str
+    """
+    supported_platforms = []
+    supported_pyversions = []
+    marker_strings = []
+    for parsed_tag in tags:
+        if parsed_tag.marker_string:
+            marker_strings.append(parsed_tag.marker_string)
+        if parsed_tag.python_version:
+            supported_pyversions.append(parsed_tag.python_version)
+    if not (marker_strings or supported_platforms):
+        return ""
+    if (
+        all(pyversion in supported_pyversions for pyversion in ["2", "3"])
+        and not supported_platforms
+    ):
+        return ""
+    return " or ".join(_normalize_marker_string(m) for m in marker_strings)
+
+
+@lru_cache(maxsize=None)
+def _normalize_marker_string(marker_string: str) -> str:
+    return str(Marker(marker_string))
+
+
 class ReleaseUrl(BaseModel):
     md5_digest: Digest
     packagetype: str
@@ -445,6 +560,7 @@ class ReleaseUrl(BaseModel):
     python_version: Optional[str] = "source"
     requires_python: Optional[str] = None
     tags: List[ParsedTag] = []
+    core_metadata: Union[bool, Dict[str, str]] = False
 
     @validator("packagetype", pre=True)
     def validate_package_type(cls, packagetype):
@@ -470,6 +586,16 @@ class ReleaseUrl(BaseModel):
             return marker_from_specifier(self.requires_python)
         return None
 
+    @property
+    def has_metadata_file(self) -> bool:
+        return self.core_metadata is not False
+
+    @property
+    def metadata_hashes(self) -> Dict[str, str]:
+        if isinstance(self.core_metadata, dict):
+            return self.core_metadata
+        return {}
+
     @property
     def pep508_url(self):
         # type: () -> str
@@ -480,32 +606,19 @@ class ReleaseUrl(BaseModel):
         return req_str
 
     def get_markers_from_wheel(self) -> str:
-        supported_platforms = []
-        supported_pyversions = []
-        supported_abis = []
-        markers = []
-        for parsed_tag in self.tags:
-            if parsed_tag.marker_string:
-                markers.append(Marker(parsed_tag.marker_string))
-            if parsed_tag.python_version:
-                supported_pyversions.append(parsed_tag.python_version)
-            if parsed_tag.abi:
-                supported_abis.append(parsed_tag.abi)
-        if not (markers or supported_platforms):
-            return ""
-        if (
-            all(pyversion in supported_pyversions for pyversion in ["2", "3"])
-            and not supported_platforms
-        ):
-            marker_line = ""
-        else:
-            marker_line = " or ".join(["{}".format(str(marker)) for marker in markers])
-        return marker_line
+        return get_markers_from_tags(tuple(self.tags))
 
     def get_dependencies(self) -> Tuple["ReleaseUrl", Dict[str, Union[List[str], str]]]:
         results = {"requires_python": None}
         requires_dist = []  # type: List[str]
-        if self.is_wheel:
+        metadata = None
+        if self.has_metadata_file:
+            metadata = get_remote_metadata_sidecar(self.url, self.metadata_hashes)
+        if metadata is not None:
+            requires_dist = metadata.run_requires
+            if not self.requires_python:
+                results["requires_python"] = metadata._legacy.get("Requires-Python")
+        elif self.is_wheel:
             metadata = get_remote_wheel_metadata(self.url)
             if metadata is not None:
                 requires_dist = metadata.run_requires
@@ -521,12 +634,18 @@ class ReleaseUrl(BaseModel):
                 if metadata.requires:
                     requires_dist = [str(v) for v in metadata.requires.values()]
         results["requires_dist"] = requires_dist
-        requires_python = getattr(self, "requires_python", results["requires_python"])
-        self.requires_python = requires_python
+        if results["requires_python"] == "UNKNOWN":
+            # distlib's placeholder for a missing field
+            results["requires_python"] = None
+        if not self.requires_python:
+            self.requires_python = results["requires_python"]
         return self, results
 
     @property
     def sha256(self) -> str:
+        if isinstance(self.digests, dict):
+            # The JSON API provides digests as a mapping of algorithm to value
+            return self.digests.get("sha256")
         return next(
             iter(digest for digest in self.digests if digest.algorithm == "sha256")
         ).value
@@ -536,6 +655,10 @@ class ReleaseUrl(BaseModel):
         valid_digest_keys = set("{0}_digest".format(k) for k in VALID_ALGORITHMS.keys())
         digest_keys = set(release_dict.keys()) & valid_digest_keys
         creation_kwargs = {k: v for k, v in release_dict.items() if k not in digest_keys}
+        # PEP 691 spells this ``core-metadata``, PEP 658 ``data-dist-info-metadata``
+        for metadata_key in ("data-dist-info-metadata", "core-metadata"):
+            if metadata_key in creation_kwargs:
+                creation_kwargs["core_metadata"] = creation_kwargs.pop(metadata_key)
         if name is not None:
             creation_kwargs["name"] = name
         for k in digest_keys:
@@ -545,10 +668,7 @@ class ReleaseUrl(BaseModel):
             creation_kwargs[k] = Digest.create(k.replace("_digest", ""), digest)
         release_url = cls(**filter_dict(creation_kwargs))
         if release_url.is_wheel:
-            supported_tags = [
-                parse_tag(Tag(*tag)) for tag in wheel.Wheel(release_url.url).tags
-            ]
-            release_url.tags = supported_tags
+            release_url.tags = list(parse_wheel_tags(release_url.url))
         return release_url
 
 
@@ -697,19 +817,78 @@ def get_releases_from_package(releases, name=None) -> List[Release]:
 
 
 class ReleaseCollection(BaseModel):
-    releases: List[Release] = []
+    """The releases of a package, indexed by version string.
+
+    Releases loaded from a JSON API response are kept in their raw form and only
+    converted into :class:`Release` instances the first time they are accessed,
+    so looking up the latest release or a single pinned version never pays for
+    parsing the rest of the package's history.
+    """
+
+    _name: Optional[str] = PrivateAttr(default=None)
+    _index: Dict[str, Union[Release, List[Dict[str, Any]]]] = PrivateAttr(
+        default_factory=dict
+    )
+
+    def __init__(self, releases: Optional[List[Release]] = None, **data):
+        super(ReleaseCollection, self).__init__(**data)
+        for release in releases or []:
+            self._index[release.version] = release
 
     def __iter__(self) -> Iterator[Release]:
-        return iter(self.releases)
+        for version in self.versions:
+            yield self[version]
 
     def __getitem__(self, key: str) -> Release:
-        result = next(iter(r for r in self.releases if r.version == key), None)
-        if result is None:
-            raise KeyError(key)
-        return result
+        release = self._index[key]
+        if not isinstance(release, Release):
+            release = get_release(key, release, name=self._name)
+            self._index[key] = release
+        return release
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
 
     def __len__(self) -> int:
-        return len(self.releases)
+        return len(self._index)
+
+    def dict(self, *args, **kwargs) -> Dict[str, Any]:
+        return {"releases": [release.dict(*args, **kwargs) for release in self]}
+
+    @property
+    def releases(self) -> List[Release]:
+        return list(self)
+
+    @property
+    def versions(self) -> List[str]:
+        return list(self._index.keys())
+
+    def is_yanked(self, version: str) -> bool:
+        release = self._index[version]
+        if isinstance(release, Release):
+            return release.yanked
+        return not release
+
+    def latest_timestamp(self, version: str) -> Optional[datetime]:
+        release = self._index[version]
+        if isinstance(release, Release):
+            return release.latest_timestamp
+        if not release:
+            return None
+        return max(parse_datetime(url["upload_time"]) for url in release)
+
+    def sorted_versions(self, include_yanked: bool = True) -> List[str]:
+        """List the version strings of the collection, newest first, without
+        parsing any releases.
+
+        :param bool include_yanked: Whether to include yanked releases, default True
+        :return: The version strings sorted by their parsed version
+        :rtype: List[str]
+        """
+        versions = self.versions
+        if not include_yanked:
+            versions = [v for v in versions if not self.is_yanked(v)]
+        return sorted(versions, key=parse, reverse=True)
 
     def get_latest_lockfile(self) -> Dict[str, Union[str, List[str]]]:
         return self.latest.to_lockfile()
@@ -726,7 +905,7 @@ class ReleaseCollection(BaseModel):
 
     @property
     def non_yanked_releases(self) -> List[Release]:
-        return list(r for r in self.releases if not r.yanked)
+        return [self[v] for v in self.versions if not self.is_yanked(v)]
 
     def sort_releases(self) -> List[Release]:
         return sorted(
@@ -737,16 +916,23 @@ class ReleaseCollection(BaseModel):
 
     @property
     def latest(self) -> Optional[Release]:
-        return next(iter(r for r in self.sort_releases() if not r.yanked))
+        versions = [v for v in self.versions if not self.is_yanked(v)]
+        if not versions:
+            raise StopIteration
+        return self[max(versions, key=self.latest_timestamp)]
 
     @classmethod
     def load(cls, releases, name: Optional[str] = None) -> "ReleaseCollection":
-        if not isinstance(releases, list):
-            releases = get_releases_from_package(releases, name=name)
-        return cls(releases=releases)
+        if isinstance(releases, list):
+            return cls(releases=releases)
+        collection = cls()
+        collection._name = name
+        collection._index.update(releases)
+        return collection
 
     class Config:
         frozen = True
+        underscore_attrs_are_private = True
 
 
 def convert_releases_to_collection(releases, name=None) -> ReleaseCollection:
@@ -908,19 +1094,54 @@ class Package(BaseModel):
         return set(self.info.dependencies)
 
     def get_dependencies(self) -> "Package":
-        urls = []
-        deps = set()
-        info = self.info
-        if info.dependencies is None:
+        results = None
+        if self.info.dependencies is None:
+            results = []
             for url in self.urls:
                 try:
-                    url, dep_dict = url.get_dependencies()
+                    results.append(url.get_dependencies())
                 except (RuntimeError, TypeError):
                     # This happens if we are parsing `setup.py` and we fail
                     if url.is_sdist:
                         continue
                     else:
                         raise
+        return self._update_dependencies(results)
+
+    async def aget_dependencies(self, semaphore=None) -> "Package":
+        """Asynchronous variant of :meth:`get_dependencies` which fetches the
+        metadata of every release url concurrently.
+
+        :param Optional[asyncio.Semaphore] semaphore: Bounds the number of
+            concurrent requests
+        :return: The current package with its dependencies populated
+        :rtype: :class:`Package`
+        """
+        results = None
+        if self.info.dependencies is None:
+            responses = await asyncio.gather(
+                *(
+                    run_blocking(url.get_dependencies, semaphore=semaphore)
+                    for url in self.urls
+                ),
+                return_exceptions=True,
+            )
+            results = []
+            for url, result in zip(self.urls, responses):
+                if isinstance(result, (RuntimeError, TypeError)) and url.is_sdist:
+                    continue
+                elif isinstance(result, BaseException):
+                    raise result
+                results.append(result)
+        return self._update_dependencies(results)
+
+    def _update_dependencies(self, results):
+        # type: (Optional[List[Tuple[ReleaseUrl, Dict]]]) -> "Package"
+        urls = []
+        deps = set()
+        info = self.info
+        if results is not None:
+            for url, dep_dict in results:
                 markers = url.markers
                 dep_list = dep_dict.get("requires_dist", [])
                 for dep in dep_list:
@@ -971,6 +1192,36 @@ class Package(BaseModel):
             deps.append(pinned)
         return deps, constraints
 
+    async def apin_dependencies(self, include_extras=None, semaphore=None):
+        # type: (Optional[List[str]], Optional[asyncio.Semaphore]) -> Tuple[List["Package"], Dict[str, List[SpecifierSet]]]
+        """Asynchronous variant of :meth:`pin_dependencies` which pins every
+        dependency concurrently."""
+        if include_extras:
+            include_extras = list(sorted(set(include_extras)))
+        else:
+            include_extras = []
+        if self.info.dependencies is None and list(self.urls):
+            await self.aget_dependencies(semaphore=semaphore)
+        constraints = defaultdict(list)
+        to_pin = []
+        for dep in self.dependencies:
+            if dep.from_extras and dep.from_extras not in include_extras:
+                continue
+            if dep.specifier:
+                constraints[dep.name].append(dep.specifier)
+            to_pin.append(dep)
+        results = await asyncio.gather(
+            *(dep.apin(semaphore=semaphore) for dep in to_pin), return_exceptions=True
+        )
+        deps = []
+        for result in results:
+            if isinstance(result, requests.exceptions.HTTPError):
+                continue
+            elif isinstance(result, BaseException):
+                raise result
+            deps.append(result)
+        return deps, constraints
+
     def get_latest_lockfile(self):
         # type: () -> Dict[str, Dict[str, Union[List[str], str]]]
         lockfile = {}
@@ -978,53 +1229,14 @@ class Package(BaseModel):
         deps, _ = self.pin_dependencies()
         for dep in deps:
             dep = dep.get_dependencies()
-            for sub_dep in dep.dependencies:
-                if sub_dep.name not in constraints:
-                    logger.info(
-                        "Adding {0} (from {1}) {2!s}".format(
-                            sub_dep.name, dep.name, sub_dep.specifier
-                        )
-                    )
-                    constraints[sub_dep.name] = sub_dep.specifier
-                else:
-                    existing = "{0} (from {1}): {2!s} + ".format(
-                        sub_dep.name, dep.name, constraints[sub_dep.name]
-                    )
-                    new_specifier = sub_dep.specifier
-                    merged = constraints[sub_dep.name] & new_specifier
-                    logger.info(
-                        "Updating: {0}{1!s} = {2!s}".format(
-                            existing, new_specifier, merged
-                        )
-                    )
-                    constraints[sub_dep.name] = merged
-
+            merge_dependency_constraints(constraints, dep)
             lockfile.update({dep.info.name: dep.releases.get_latest_lockfile()})
         for sub_dep_name, specset in constraints.items():
             try:
                 sub_dep_pkg = get_package(sub_dep_name)
             except requests.exceptions.HTTPError:
                 continue
-            logger.info("Getting package: {0} ({1!s})".format(sub_dep, specset))
-            sorted_releases = list(
-                sorted(
-                    sub_dep_pkg.releases,
-                    key=operator.attrgetter("parsed_version"),
-                    reverse=True,
-                )
-            )
-            try:
-                version = next(iter(specset.filter((r.version for r in sorted_releases))))
-            except StopIteration:
-                logger.info(
-                    "No version of {0} matches specifier: {1}".format(sub_dep, specset)
-                )
-                logger.info(
-                    "Available versions: {0}".format(
-                        " ".join([r.version for r in sorted_releases])
-                    )
-                )
-                raise
+            version = get_latest_matching_version(sub_dep_pkg, specset)
             sub_dep_instance = get_package_version(sub_dep_name, version=str(version))
             if sub_dep_instance is None:
                 continue
@@ -1037,6 +1249,54 @@ class Package(BaseModel):
         lockfile.update({self.info.name: self.releases.get_latest_lockfile()})
         return lockfile
 
+    async def aget_latest_lockfile(self, concurrency=None):
+        # type: (Optional[int]) -> Dict[str, Dict[str, Union[List[str], str]]]
+        """Asynchronous variant of :meth:`get_latest_lockfile`.
+
+        Package JSON and wheel metadata are fetched concurrently, with at most
+        **concurrency** requests in flight at once.  The resulting lockfile is
+        identical to the one produced by :meth:`get_latest_lockfile`.
+
+        :param Optional[int] concurrency: The maximum number of concurrent
+            requests, defaults to ``REQUIREMENTSLIB_ASYNC_CONCURRENCY``
+        :return: A mapping of package names to lockfile entries
+        :rtype: Dict[str, Dict[str, Union[List[str], str]]]
+        """
+        semaphore = asyncio.Semaphore(concurrency or REQUIREMENTSLIB_ASYNC_CONCURRENCY)
+        lockfile = {}
+        if self.info.dependencies is None and list(self.urls):
+            await self.aget_dependencies(semaphore=semaphore)
+        constraints = {dep.name: dep.specifier for dep in self.dependencies}
+        deps, _ = await self.apin_dependencies(semaphore=semaphore)
+        deps = await asyncio.gather(
+            *(dep.aget_dependencies(semaphore=semaphore) for dep in deps)
+        )
+        for dep in deps:
+            merge_dependency_constraints(constraints, dep)
+            lockfile.update({dep.info.name: dep.releases.get_latest_lockfile()})
+
+        async def pin_constraint(name, specset):
+            try:
+                sub_dep_pkg = await aget_package(name, semaphore=semaphore)
+            except requests.exceptions.HTTPError:
+                return None
+            version = get_latest_matching_version(sub_dep_pkg, specset)
+            return await aget_package_version(name, str(version), semaphore=semaphore)
+
+        sub_deps = await asyncio.gather(
+            *(pin_constraint(name, specset) for name, specset in constraints.items())
+        )
+        for sub_dep_instance in sub_deps:
+            if sub_dep_instance is None:
+                continue
+            lockfile.update(
+                {
+                    sub_dep_instance.info.name: sub_dep_instance.releases.get_latest_lockfile()
+                }
+            )
+        lockfile.update({self.info.name: self.releases.get_latest_lockfile()})
+        return lockfile
+
     def as_dict(self) -> Dict[str, Any]:
         return self.dict()
 
@@ -1044,24 +1304,85 @@ class Package(BaseModel):
         return json.dumps(self.dict(), default=pydantic_encoder, indent=4)
 
 
-def get_package(name):
-    # type: (str) -> Package
+def merge_dependency_constraints(constraints, package):
+    # type: (Dict[str, SpecifierSet], Package) -> Dict[str, SpecifierSet]
+    """Merge the specifiers of **package**'s dependencies into **constraints**."""
+    for sub_dep in package.dependencies:
+        if sub_dep.name not in constraints:
+            logger.info(
+                "Adding {0} (from {1}) {2!s}".format(
+                    sub_dep.name, package.name, sub_dep.specifier
+                )
+            )
+            constraints[sub_dep.name] = sub_dep.specifier
+        else:
+            existing = "{0} (from {1}): {2!s} + ".format(
+                sub_dep.name, package.name, constraints[sub_dep.name]
+            )
+            new_specifier = sub_dep.specifier
+            merged = constraints[sub_dep.name] & new_specifier
+            logger.info(
+                "Updating: {0}{1!s} = {2!s}".format(existing, new_specifier, merged)
+            )
+            constraints[sub_dep.name] = merged
+    return constraints
+
+
+def get_latest_matching_version(package, specset):
+    # type: (Package, SpecifierSet) -> str
+    """Find the newest release of **package** which satisfies **specset**.
+
+    :raises StopIteration: If no release matches
+    """
+    logger.info("Getting package: {0} ({1!s})".format(package.name, specset))
+    sorted_versions = package.releases.sorted_versions()
+    try:
+        return next(iter(specset.filter(sorted_versions)))
+    except StopIteration:
+        logger.info(
+            "No version of {0} matches specifier: {1}".format(package.name, specset)
+        )
+        logger.info("Available versions: {0}".format(" ".join(sorted_versions)))
+        raise
+
+
+async def run_blocking(func, *args, semaphore=None, **kwargs):
+    """Run a blocking call in the default executor, holding **semaphore** (if
+    provided) for its duration."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args, **kwargs)
+    if semaphore is None:
+        return await loop.run_in_executor(None, call)
+    async with semaphore:
+        return await loop.run_in_executor(None, call)
+
+
+def get_package(name, session=None):
+    # type: (str, Optional[requests.Session]) -> Package
     url = "https://pypi.org/pypi/{}/json".format(name)
-    with requests.get(url) as r:
-        r.raise_for_status()
-        result = r.json()
-        package = Package.from_json(result)
-    return package
+    result = HTTP_CACHE.get_json(url, session=session)
+    return Package.from_json(result)
 
 
-def get_package_version(name, version):
-    # type: (str, str) -> Package
+def get_package_version(name, version, session=None):
+    # type: (str, str, Optional[requests.Session]) -> Package
     url = "https://pypi.org/pypi/{0}/{1}/json".format(name, version)
-    with requests.get(url) as r:
-        r.raise_for_status()
-        result = r.json()
-        package = Package.from_json(result)
-    return package
+    result = HTTP_CACHE.get_json(url, session=session)
+    return Package.from_json(result)
+
+
+async def aget_package(name, session=None, semaphore=None):
+    # type: (str, Optional[requests.Session], Optional[asyncio.Semaphore]) -> Package
+    """Asynchronous variant of :func:`get_package`."""
+    return await run_blocking(get_package, name, session=session, semaphore=semaphore)
+
+
+async def aget_package_version(name, version, session=None, semaphore=None):
+    # type: (str, str, Optional[requests.Session], Optional[asyncio.Semaphore]) -> Package
+    """Asynchronous variant of :func:`get_package_version`."""
+    return await run_blocking(
+        get_package_version, name, version, session=session, semaphore=semaphore
+    )
 
 
 def get_package_from_requirement(req):
@@ -1073,11 +1394,9 @@ def get_package_from_requirement(req):
         pkg = get_package_version(req.name, version)
     else:
         pkg = get_package(req.name)
-        sorted_releases = list(
-            sorted(pkg.releases, key=operator.attrgetter("parsed_version"), reverse=True)
-        )
-        versions = set(req.specifier.filter((r.version for r in sorted_releases)))
-        version = next(iter(req.specifier.filter((r.version for r in sorted_releases))))
+        sorted_versions = pkg.releases.sorted_versions()
+        versions = set(req.specifier.filter(sorted_versions))
+        version = next(iter(req.specifier.filter(sorted_versions)))
         if pkg.version not in versions:
             pkg = get_package_version(pkg.name, version)
     return pkg, versions
@@ -5,7 +5,7 @@ from typing import Any, Dict, Iterable, List, Optional, Text, Union
 
 import tomlkit as tomlkit
 from plette import pipfiles
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, PrivateAttr, validator
 
 from ..environment import MYPY_RUNNING
 from ..exceptions import RequirementError
@@ -133,6 +133,8 @@ class Pipfile(ReqLibBaseModel):
     build_system: Optional[Dict] = dict()
     _requirements: Optional[List] = list()
     _dev_requirements: Optional[List] = list()
+    _parallel: bool = PrivateAttr(default=False)
+    _max_workers: Optional[int] = PrivateAttr(default=None)
 
     class Config:
         validate_assignment = True
@@ -268,12 +270,15 @@ class Pipfile(ReqLibBaseModel):
         return cls.read_projectfile(pipfile_path.as_posix())
 
     @classmethod
-    def load(cls, path, create=False):
-        # type: (Text, bool) -> Pipfile
+    def load(cls, path, create=False, parallel=False, max_workers=None):
+        # type: (Text, bool, bool, Optional[int]) -> Pipfile
         """Given a path, load or create the necessary pipfile.
 
         :param Text path: Path to the project root or pipfile
         :param bool create: Whether to create the pipfile if not found, defaults to True
+        :param bool parallel: Whether to resolve setup info of file and VCS requirements
+            in a process pool, defaults to False
+        :param Optional[int] max_workers: The maximum number of worker processes
         :raises OSError: Thrown if the project root directory doesn't exist
         :raises FileNotFoundError: Thrown if the pipfile doesn't exist and ``create=False``
         :return: A pipfile instance pointing at the supplied project
@@ -287,7 +292,10 @@ class Pipfile(ReqLibBaseModel):
             "pipfile": pipfile,
             "path": Path(projectfile.location),
         }
-        return cls(**creation_args)
+        loaded = cls(**creation_args)
+        loaded._parallel = parallel
+        loaded._max_workers = max_workers
+        return loaded
 
     @property
     def dev_packages(self):
@@ -304,11 +312,9 @@ class Pipfile(ReqLibBaseModel):
         # type: () -> List[Requirement]
         if not self._dev_requirements:
             packages = tomlkit_value_to_python(self.pipfile.get("dev-packages", {}))
-            self._dev_requirements = [
-                Requirement.from_pipfile(k, v)
-                for k, v in packages.items()
-                if v is not None
-            ]
+            self._dev_requirements = Requirement.from_pipfile_entries(
+                packages.items(), parallel=self._parallel, max_workers=self._max_workers
+            )
         return self._dev_requirements
 
     @property
@@ -316,9 +322,7 @@ class Pipfile(ReqLibBaseModel):
         # type: () -> List[Requirement]
         if not self._requirements:
             packages = tomlkit_value_to_python(self.pipfile.get("packages", {}))
-            self._requirements = [
-                Requirement.from_pipfile(k, v)
-                for k, v in packages.items()
-                if v is not None
-            ]
+            self._requirements = Requirement.from_pipfile_entries(
+                packages.items(), parallel=self._parallel, max_workers=self._max_workers
+            )
         return self._requirements
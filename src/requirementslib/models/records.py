@@ -0,0 +1,190 @@
+"""Compact, immutable records of lockfile and Pipfile entries."""
+from collections import namedtuple
+from typing import Any, Dict, Optional, Tuple, Union
+
+from pip._vendor.packaging.markers import InvalidMarker
+from pip._vendor.packaging.specifiers import InvalidSpecifier
+
+from ..utils import VCS_LIST
+from .markers import PipenvMarkers, get_marker, get_specifierset
+from .utils import extras_to_string, normalize_name, specs_to_string
+
+# Keys of a pipfile entry which are not part of the requirement's source
+RECORD_ENTRY_KEYS = ("version", "extras", "markers", "hashes")
+MARKER_ENTRY_KEYS = tuple(PipenvMarkers.__fields__)
+LOCATION_KEYS = ("path", "file", "uri") + VCS_LIST
+
+
+class RequirementRecord(
+    namedtuple(
+        "RequirementRecord",
+        ["name", "specifier", "extras", "markers", "hashes", "source"],
+    )
+):
+    """A lightweight, immutable view of a single requirement entry.
+
+    Records hold the raw strings of a lockfile entry and nothing else, so creating
+    one is a handful of dictionary lookups.  Convert a record to a full
+    :class:`~requirementslib.models.requirements.Requirement` with
+    :meth:`as_requirement` when parsing, setup info or ireqs are needed.
+
+    :param str name: The name of the requirement
+    :param str specifier: The version specifier, empty when unpinned
+    :param Tuple[str, ...] extras: The sorted extras of the requirement
+    :param Optional[str] markers: The environment markers of the requirement
+    :param Tuple[str, ...] hashes: The sorted hashes of the requirement
+    :param Tuple[Tuple[str, Any], ...] source: The sorted remaining keys of the
+        entry, such as ``index``, ``editable`` or a VCS url and ``ref``
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_pipfile(cls, name, entry):
+        # type: (str, Union[str, Dict[str, Any]]) -> RequirementRecord
+        """Create a record from a Pipfile or lockfile entry.
+
+        :param str name: The name of the requirement
+        :param entry: The entry, either a version string or a mapping
+        :return: A new record
+        """
+        if not isinstance(entry, dict):
+            entry = {"version": entry}
+        specifier = entry.get("version") or ""
+        if specifier == "*":
+            specifier = ""
+        markers = [
+            "{0} {1}".format(key, entry[key]) for key in MARKER_ENTRY_KEYS if key in entry
+        ]
+        if entry.get("markers"):
+            markers.append(entry["markers"])
+        source = tuple(
+            sorted(
+                (key, value)
+                for key, value in entry.items()
+                if key not in RECORD_ENTRY_KEYS and key not in MARKER_ENTRY_KEYS
+            )
+        )
+        return cls(
+            name,
+            specifier,
+            tuple(sorted(entry.get("extras", ()))),
+            " and ".join(sorted(markers)) if markers else None,
+            tuple(sorted(entry.get("hashes", ()))),
+            source,
+        )
+
+    @classmethod
+    def from_requirement(cls, requirement):
+        # type: (Any) -> RequirementRecord
+        """Create a record from a full
+        :class:`~requirementslib.models.requirements.Requirement`."""
+        name, entry = requirement.pipfile_entry
+        return cls.from_pipfile(name, entry)
+
+    @property
+    def source_dict(self):
+        # type: () -> Dict[str, Any]
+        return dict(self.source)
+
+    @property
+    def index(self):
+        # type: () -> Optional[str]
+        return self.source_dict.get("index")
+
+    @property
+    def editable(self):
+        # type: () -> bool
+        return bool(self.source_dict.get("editable", False))
+
+    @property
+    def is_vcs(self):
+        # type: () -> bool
+        return any(key in VCS_LIST for key, _ in self.source)
+
+    @property
+    def is_named(self):
+        # type: () -> bool
+        return not any(key in LOCATION_KEYS for key, _ in self.source)
+
+    @property
+    def normalized_specifier(self):
+        # type: () -> str
+        """The specifier formatted the way a full requirement formats it."""
+        if not self.specifier:
+            return ""
+        try:
+            return specs_to_string(get_specifierset(self.specifier))
+        except InvalidSpecifier:
+            return self.specifier.replace(" ", "")
+
+    @property
+    def normalized_markers(self):
+        # type: () -> Optional[str]
+        """The markers formatted the way a full requirement formats them."""
+        if not self.markers:
+            return None
+        try:
+            markers = str(get_marker(self.markers))
+        except InvalidMarker:
+            markers = self.markers
+        return markers.replace('"', "'")
+
+    def as_pipfile(self):
+        # type: () -> Dict[str, Union[str, Dict[str, Any]]]
+        """Convert the record back into a Pipfile entry.
+
+        :return: A mapping of the name to the entry
+        """
+        entry = dict(self.source)
+        if self.specifier:
+            entry["version"] = self.specifier
+        if self.extras:
+            entry["extras"] = list(self.extras)
+        if self.markers:
+            entry["markers"] = self.markers
+        if self.hashes:
+            entry["hashes"] = list(self.hashes)
+        if not entry:
+            entry = "*"
+        elif list(entry) == ["version"]:
+            entry = entry["version"]
+        return {self.name: entry}
+
+    def as_requirement(self):
+        """Build the full requirement for this record.
+
+        :return: The parsed requirement
+        :rtype: :class:`~requirementslib.models.requirements.Requirement`
+        """
+        from .requirements import Requirement
+
+        return Requirement.from_pipfile(self.name, self.as_pipfile()[self.name])
+
+    def as_line(self, include_hashes=True, include_markers=True):
+        # type: (bool, bool) -> str
+        """Format the record as a line in requirements.txt.
+
+        Only named requirements are formatted directly, any other requirement is
+        converted to a full requirement first.
+
+        :param bool include_hashes: Whether to include the ``--hash`` options
+        :param bool include_markers: Whether to include the environment markers
+        :return: The requirement line
+        """
+        if not self.is_named or self.editable:
+            return self.as_requirement().as_line(
+                include_hashes=include_hashes,
+                include_markers=include_markers and not self.editable,
+            )
+        line = "{0}{1}{2}".format(
+            normalize_name(self.name),
+            extras_to_string([extra.lower() for extra in self.extras]),
+            self.normalized_specifier,
+        )
+        if include_markers and self.markers:
+            line = "{0} ; {1}".format(line, self.normalized_markers)
+        if include_hashes and self.hashes:
+            hashes = " ".join("--hash={0}".format(h) for h in self.hashes)
+            line = "{0} {1}".format(line, hashes)
+        return line
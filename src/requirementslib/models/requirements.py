@@ -1,7 +1,10 @@
 import collections
 import copy
+import functools
 import os
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
 from sysconfig import get_path
@@ -55,6 +58,7 @@ from ..fileutils import (
     is_file_url,
     is_valid_url,
     normalize_path,
+    release_tracked_tempdirs,
     temp_path,
 )
 from ..funktools import dedup
@@ -68,7 +72,7 @@ from ..utils import (
     strip_ssh_from_git_uri,
 )
 from .common import ReqLibBaseModel
-from .markers import normalize_marker_str
+from .markers import get_marker, get_specifierset, merge_markers
 from .setup_info import (
     SetupInfo,
     _prepare_wheel_building_kwargs,
@@ -89,6 +93,7 @@ from .utils import (
     get_pyproject,
     get_version,
     init_requirement,
+    is_named_requirement_line,
     make_install_requirement,
     normalize_name,
     parse_extras_str,
@@ -138,6 +143,7 @@ class Line(ReqLibBaseModel):
     _ref: Optional[str] = None
     _ireq: Optional[Any] = None
     _src_root: Optional[str] = None
+    _is_named_line: bool = False
     dist: Optional[Any] = None
 
     class Config:
@@ -411,7 +417,7 @@ class Line(ReqLibBaseModel):
         if not spec.startswith("=="):
             spec = "=={0}".format(spec)
         self._specifier = spec
-        self.set_specifiers(SpecifierSet(spec))
+        self.set_specifiers(get_specifierset(spec))
 
     @property
     def specifiers(self) -> Optional[SpecifierSet]:
@@ -445,7 +451,7 @@ class Line(ReqLibBaseModel):
     def set_specifiers(self, specifiers):
         if not isinstance(specifiers, SpecifierSet):
             if isinstance(specifiers, str):
-                specifiers = SpecifierSet(specifiers)
+                specifiers = get_specifierset(specifiers)
             else:
                 raise TypeError("Must pass a string or a SpecifierSet")
         specs = self.get_requirement_specs(specifiers)
@@ -549,8 +555,7 @@ class Line(ReqLibBaseModel):
         :rtype: `:class:~Line`
         """
         line, hashes = self.split_hashes(self.line)
-        self.hashes = hashes
-        self.line = line
+        self._set_trusted(hashes=hashes, line=line)
         return self
 
     def parse_extras(self):
@@ -640,7 +645,7 @@ class Line(ReqLibBaseModel):
     @property
     def link(self):
         # type: () -> Link
-        if self._link is None:
+        if self._link is None and not self._is_named_line:
             self.parse_link()
         return self._link
 
@@ -754,6 +759,8 @@ class Line(ReqLibBaseModel):
     @property
     def is_named(self):
         # type: () -> bool
+        if self._is_named_line:
+            return True
         return not (
             self.is_file_url
             or self.is_url
@@ -941,8 +948,6 @@ class Line(ReqLibBaseModel):
         return None
 
     def _parse_name_from_line(self) -> Optional[str]:
-        if not self.is_named:
-            pass
         try:
             self._requirement = init_requirement(self.line)
         except Exception:
@@ -1257,14 +1262,33 @@ class Line(ReqLibBaseModel):
             return True
         return False
 
+    def parse_named_line(self):
+        # type: () -> None
+        """Parse a plain **PEP-508** named requirement without inspecting the
+        filesystem or parsing the line as a URI."""
+        line, extras = _strip_extras(self.line)
+        self._set_trusted(
+            line=line,
+            extras=tuple(sorted(set(parse_extras_str(extras)))) if extras else (),
+            _is_named_line=True,
+        )
+        self._set_trusted(_name=self._parse_name_from_line())
+        if self._specifier:
+            self.set_specifiers(self._specifier)
+
     def parse(self):
         # type: () -> None
-        self.line = self.line.strip()
-        if self.line.startswith('"'):
-            self.line = self.line.strip('"')
-        self.line, self.markers = split_markers_from_line(self.parse_hashes().line)
-        if self.markers:
-            self.markers = self.markers.replace('"', "'")
+        line = self.line.strip()
+        if line.startswith('"'):
+            line = line.strip('"')
+        self._set_trusted(line=line)
+        line, markers = split_markers_from_line(self.parse_hashes().line)
+        if markers:
+            markers = markers.replace('"', "'")
+        self._set_trusted(line=line, markers=markers)
+        if not self.editable and is_named_requirement_line(self.line):
+            self.parse_named_line()
+            return
         self.parse_extras()
         if self.line.startswith("git+file:/") and not self.line.startswith(
             "git+file:///"
@@ -2488,6 +2512,16 @@ class Requirement(ReqLibBaseModel):
         if isinstance(line, InstallRequirement):
             line = format_requirement(line)
         parsed_line = Line(line=line)
+        if parsed_line._is_named_line:
+            r = NamedRequirement(
+                name=parsed_line.name,
+                version=parsed_line._specifier,
+                req=parsed_line.requirement,
+                extras=parsed_line.extras,
+                editable=parsed_line.editable,
+                parsed_line=parsed_line,
+            )
+            return cls._from_parsed_line(parsed_line, r)
         if parse_setup_info and not parsed_line.is_named and not parsed_line.is_wheel:
             parsed_line.set_setup_info(parsed_line.get_setup_info())
         if (
@@ -2503,13 +2537,13 @@ class Requirement(ReqLibBaseModel):
             )
         else:
             r = named_req_from_parsed_line(parsed_line)
-        req_markers = None
-        if parsed_line.markers:
-            req_markers = PackagingRequirement(
-                "fakepkg ; {0}".format(parsed_line.markers)
-            )
+        return cls._from_parsed_line(parsed_line, r)
+
+    @classmethod
+    def _from_parsed_line(cls, parsed_line, r) -> "Requirement":
+        req_marker = get_marker(parsed_line.markers) if parsed_line.markers else None
         if r is not None and r.req is not None:
-            r.req.marker = getattr(req_markers, "marker", None) if req_markers else None
+            r.req.marker = req_marker
         args = {
             "name": r.name,
             "vcs": parsed_line.vcs,
@@ -2533,6 +2567,104 @@ class Requirement(ReqLibBaseModel):
         cls_inst = cls(**args)  # type: ignore
         return cls_inst
 
+    @classmethod
+    def from_lines(
+        cls, lines, parse_setup_info=False, workers=None
+    ) -> List["Requirement"]:
+        """Parse many requirement lines at once.
+
+        Blank lines and comments are skipped.  Identical lines are parsed only
+        once but each gets its own :class:`Requirement` instance, and equal
+        markers and specifier sets are interned through the shared marker caches.
+
+        :param Iterable[str] lines: The requirement lines to parse
+        :param bool parse_setup_info: Whether to resolve setup info for file and
+            VCS requirements, defaults to False
+        :param Optional[int] workers: If greater than 1, parse the unique lines in a
+            process pool with this many workers
+        :return: The parsed requirements, in the same order as the input lines
+        :rtype: List[Requirement]
+        """
+        line_list = []
+        for line in lines:
+            if isinstance(line, str):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+            line_list.append(line)
+        unique_lines = list(dict.fromkeys(line_list))
+        parse_line = functools.partial(
+            _requirement_from_line, parse_setup_info=parse_setup_info
+        )
+        if workers is not None and workers > 1 and len(unique_lines) > 1:
+            chunksize = max(1, len(unique_lines) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(parse_line, unique_lines, chunksize=chunksize))
+        else:
+            parsed = [parse_line(line) for line in unique_lines]
+        for requirement in parsed:
+            req = getattr(requirement.req, "req", None)
+            if req is None:
+                continue
+            if req.marker is not None:
+                req.marker = get_marker(req.marker)
+            if req.specifier is not None:
+                req.specifier = get_specifierset(req.specifier)
+        by_line = dict(zip(unique_lines, parsed))
+        requirements = []
+        seen = set()
+        for line in line_list:
+            requirement = by_line[line]
+            if line in seen:
+                requirement = _copy_requirement(requirement)
+            seen.add(line)
+            requirements.append(requirement)
+        return requirements
+
+    @classmethod
+    def from_pipfile_entries(
+        cls, entries, parallel=False, max_workers=None
+    ) -> List["Requirement"]:
+        """Create requirements from an iterable of ``(name, entry)`` pipfile
+        pairs.
+
+        When ``parallel`` is set, the setup info of file, path and VCS entries is
+        resolved up front in a process pool, with each worker building inside its
+        own temporary directory.  Named entries are always parsed in-process, and
+        the results are returned in input order either way.
+
+        :param Iterable[Tuple[str, Any]] entries: The names and pipfile entries
+        :param bool parallel: Whether to resolve setup info concurrently
+        :param Optional[int] max_workers: The maximum number of worker processes
+        :return: The parsed requirements, in the same order as the input entries
+        :rtype: List[Requirement]
+        """
+        entries = [(name, entry) for name, entry in entries if entry is not None]
+        if not parallel:
+            return [cls.from_pipfile(name, entry) for name, entry in entries]
+        results = [None] * len(entries)  # type: List[Optional[Requirement]]
+        pending = []  # type: List[int]
+        for index, (name, entry) in enumerate(entries):
+            if hasattr(entry, "keys") and any(
+                key in entry for key in ("path", "file", "uri") + VCS_LIST
+            ):
+                pending.append(index)
+            else:
+                results[index] = cls.from_pipfile(name, entry)
+        if pending:
+            worker_root = create_tracked_tempdir(prefix="reqlib-workers")
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_setup_info_worker,
+                initargs=(worker_root,),
+            ) as executor:
+                resolved = executor.map(
+                    _resolve_pipfile_entry, [entries[index] for index in pending]
+                )
+                for index, requirement in zip(pending, resolved):
+                    results[index] = requirement
+        return results
+
     @classmethod
     def from_ireq(cls, ireq):
         return cls.from_line(format_requirement(ireq))
@@ -2560,15 +2692,13 @@ class Requirement(ReqLibBaseModel):
         else:
             r = NamedRequirement.from_pipfile(name, pipfile)
         markers = PipenvMarkers.from_pipfile(name, _pipfile)
-        req_markers = None
         if markers:
             markers = str(markers)
-            req_markers = PackagingRequirement("fakepkg ; {0}".format(markers))
             if r.req is not None:
-                r.req.marker = req_markers.marker
+                r.req.marker = get_marker(markers)
         extras = _pipfile.get("extras")
         if r.req:
-            r.req.specifier = SpecifierSet(_pipfile["version"])
+            r.req.specifier = get_specifierset(_pipfile["version"])
             r.req.extras = (
                 tuple(sorted(dedup([extra.lower() for extra in extras])))
                 if extras
@@ -2629,8 +2759,7 @@ class Requirement(ReqLibBaseModel):
     def get_markers(self):
         markers = self.markers
         if markers:
-            fake_pkg = PackagingRequirement("fakepkg ; {0}".format(markers))
-            markers = fake_pkg.marker
+            markers = get_marker(markers)
         return markers
 
     @cached_property
@@ -2802,22 +2931,46 @@ class Requirement(ReqLibBaseModel):
     def merge_markers(self, markers: Union[str, Marker]) -> "Requirement":
         if not markers:
             return self
-        if not isinstance(markers, Marker):
-            markers = Marker(markers)
-        _markers = []  # type: List[Marker]
         ireq = self.ireq
-        if ireq and ireq.markers:
-            ireq_marker = ireq.markers
-            _markers.append(str(ireq_marker))
-        _markers.append(str(markers))
-        marker_str = " and ".join([normalize_marker_str(m) for m in _markers if m])
-        self.markers = marker_str
-        new_marker = Marker(marker_str)
+        existing = self.markers or (ireq.markers if ireq else None)
+        new_marker = merge_markers(get_marker(existing), get_marker(markers))
+        self.markers = str(new_marker).replace('"', "'") if new_marker else None
         new_ireq = getattr(self, "ireq", None)
         if new_ireq and new_ireq.req:
             new_ireq.req.marker = new_marker
         if self.req.req:
-            self.req.req = new_marker
+            self.req.req.marker = new_marker
+        return self
+
+
+def _requirement_from_line(line, parse_setup_info=False) -> Requirement:
+    return Requirement.from_line(line, parse_setup_info=parse_setup_info)
+
+
+def _copy_requirement(requirement) -> Requirement:
+    # Keep the interned marker and specifier shared between the copies
+    memo = {}
+    req = getattr(requirement.req, "req", None)
+    if req is not None:
+        for value in (req.marker, req.specifier):
+            if value is not None:
+                memo[id(value)] = value
+    return copy.deepcopy(requirement, memo)
+
+
+def _init_setup_info_worker(worker_root) -> None:
+    tempfile.tempdir = tempfile.mkdtemp(prefix="worker-", dir=worker_root)
+
+
+def _resolve_pipfile_entry(name_and_entry) -> Requirement:
+    name, entry = name_and_entry
+    requirement = Requirement.from_pipfile(name, entry)
+    if requirement.req is not None and not requirement.is_named:
+        requirement.req.parse_setup_info()
+    # The returned setup info points into this worker's build directories, so
+    # leave them for the parent to remove along with ``worker_root`` on exit.
+    release_tracked_tempdirs()
+    return requirement
 
 
 def file_req_from_parsed_line(parsed_line) -> FileRequirement:
@@ -9,17 +9,19 @@ import shutil
 import stat
 import subprocess as sp
 import sys
+import sysconfig
 import time
 import warnings
 from collections.abc import Iterable, Mapping
 from contextlib import ExitStack
-from functools import lru_cache
+from functools import lru_cache, partial
 from itertools import count
 from os import scandir
 from pathlib import Path
 from typing import Any, AnyStr, Callable, Dict, Generator, List, Optional, Tuple, Union
 from urllib.parse import parse_qs, urlparse, urlunparse
 
+from distlib.metadata import Metadata as DistlibMetadata
 from distlib.wheel import Wheel
 from pep517 import envbuild, wrappers
 from pip._internal.network.download import Downloader
@@ -39,10 +41,12 @@ from pip._vendor.pkg_resources import (
 )
 from pip._vendor.platformdirs import user_cache_dir
 from pip._vendor.pyparsing.core import cached_property
-from pydantic import Field
+from pydantic import Field, ValidationError, validate_model
 
+from ..environment import REQUIREMENTSLIB_STATIC_METADATA
 from ..fileutils import cd, create_tracked_tempdir, temp_path, url_to_path
 from ..utils import get_pip_command
+from .cache import BUILD_ENV_CACHE, SETUP_INFO_CACHE
 from .common import ReqLibBaseModel
 from .old_pip_utils import _copy_source_tree
 from .utils import (
@@ -51,6 +55,7 @@ from .utils import (
     get_default_pyproject_backend,
     get_name_variants,
     get_pyproject,
+    get_pyproject_metadata,
     init_requirement,
     split_vcs_method_from_uri,
     strip_extras_markers_from_requirement,
@@ -74,7 +79,22 @@ def pep517_subprocess_runner(cmd, cwd=None, extra_environ=None) -> None:
 
 
 class BuildEnv(envbuild.BuildEnvironment):
-    def pip_install(self, reqs):
+    """An isolated build environment which reuses the environments prepared for
+    previous builds with the same requirements.
+
+    :param bool cleanup: Whether to remove the temporary environment on exit
+    :param Optional[BuildEnvCache] cache: The cache of prepared environments,
+        defaults to :data:`~requirementslib.models.cache.BUILD_ENV_CACHE`
+    """
+
+    def __init__(self, cleanup=True, cache=None):
+        super().__init__(cleanup=cleanup)
+        self.cache = BUILD_ENV_CACHE if cache is None else cache
+        self._staging_dirs = []  # type: List[str]
+        self._leases = []  # type: List[str]
+
+    def _pip_install(self, prefix, reqs):
+        # type: (str, List[str]) -> bool
         cmd = [
             sys.executable,
             "-m",
@@ -82,10 +102,56 @@ class BuildEnv(envbuild.BuildEnvironment):
             "install",
             "--ignore-installed",
             "--prefix",
-            self.path,
+            prefix,
         ] + list(reqs)
 
-        sp.run(cmd, stderr=sp.PIPE, stdout=sp.PIPE)
+        return sp.run(cmd, stderr=sp.PIPE, stdout=sp.PIPE).returncode == 0
+
+    def activate(self, prefix):
+        # type: (str) -> None
+        """Put the scripts and libraries installed under **prefix** ahead of
+        those already in the environment."""
+        install_scheme = "nt" if (os.name == "nt") else "posix_prefix"
+        install_dirs = sysconfig.get_paths(
+            install_scheme, vars={"base": prefix, "platbase": prefix}
+        )
+        lib_dirs = [install_dirs["purelib"]]
+        if install_dirs["platlib"] != install_dirs["purelib"]:
+            lib_dirs.append(install_dirs["platlib"])
+        for name, paths in (
+            ("PATH", [install_dirs["scripts"]]),
+            ("PYTHONPATH", lib_dirs),
+        ):
+            current = os.environ.get(name)
+            if current:
+                paths = paths + [current]
+            os.environ[name] = os.pathsep.join(paths)
+
+    def pip_install(self, reqs):
+        reqs = list(reqs or ())
+        if not reqs:
+            return
+        if not self.cache.enabled:
+            self._pip_install(self.path, reqs)
+            return
+        # Lease the environment first so no other build evicts it while in use
+        self._leases.append(self.cache.lease(reqs))
+        prefix = self.cache.get(reqs)
+        if prefix is None:
+            prefix = self.cache.stage()
+            if self._pip_install(prefix, reqs):
+                prefix = self.cache.add(reqs, prefix)
+            else:
+                # Use what was installed for this build only
+                self._staging_dirs.append(prefix)
+        self.activate(prefix)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        super().__exit__(exc_type, exc_val, exc_tb)
+        while self._staging_dirs:
+            self.cache.discard(self._staging_dirs.pop())
+        while self._leases:
+            self.cache.release(self._leases.pop())
 
 
 class HookCaller(wrappers.Pep517HookCaller):
@@ -439,6 +505,37 @@ class Unparsable(ValueError):
     """Not able to parse from setup.py."""
 
 
+# The metadata which must be known without building the package
+STATIC_METADATA_KEYS = ("name", "version", "install_requires", "extras_require")
+# setup.cfg values which setuptools resolves by importing code or reading files
+SETUP_CFG_DIRECTIVES = ("attr:", "file:")
+# setup() keywords which SetupReader.read_setup_py reads, None for ``**kwargs``
+SETUP_PY_STATIC_KEYWORDS = (
+    "name",
+    "version",
+    "install_requires",
+    "extras_require",
+    "python_requires",
+    None,
+)
+# list and dict methods which change the object in place
+MUTATING_METHODS = frozenset(
+    (
+        "append",
+        "clear",
+        "extend",
+        "insert",
+        "pop",
+        "popitem",
+        "remove",
+        "reverse",
+        "setdefault",
+        "sort",
+        "update",
+    )
+)
+
+
 class SetupReader:
     """Class that reads a setup.py file without executing it."""
 
@@ -472,6 +569,62 @@ class SetupReader:
             ),
         }
 
+    @classmethod
+    def has_changed_variables(cls, file: Path) -> bool:
+        """Check whether the ``setup()`` call of **file** reads one of the keywords
+        returned by :meth:`read_setup_py` from a variable which is changed after
+        its first assignment, e.g. with ``.append()`` or ``+=``.
+
+        :meth:`read_setup_py` only follows the first assignment of a variable, so
+        its result can not be trusted for such files.
+        """
+        with file.open(encoding="utf-8-sig") as f:
+            module = ast.parse(f.read())
+
+        setup_call, body = cls._find_setup_call(module.body)
+        if not setup_call:
+            return False
+
+        names = set()
+        pending = [
+            keyword.value
+            for keyword in setup_call.keywords
+            if keyword.arg in SETUP_PY_STATIC_KEYWORDS
+        ]
+        while pending:
+            for node in ast.walk(pending.pop()):
+                if isinstance(node, ast.Name) and node.id not in names:
+                    names.add(node.id)
+                    variable = cls._find_variable_in_body(body, node.id)
+                    if variable is not None:
+                        pending.append(variable)
+        if not names:
+            return False
+
+        assignments = dict.fromkeys(names, 0)
+        for node in ast.walk(module):
+            if isinstance(node, ast.Name) and node.id in names:
+                if isinstance(node.ctx, ast.Del):
+                    return True
+                if isinstance(node.ctx, ast.Store):
+                    assignments[node.id] += 1
+            elif (
+                isinstance(node, (ast.Subscript, ast.Attribute))
+                and isinstance(node.ctx, (ast.Store, ast.Del))
+                and isinstance(node.value, ast.Name)
+                and node.value.id in names
+            ):
+                return True
+            elif (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr in MUTATING_METHODS
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id in names
+            ):
+                return True
+        return any(count > 1 for count in assignments.values())
+
     @staticmethod
     def read_setup_cfg(file: Path) -> "Dict[str, Any]":
         parser = configparser.ConfigParser()
@@ -817,6 +970,12 @@ def build_pep517(source_dir, build_dir, config_settings=None, dist_type="wheel")
     if dist_type == "sdist":
         get_requires_fn = hookcaller.get_requires_for_build_sdist
         build_fn = hookcaller.build_sdist
+    elif dist_type == "metadata":
+        # Raises HookMissing rather than building a wheel if the backend has no hook
+        get_requires_fn = hookcaller.get_requires_for_build_wheel
+        build_fn = partial(
+            hookcaller.prepare_metadata_for_build_wheel, _allow_fallback=False
+        )
     else:
         get_requires_fn = hookcaller.get_requires_for_build_wheel
         build_fn = hookcaller.build_wheel
@@ -1045,7 +1204,17 @@ def get_metadata_from_wheel(wheel_path) -> Dict[Any, Any]:
         dist = Wheel(wheel_path)
     except Exception:
         pass
-    metadata = dist.metadata
+    return get_metadata_from_distlib(dist.metadata)
+
+
+def get_metadata_from_distinfo(dist_info_path) -> Dict[Any, Any]:
+    """Given the path to a ``.dist-info`` directory, such as the one generated by
+    ``prepare_metadata_for_build_wheel``, return the metadata it describes."""
+    metadata = DistlibMetadata(path=os.path.join(dist_info_path, "METADATA"))
+    return get_metadata_from_distlib(metadata)
+
+
+def get_metadata_from_distlib(metadata) -> Dict[Any, Any]:
     name = metadata.name
     version = metadata.version
     requires = []
@@ -1235,6 +1404,7 @@ class SetupInfo(ReqLibBaseModel):
     metadata: Optional[Tuple[str]] = None
     _is_built: bool = False
     _ran_setup: bool = False
+    _static_metadata: bool = False
 
     class Config:
         validate_assignment = True
@@ -1400,6 +1570,58 @@ class SetupInfo(ReqLibBaseModel):
             return parsed
         return {}
 
+    def get_static_metadata(self) -> Optional[Dict[str, Any]]:
+        """Collect the metadata declared statically in the ``[project]`` table,
+        **setup.cfg** and the ``setup()`` call of **setup.py**, without running
+        any code.
+
+        A ``[project]`` table is used as is, whatever the build backend, unless it
+        lists any of the name, version or requirements as ``dynamic``: those are
+        left to the backend, e.g. ``[tool.setuptools.dynamic]``. Without a
+        ``[project]`` table only setuptools projects are read further, as other
+        backends have no static configuration we understand.
+
+        :return: The merged metadata, or None if the name, version or requirements
+            can only be known by invoking the build backend
+        """
+        project = None
+        if self.pyproject is not None and self.pyproject.exists():
+            project = get_pyproject_metadata(self.pyproject.parent)
+        if project is not None:
+            metadata, dynamic = project
+            if dynamic.intersection(STATIC_METADATA_KEYS) or not all(
+                metadata.get(key) for key in ("name", "version")
+            ):
+                return None
+            return metadata
+        if not self.build_backend.startswith("setuptools"):
+            return None
+        metadata = {}  # type: Dict[str, Any]
+        if self.setup_cfg is not None and self.setup_cfg.exists():
+            parsed = SetupReader.read_setup_cfg(self.setup_cfg)
+            values = [parsed["name"], parsed["version"]] + parsed["install_requires"]
+            for requirements in parsed["extras_require"].values():
+                values.extend(requirements)
+            if any(
+                isinstance(value, str) and value.startswith(SETUP_CFG_DIRECTIVES)
+                for value in values
+            ):
+                return None
+            metadata.update({k: v for k, v in parsed.items() if v})
+        if self.setup_py is not None and self.setup_py.exists():
+            try:
+                if SetupReader.has_changed_variables(self.setup_py):
+                    return None
+                parsed = SetupReader.read_setup_py(self.setup_py)
+            except (Unparsable, SyntaxError, ValueError, AttributeError, TypeError):
+                return None
+            if not parsed:
+                return None
+            metadata.update({k: v for k, v in parsed.items() if v})
+        if not metadata.get("name") or not metadata.get("version"):
+            return None
+        return metadata
+
     def run_setup(self) -> None:
         if not self._ran_setup and self.setup_py is not None and self.setup_py.exists():
             dist = run_setup(self.setup_py.as_posix(), egg_base=self.egg_base)
@@ -1419,7 +1641,15 @@ class SetupInfo(ReqLibBaseModel):
         config.setdefault("--global-option", [])
         return config
 
-    def build_wheel(self) -> str:
+    @contextlib.contextmanager
+    def _build_directory(self, use_subdirectory=True):
+        # type: (bool) -> Generator[str, None, None]
+        """Yield the directory to build the package from, writing a temporary
+        ``pyproject.toml`` naming the build backend if the package has none.
+
+        :param bool use_subdirectory: Whether to build from the ``subdirectory``
+            given in the link fragment, if any
+        """
         need_delete = False
         if not self.pyproject.exists():
             if not self.build_requires:
@@ -1441,70 +1671,77 @@ build-backend = "{1}"
             )
             need_delete = True
         directory = self.base_dir
-        if self.ireq and self.ireq.link:
+        if use_subdirectory and self.ireq and self.ireq.link:
             parsed = urlparse(str(self.ireq.link))
             subdir = parse_qs(parsed.fragment).get("subdirectory", [])
             if subdir:
                 directory = f"{self.base_dir}/{subdir[0]}"
-        result = build_pep517(
-            directory,
-            self.extra_kwargs["build_dir"],
-            config_settings=self.pep517_config,
-            dist_type="wheel",
-        )
-        if need_delete:
-            self.pyproject.unlink()
-        return result
+        try:
+            yield directory
+        finally:
+            if need_delete:
+                self.pyproject.unlink()
+
+    def prepare_metadata(self) -> str:
+        """Generate the ``.dist-info`` directory of the package with the
+        ``prepare_metadata_for_build_wheel`` hook of its build backend, without
+        building a wheel.
+
+        :raises HookMissing: if the build backend does not provide the hook
+        :return: The path to the generated ``.dist-info`` directory
+        """
+        metadata_dir = os.path.join(self.extra_kwargs["build_dir"], "metadata")
+        os.makedirs(metadata_dir, exist_ok=True)
+        with self._build_directory() as directory:
+            result = build_pep517(
+                directory,
+                metadata_dir,
+                config_settings=self.pep517_config,
+                dist_type="metadata",
+            )
+        return os.path.join(metadata_dir, result)
+
+    def build_wheel(self) -> str:
+        with self._build_directory() as directory:
+            return build_pep517(
+                directory,
+                self.extra_kwargs["build_dir"],
+                config_settings=self.pep517_config,
+                dist_type="wheel",
+            )
 
     # noinspection PyPackageRequirements
     def build_sdist(self) -> str:
-        need_delete = False
-        if not self.pyproject.exists():
-            if not self.build_requires:
-                build_requires = '"setuptools", "wheel"'
-            else:
-                build_requires = ", ".join(
-                    ['"{0}"'.format(r) for r in self.build_requires]
-                )
-            self.pyproject.write_text(
-                str(
-                    """
-[build-system]
-requires = [{0}]
-build-backend = "{1}"
-                """.format(
-                        build_requires, self.build_backend
-                    ).strip()
-                )
+        with self._build_directory(use_subdirectory=False) as directory:
+            return build_pep517(
+                directory,
+                self.extra_kwargs["build_dir"],
+                config_settings=self.pep517_config,
+                dist_type="sdist",
             )
-            need_delete = True
-        result = build_pep517(
-            self.base_dir,
-            self.extra_kwargs["build_dir"],
-            config_settings=self.pep517_config,
-            dist_type="sdist",
-        )
-        if need_delete:
-            self.pyproject.unlink()
-        return result
 
     def build(self) -> None:
         if self._is_built:
             return
         metadata = None
         try:
-            dist_path = self.build_wheel()
-            metadata = self.get_metadata_from_wheel(
-                os.path.join(self.extra_kwargs["build_dir"], dist_path)
-            )
+            metadata = get_metadata_from_distinfo(self.prepare_metadata())
         except Exception:
+            pass
+        if not metadata:
             try:
-                dist_path = self.build_sdist()
-                metadata = self.get_egg_metadata(metadata_type="egg")
-                if metadata:
-                    self.populate_metadata(metadata)
+                dist_path = self.build_wheel()
+                metadata = self.get_metadata_from_wheel(
+                    os.path.join(self.extra_kwargs["build_dir"], dist_path)
+                )
             except Exception:
-                pass
+                try:
+                    dist_path = self.build_sdist()
+                    metadata = self.get_egg_metadata(metadata_type="egg")
+                    if metadata:
+                        self.populate_metadata(metadata)
+                except Exception:
+                    pass
         if metadata:
             self.populate_metadata(metadata)
         if not self.metadata or not self.name:
@@ -1566,9 +1803,13 @@ build-backend = "{1}"
                 _metadata += (k, tuple(v))
             else:
                 _metadata += (k, v)
-        self.metadata = _metadata
-        self.setup_requires = make_base_requirements(metadata.get("requires", ()))
+        self._set_trusted(
+            metadata=_metadata,
+            setup_requires=make_base_requirements(metadata.get("requires", ())),
+        )
         self._requirements += tuple(self.setup_requires)
+        # Drop a ``requires`` computed before the metadata was known
+        self.__dict__.pop("requires", None)
         name = metadata.get("name")
         if name:
             self.name = name
@@ -1604,9 +1845,21 @@ build-backend = "{1}"
         return self
 
     def get_initial_info(self) -> Dict[str, Any]:
+        if self._static_metadata:
+            return self.as_dict()
         parse_setupcfg = False
         parse_setuppy = False
         self.run_pyproject()
+        if REQUIREMENTSLIB_STATIC_METADATA:
+            metadata = self.get_static_metadata()
+            if metadata is not None:
+                metadata["build_backend"] = self.build_backend
+                self.update_from_dict(metadata)
+                self._set_trusted(
+                    metadata=("name", self.name, "version", self._version),
+                    _static_metadata=True,
+                )
+                return self.as_dict()
         self.run_setup()
         if self.setup_cfg and self.setup_cfg.exists():
             parse_setupcfg = True
@@ -1624,7 +1877,7 @@ build-backend = "{1}"
                         parsed.update(self.parse_setup_py())
                     if parse_setupcfg:
                         parsed.update(self.parse_setup_cfg())
-            except Unparsable:
+            except (Unparsable, AttributeError, TypeError):
                 pass
             else:
                 self.update_from_dict(parsed)
@@ -1633,6 +1886,8 @@ build-backend = "{1}"
         return self.as_dict()
 
     def get_info(self) -> None:
+        if self._static_metadata:
+            return
         if self.metadata is None:
             self.build()
 
@@ -1667,6 +1922,101 @@ build-backend = "{1}"
         }
         return {k: v for k, v in prop_dict.items() if v}
 
+    def as_cache_entry(self) -> Dict[str, Any]:
+        """Serialize the resolved metadata from :meth:`as_dict` into a JSON
+        compatible dictionary suitable for the setup info cache.
+
+        :return: A dictionary of plain strings, lists and mappings
+        :rtype: Dict[str, Any]
+        """
+        info = self.as_dict()
+        python_requires = info.get("python_requires")
+        extras = {}
+        for section, reqs in info.get("extras", {}).items():
+            if not isinstance(reqs, (list, tuple)):
+                reqs = [reqs]
+            extras[section] = [str(r) for r in reqs if r is not None]
+        return {
+            "name": info.get("name"),
+            "version": info.get("version"),
+            "build_backend": info.get("build_backend"),
+            "build_requires": sorted(str(r) for r in info.get("build_requires", ())),
+            "requires": [
+                str(r.requirement)
+                for r in self._requirements or ()
+                if r.requirement is not None
+            ],
+            "setup_requires": [
+                str(r.requirement)
+                for r in info.get("setup_requires", ())
+                if r.requirement is not None
+            ],
+            "python_requires": str(python_requires) if python_requires else None,
+            "extras": extras,
+        }
+
+    @classmethod
+    def from_cache_entry(
+        cls,
+        entry: Dict[str, Any],
+        ireq: Optional[InstallRequirement] = None,
+        kwargs: Optional[Dict[str, str]] = None,
+        base_dir: Optional[str] = None,
+        subdirectory: Optional[str] = None,
+    ) -> "SetupInfo":
+        """Rebuild a :class:`SetupInfo` from a cache entry without running any
+        builds.
+
+        :param Dict[str, Any] entry: A dictionary produced by :meth:`as_cache_entry`
+        :param Optional[InstallRequirement] ireq: The requirement the entry belongs to
+        :param Optional[Dict[str, str]] kwargs: Extra keyword arguments to record
+        :param Optional[str] base_dir: The directory the package source was
+            unpacked into
+        :param Optional[str] subdirectory: The subdirectory of **base_dir** holding
+            the package
+        :raises ValidationError: If the entry does not hold valid setup info
+        :raises ValueError: If the entry is missing the name or version
+        :return: A fully populated setup info instance
+        :rtype: SetupInfo
+        """
+        python_requires = entry.get("python_requires")
+        name = entry.get("name")
+        version = entry.get("version")
+        if not isinstance(version, str) or not version:
+            raise ValueError("Setup info cache entry has no version")
+        data = {
+            "name": name,
+            "build_backend": (
+                entry.get("build_backend") or "setuptools.build_meta:__legacy__"
+            ),
+            "build_requires": tuple(entry.get("build_requires", ())),
+            "setup_requires": make_base_requirements(entry.get("setup_requires", [])),
+            "python_requires": SpecifierSet(python_requires) if python_requires else None,
+            "ireq": ireq,
+            "extra_kwargs": kwargs or {},
+        }
+        if base_dir:
+            data.update(cls._get_source_paths(base_dir, subdirectory))
+        # Validate without running __init__, which would build the package
+        values, fields_set, error = validate_model(cls, data)
+        if error is not None:
+            raise error
+        if not values["name"]:
+            raise ValueError("Setup info cache entry has no name")
+        created = cls.construct(_fields_set=fields_set, **values)
+        created._set_trusted(
+            metadata=("name", name, "version", version),
+            _version=version,
+            _requirements=make_base_requirements(entry.get("requires", [])),
+            _extras_requirements=tuple(
+                (section, make_base_requirements(reqs))
+                for section, reqs in entry.get("extras", {}).items()
+            ),
+            _is_built=True,
+            _ran_setup=True,
+        )
+        return created
+
     @classmethod
     def from_requirement(cls, requirement, finder=None) -> Optional["SetupInfo"]:
         ireq = requirement.ireq
@@ -1745,14 +2095,48 @@ build-backend = "{1}"
                     download_dir=download_dir,
                     hashes=ireq.hashes(True),
                 )
+        # The source is always unpacked so the paths of a cached setup info are
+        # usable, only building the package is skipped
+        cache_key = SETUP_INFO_CACHE.make_key(ireq, subdir)
+        if cache_key is not None and ireq.source_dir:
+            cached = SETUP_INFO_CACHE.get(cache_key)
+            if cached is not None:
+                try:
+                    return cls.from_cache_entry(
+                        cached,
+                        ireq=ireq,
+                        kwargs=kwargs,
+                        base_dir=ireq.source_dir,
+                        subdirectory=subdir,
+                    )
+                except (ValidationError, ValueError, TypeError, AttributeError):
+                    SETUP_INFO_CACHE.invalidate(cache_key)
         created = cls.create(
             ireq.source_dir,
             subdirectory=subdir,
             ireq=ireq,
             kwargs=kwargs,
         )
+        if cache_key is not None and created is not None and created.metadata:
+            SETUP_INFO_CACHE.set(cache_key, created.as_cache_entry())
         return created
 
+    @staticmethod
+    def _get_source_paths(
+        base_dir: Union[str, Path], subdirectory: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if not isinstance(base_dir, Path):
+            base_dir = Path(base_dir)
+        paths = {
+            "base_dir": base_dir.as_posix(),
+            "pyproject": base_dir.joinpath("pyproject.toml"),
+        }
+        if subdirectory is not None:
+            base_dir = base_dir.joinpath(subdirectory)
+        paths["setup_py"] = base_dir.joinpath("setup.py")
+        paths["setup_cfg"] = base_dir.joinpath("setup.cfg")
+        return paths
+
     @classmethod
     def create(
         cls,
@@ -1765,18 +2149,7 @@ build-backend = "{1}"
             return None
 
         creation_kwargs = {"extra_kwargs": kwargs}
-        if not isinstance(base_dir, Path):
-            base_dir = Path(base_dir)
-        creation_kwargs["base_dir"] = base_dir.as_posix()
-        pyproject = base_dir.joinpath("pyproject.toml")
-
-        if subdirectory is not None:
-            base_dir = base_dir.joinpath(subdirectory)
-        setup_py = base_dir.joinpath("setup.py")
-        setup_cfg = base_dir.joinpath("setup.cfg")
-        creation_kwargs["pyproject"] = pyproject
-        creation_kwargs["setup_py"] = setup_py
-        creation_kwargs["setup_cfg"] = setup_cfg
+        creation_kwargs.update(cls._get_source_paths(base_dir, subdirectory))
         if ireq:
             creation_kwargs["ireq"] = ireq
         created = cls(**creation_kwargs)
@@ -1,3 +1,4 @@
+import copy
 import os
 import re
 import string
@@ -21,6 +22,7 @@ import tomlkit as tomlkit
 from pip._internal.models.link import Link
 from pip._internal.req.constructors import install_req_from_line
 from pip._internal.utils._jaraco_text import drop_comment, join_continuation, yield_lines
+from pip._internal.utils.filetypes import is_archive_file
 from pip._vendor.packaging.markers import InvalidMarker, Marker, Op, Value, Variable
 from pip._vendor.packaging.requirements import Requirement as PackagingRequirement
 from pip._vendor.packaging.specifiers import InvalidSpecifier, Specifier, SpecifierSet
@@ -61,6 +63,15 @@ TOML_DICT_NAMES = [o.__class__.__name__ for o in TOML_DICT_OBJECTS]
 
 HASH_STRING = " --hash={0}"
 
+# PEP 621 ``[project]`` keys and the setup() keywords they correspond to
+PROJECT_METADATA_KEYS = {
+    "name": "name",
+    "version": "version",
+    "dependencies": "install_requires",
+    "optional-dependencies": "extras_require",
+    "requires-python": "python_requires",
+}
+
 ALPHA_NUMERIC = r"[{0}{1}]".format(string.ascii_letters, string.digits)
 PUNCTUATION = r"[\-_\.]"
 ALPHANUM_PUNCTUATION = r"[{0}{1}\-_\.]".format(string.ascii_letters, string.digits)
@@ -81,6 +92,14 @@ HOST_RE = r"(?:{0}?(?P<host>[^ ]+?\.?{1}+(?P<port>:\d+)?))?".format(
 URL = r"(?P<scheme>[^ ]+://){0}{1}".format(HOST_RE, PATH_RE)
 URL_RE = re.compile(r"{0}(?:{1}?{2}?)?".format(URL, URL_NAME, SUBDIR_RE))
 DIRECT_URL_RE = re.compile(r"{0}\s?@\s?{1}".format(NAME_WITH_EXTRAS, URL))
+PEP508_NAME = r"{0}(?:{1}*{0})?".format(ALPHA_NUMERIC, ALPHANUM_PUNCTUATION)
+VERSION_SPECIFIER = r"(?:===|[=!<>~]=|[<>])\s*[{0}{1}\-_\.\*\+!]+".format(
+    string.ascii_letters, string.digits
+)
+NAMED_REQUIREMENT_RE = re.compile(
+    r"^(?P<name>{0})\s*(?P<extras>\[\s*{0}(?:\s*,\s*{0})*\s*\])?"
+    r"\s*(?P<specifier>{1}(?:\s*,\s*{1})*)?$".format(PEP508_NAME, VERSION_SPECIFIER)
+)
 
 
 def filter_none(k, v) -> bool:
@@ -261,6 +280,9 @@ def specs_to_string(specs):
     if specs:
         if isinstance(specs, str):
             return specs
+        if isinstance(specs, SpecifierSet):
+            # a set has no order of its own, so sort it the way packaging does
+            return str(specs)
         try:
             extras = ",".join(["".join(spec) for spec in specs])
         except TypeError:
@@ -392,11 +414,13 @@ def strip_extras_markers_from_requirement(req):
     if req is None:
         raise TypeError("Must pass in a valid requirement, received {0!r}".format(req))
     if getattr(req, "marker", None) is not None:
-        marker = req.marker  # type: TMarker
-        marker._markers = _strip_extras_markers(marker._markers)
-        if not marker._markers:
+        # markers may be shared through the intern cache, so never modify them in place
+        elements = _strip_extras_markers(copy.deepcopy(req.marker._markers))
+        if not elements:
             req.marker = None
         else:
+            marker = Marker.__new__(Marker)  # type: TMarker
+            marker._markers = elements
             req.marker = marker
     return req
 
@@ -484,6 +508,49 @@ def get_pyproject(path):
     return requires, backend
 
 
+def get_pyproject_metadata(path):
+    # type: (Union[STRING_TYPE, Path]) -> Optional[Tuple[Dict[str, Any], Set[str]]]
+    """Given a base path, read the static PEP 621 metadata from the ``[project]``
+    table of its ``pyproject.toml`` file, keyed by the matching ``setup()``
+    keywords.
+
+    Fields listed in ``project.dynamic`` are left out and reported separately, as
+    only the build backend can provide them. Requirements which are neither
+    declared nor dynamic are empty, as PEP 621 specifies.
+
+    :param AnyStr path: The root path of the project, should be a directory (will be truncated)
+    :return: A 2 tuple of the static metadata and the ``setup()`` keywords of the
+        dynamic fields, or None if there is no ``[project]`` table
+    :rtype: Optional[Tuple[Dict[AnyStr, Any], Set[AnyStr]]]
+    """
+    if not path:
+        return None
+
+    if not isinstance(path, Path):
+        path = Path(path)
+    if not path.is_dir():
+        path = path.parent
+    pp_toml = path.joinpath("pyproject.toml")
+    if not pp_toml.exists():
+        return None
+    with open(pp_toml.as_posix(), encoding="utf-8") as fh:
+        project = tomlkit.loads(fh.read()).unwrap().get("project")
+    if not isinstance(project, dict):
+        return None
+    dynamic = set(project.get("dynamic", []))
+    project.setdefault("dependencies", [])
+    project.setdefault("optional-dependencies", {})
+    metadata = {
+        key: project[field]
+        for field, key in PROJECT_METADATA_KEYS.items()
+        if field in project and field not in dynamic
+    }
+    dynamic_keys = {
+        key for field, key in PROJECT_METADATA_KEYS.items() if field in dynamic
+    }
+    return metadata, dynamic_keys
+
+
 def split_markers_from_line(line):
     # type: (AnyStr) -> Tuple[AnyStr, Optional[AnyStr]]
     """Split markers from a dependency."""
@@ -501,6 +568,25 @@ def split_markers_from_line(line):
     return line, markers
 
 
+def is_named_requirement_line(line):
+    # type: (AnyStr) -> bool
+    """Check whether a line (with markers and hashes already removed) is a
+    plain **PEP-508** named requirement such as ``name[extras]>=1.0``.
+
+    This is a purely lexical check which never touches the filesystem, so a bare
+    name is always treated as a package name rather than a local path, which
+    matches the behavior of pip.
+
+    :param AnyStr line: The requirement line to check
+    :return: Whether the line names a requirement without any URL or path
+    :rtype: bool
+    """
+    match = NAMED_REQUIREMENT_RE.match(line)
+    if match is None:
+        return False
+    return not is_archive_file(match.group("name"))
+
+
 def split_vcs_method_from_uri(uri):
     # type: (AnyStr) -> Tuple[Optional[STRING_TYPE], STRING_TYPE]
     """Split a vcs+uri formatted uri into (vcs, uri)"""
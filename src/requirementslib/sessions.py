@@ -0,0 +1,139 @@
+"""A shared, pooled HTTP session for talking to package indexes."""
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .environment import (
+    REQUIREMENTSLIB_HTTP_BACKOFF,
+    REQUIREMENTSLIB_HTTP_POOL_SIZE,
+    REQUIREMENTSLIB_HTTP_RETRIES,
+    REQUIREMENTSLIB_HTTP_TIMEOUT,
+)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class PooledSession(Session):
+    """A :class:`~requests.Session` which applies a default timeout to every
+    request."""
+
+    def __init__(self, timeout: Optional[float] = None):
+        super(PooledSession, self).__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super(PooledSession, self).request(method, url, *args, **kwargs)
+
+
+class SessionManager(object):
+    """Lazily create and hold a single keep-alive HTTP session.
+
+    Connections are pooled per host, with at most ``pool_size`` connections open
+    to any one host, and idempotent requests are retried with exponential backoff
+    on connection errors and on the statuses in :data:`RETRY_STATUSES`.  A new
+    session is created after a fork so that child processes never share sockets
+    with their parent.
+
+    :param int retries: The number of times to retry a failed request
+    :param float backoff_factor: The backoff factor passed to
+        :class:`~urllib3.util.retry.Retry`
+    :param int pool_size: The maximum number of connections kept open per host
+    :param Optional[float] timeout: The default timeout for each request in seconds
+    """
+
+    def __init__(
+        self,
+        retries=REQUIREMENTSLIB_HTTP_RETRIES,
+        backoff_factor=REQUIREMENTSLIB_HTTP_BACKOFF,
+        pool_size=REQUIREMENTSLIB_HTTP_POOL_SIZE,
+        timeout=REQUIREMENTSLIB_HTTP_TIMEOUT,
+    ):
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._session = None  # type: Optional[Session]
+        self._pid = None  # type: Optional[int]
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "{0}(retries={1!r}, backoff_factor={2!r}, pool_size={3!r})".format(
+            self.__class__.__name__, self.retries, self.backoff_factor, self.pool_size
+        )
+
+    def create_session(self) -> Session:
+        """Build a new pooled session using the manager's configuration.
+
+        :return: A session with retrying, connection pooling adapters mounted
+        :rtype: :class:`~requests.Session`
+        """
+        session = PooledSession(timeout=self.timeout)
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["HEAD", "GET", "OPTIONS"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry,
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            pool_block=True,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @property
+    def session(self) -> Session:
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                self._session = self.create_session()
+                self._pid = os.getpid()
+            return self._session
+
+    def set_session(self, session: Optional[Session]) -> None:
+        """Replace the managed session, closing the current one.
+
+        :param Optional[Session] session: The session to use from now on, or None
+            to create a fresh one on next use
+        """
+        with self._lock:
+            previous, self._session = self._session, session
+            self._pid = os.getpid() if session is not None else None
+        if previous is not None and previous is not session:
+            previous.close()
+
+    @contextmanager
+    def use_session(self, session: Session) -> Iterator[Session]:
+        """Temporarily route every request through **session**.
+
+        :param Session session: The session to use inside the context
+        """
+        with self._lock:
+            previous, previous_pid = self._session, self._pid
+            self._session, self._pid = session, os.getpid()
+        try:
+            yield session
+        finally:
+            with self._lock:
+                self._session, self._pid = previous, previous_pid
+
+    def close(self) -> None:
+        """Close the managed session and its pooled connections."""
+        self.set_session(None)
+
+
+SESSION_MANAGER = SessionManager()
+
+
+def get_session() -> Session:
+    """Return the shared session from :data:`SESSION_MANAGER`."""
+    return SESSION_MANAGER.session
@@ -655,41 +655,131 @@ def remap(
     return value
 
 
-def merge_items(target_list, sourced=False):
-    if not sourced:
-        target_list = [(id(t), t) for t in target_list]
+_MERGE_LEAF_TYPES = (str, int, float, bool, type(None))
 
-    ret = None
-    source_map = {}
-
-    def remerge_enter(path, key, value):
-        new_parent, new_items = dict_path_enter(path, key, value)
-        if ret and not path and key is None:
-            new_parent = ret
 
+def _get_merge_target(parent, key):
+    """Look up **key** in **parent** the way :func:`get_path` does, returning
+    ``_UNSET`` when it is missing."""
+    if parent is _UNSET:
+        return _UNSET
+    try:
+        return parent[key]
+    except (KeyError, IndexError):
+        return _UNSET
+    except TypeError:
         try:
-            cur_val = get_path(ret, path + (key,))
-        except KeyError:
-            pass
-        else:
-            new_parent = cur_val
+            return parent[int(key)]
+        except (ValueError, KeyError, IndexError, TypeError):
+            return _UNSET
 
-        return new_parent, new_items
 
-    def remerge_exit(path, key, old_parent, new_parent, new_items):
-        return dict_path_exit(path, key, old_parent, new_parent, new_items)
+def _merge_value(path, key, value, existing, registry, source_map, source):
+    """Merge **value** into **existing**, its counterpart in the merged result.
 
-    for t_name, target in target_list:
-        if sourced:
+    Containers are merged into the existing container of the result when there
+    is one, and copied otherwise; other values replace the existing value.  This
+    mirrors what :func:`remap` does with the ``enter``, ``visit`` and ``exit``
+    callbacks of :func:`merge_items`, without the stack and path lookups.
+    """
+    value_id = id(value)
+    if value_id in registry:
+        result = registry[value_id]
+    else:
+        value_type = type(value)
+        if value_type in _MERGE_LEAF_TYPES:
+            new_items = False
+        elif value_type is dict:
+            new_parent, new_items = {}, value.items()
+        elif value_type is list:
+            new_parent, new_items = [], enumerate(value)
+        else:
+            new_parent, new_items = dict_path_enter(path, key, value)
+        if new_items is False:
+            result = value
+        else:
+            if existing is not _UNSET:
+                new_parent = existing
+            registry[value_id] = new_parent
+            child_path = path + (key,) if source_map is not None else path
+            items = [
+                (
+                    child_key,
+                    _merge_value(
+                        child_path,
+                        child_key,
+                        child_value,
+                        _get_merge_target(existing, child_key),
+                        registry,
+                        source_map,
+                        source,
+                    ),
+                )
+                for child_key, child_value in new_items
+            ]
+            parent_type = type(new_parent)
+            if parent_type is dict:
+                new_parent.update(items)
+                result = new_parent
+            elif parent_type is list:
+                new_parent.extend(item for _, item in items)
+                result = new_parent
+            else:
+                result = dict_path_exit(path, key, value, new_parent, items)
+            registry[value_id] = result
+    if source_map is not None:
+        source_map[path + (key,)] = source
+    return result
+
+
+def _merge_root(target, merged, source_map, source):
+    new_parent, new_items = dict_path_enter((), None, target)
+    if new_items is False:
+        raise TypeError("expected remappable root, not: %r" % target)
+    if merged:
+        new_parent = merged
+    existing = _UNSET if merged is None else merged
+    current = _get_merge_target(existing, None)
+    if current is not _UNSET:
+        new_parent = current
+    registry = {id(target): new_parent}
+    items = [
+        (
+            key,
+            _merge_value(
+                (),
+                key,
+                value,
+                _get_merge_target(existing, key),
+                registry,
+                source_map,
+                source,
+            ),
+        )
+        for key, value in new_items
+    ]
+    return dict_path_exit((), None, target, new_parent, items)
 
-            def remerge_visit(path, key, value):
-                source_map[path + (key,)] = t_name  # noqa: B023
-                return True
 
-        else:
-            remerge_visit = default_visit
+def merge_items(target_list, sourced=False):
+    """Deep merge a list of mappings, later values taking precedence.
+
+    Nested mappings are merged key by key, nested lists and sets are extended
+    and any other value is replaced.  The inputs are not modified.
 
-        ret = remap(target, enter=remerge_enter, visit=remerge_visit, exit=remerge_exit)
+    :param target_list: The mappings to merge, or ``(name, mapping)`` pairs when
+        **sourced** is True
+    :param bool sourced: Whether to also return a mapping of each path in the
+        result to the name of the mapping it was last set by
+    :return: The merged mapping, and the source map when **sourced** is True
+    """
+    if not sourced:
+        target_list = [(id(t), t) for t in target_list]
+
+    ret = None
+    source_map = {} if sourced else None
+    for t_name, target in target_list:
+        ret = _merge_root(target, ret, source_map, t_name)
 
     if not sourced:
         return ret
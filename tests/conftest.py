@@ -1,6 +1,8 @@
 # -*- coding=utf-8 -*-
 
 import contextlib
+import hashlib
+import http.server
 import io
 import json
 import os
@@ -8,7 +10,9 @@ import pathlib
 import random
 import shutil
 import subprocess as sp
+import threading
 import warnings
+import zipfile
 
 import distlib.wheel
 import pytest
@@ -116,6 +120,23 @@ def monkeypatch_if_needed(monkeypatch):
         yield
 
 
+@pytest.fixture(scope="session")
+def build_env_cache_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("build-envs")
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(monkeypatch, tmp_path, build_env_cache_dir):
+    from requirementslib.models.cache import BUILD_ENV_CACHE, HTTP_CACHE, SETUP_INFO_CACHE
+
+    monkeypatch.setattr(SETUP_INFO_CACHE, "cache_dir", tmp_path / "setup-info")
+    monkeypatch.setattr(HTTP_CACHE, "cache_dir", tmp_path / "http-json")
+    # Build environments are shared across the session so each backend is only
+    # installed once, but never in the user's cache directory
+    monkeypatch.setattr(BUILD_ENV_CACHE, "cache_dir", build_env_cache_dir)
+    yield
+
+
 @pytest.fixture(scope="session")
 def artifact_dir():
     return CURRENT_FILE.parent.joinpath("artifacts")
@@ -151,7 +172,7 @@ def package_json(fixture_dir, request):
 @pytest.fixture
 def monkeypatch_wheel_download(monkeypatch, fixture_dir):
     @contextlib.contextmanager
-    def open_file(link, session=None, stream=True):
+    def open_file(link, session=None, stream=True, seekable=False):
         link_filename = os.path.basename(link)
         dirname = distlib.wheel.Wheel(link_filename).name
         wheel_path = fixture_dir / "wheels" / dirname / link_filename
@@ -241,3 +262,136 @@ def test_artifact(artifact_dir, pathlib_tmpdir, request):
                 "failed to find installable artifact: %s (as_artifact: %s)\n"
                 "files: %s\nInstallable: %s" % (name, as_artifact, files, installable)
             )
+
+
+class RangeRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serve files from ``server.root``, honouring single byte ``Range``
+    headers when ``server.support_ranges`` is set.  The first ``server.failures``
+    requests are answered with a 503."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.serve(send_body=False)
+
+    def do_GET(self):
+        self.serve(send_body=True)
+
+    def serve(self, send_body=True):
+        path = self.server.root.joinpath(self.path.split("?")[0].lstrip("/"))
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            self.send_error(503)
+            return
+        if not path.is_file():
+            self.send_error(404)
+            return
+        data = path.read_bytes()
+        range_header = self.headers.get("Range")
+        if self.server.support_ranges and range_header and send_body:
+            start, _, end = range_header.replace("bytes=", "").partition("-")
+            if not start:
+                start, end = len(data) - int(end), len(data) - 1
+            else:
+                start, end = int(start), int(end) if end else len(data) - 1
+            body = data[start : end + 1]
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", "bytes {0}-{1}/{2}".format(start, end, len(data))
+            )
+        else:
+            body = data
+            self.send_response(200)
+        if self.server.support_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+            self.server.bytes_sent += len(body)
+            self.server.requested_paths.append(self.path)
+
+
+@pytest.fixture
+def http_file_server():
+    """Start local HTTP servers for a directory, returning the server which
+    exposes ``url``, ``bytes_sent``, ``requested_paths`` and ``connections``."""
+    servers = []
+
+    def start(root, support_ranges=True, failures=0):
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+        server.root = pathlib.Path(root)
+        server.support_ranges = support_ranges
+        server.bytes_sent = 0
+        server.requested_paths = []
+        server.connections = 0
+        server.failures = failures
+        server.url = "http://127.0.0.1:{0}".format(server.server_address[1])
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def fake_index(http_file_server, pathlib_tmpdir):
+    """Serve a single wheel (and optionally its :pep:`658` metadata file) from
+    a local HTTP server, returning the server and the package's JSON API
+    payload."""
+
+    def create(metadata, core_metadata=None, serve_metadata=True):
+        root = pathlib_tmpdir / "index"
+        root.mkdir()
+        filename = "fakepkg-1.0-py3-none-any.whl"
+        wheel_path = root / filename
+        with zipfile.ZipFile(wheel_path.as_posix(), "w") as zf:
+            zf.writestr("fakepkg/__init__.py", "")
+            zf.writestr("fakepkg-1.0.dist-info/METADATA", metadata)
+            zf.writestr("fakepkg-1.0.dist-info/WHEEL", "Wheel-Version: 1.0\n")
+        if serve_metadata:
+            root.joinpath(filename + ".metadata").write_text(metadata)
+        server = http_file_server(root)
+        wheel_bytes = wheel_path.read_bytes()
+        release = {
+            "comment_text": "",
+            "digests": {
+                "md5": hashlib.md5(wheel_bytes).hexdigest(),
+                "sha256": hashlib.sha256(wheel_bytes).hexdigest(),
+            },
+            "filename": filename,
+            "md5_digest": hashlib.md5(wheel_bytes).hexdigest(),
+            "packagetype": "bdist_wheel",
+            "python_version": "py3",
+            "size": len(wheel_bytes),
+            "upload_time": "2020-01-01T00:00:00",
+            "upload_time_iso_8601": "2020-01-01T00:00:00.000000Z",
+            "url": "{0}/{1}".format(server.url, filename),
+        }
+        if core_metadata is not None:
+            release["core-metadata"] = core_metadata
+        package_json = {
+            "info": {
+                "name": "fakepkg",
+                "version": "1.0",
+                "package_url": "{0}/fakepkg".format(server.url),
+                "requires_dist": None,
+            },
+            "last_serial": 1,
+            "releases": {"1.0": [release]},
+            "urls": [release],
+        }
+        return server, package_json
+
+    return create
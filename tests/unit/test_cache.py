@@ -0,0 +1,397 @@
+import hashlib
+import json
+import os
+import tarfile
+import time
+from pathlib import Path
+
+import pytest
+import requests
+from pip._internal.req.constructors import install_req_from_line
+from pydantic import ValidationError
+
+from requirementslib.models.cache import (
+    SETUP_INFO_CACHE,
+    BuildEnvCache,
+    HTTPCache,
+    SetupInfoCache,
+    hash_file,
+)
+from requirementslib.models.setup_info import BuildEnv, SetupInfo
+
+CACHE_ENTRY = {
+    "name": "environ-config",
+    "version": "19.1.0",
+    "build_backend": "setuptools.build_meta:__legacy__",
+    "build_requires": ["setuptools", "wheel"],
+    "requires": ["attrs>=17.4.0"],
+    "setup_requires": [],
+    "python_requires": ">=3.6",
+    "extras": {"tests": ["pytest"]},
+}
+
+
+@pytest.fixture
+def setup_info_cache(pathlib_tmpdir):
+    return SetupInfoCache(cache_dir=pathlib_tmpdir / "setup-info", max_size=1024 * 1024)
+
+
+def test_setup_info_cache_roundtrip(setup_info_cache):
+    assert setup_info_cache.get("archive:sha256=abc::") is None
+    setup_info_cache.set("archive:sha256=abc::", CACHE_ENTRY)
+    assert setup_info_cache.get("archive:sha256=abc::") == CACHE_ENTRY
+    assert setup_info_cache.invalidate("archive:sha256=abc::")
+    assert setup_info_cache.get("archive:sha256=abc::") is None
+    assert not setup_info_cache.invalidate("archive:sha256=abc::")
+
+
+def test_setup_info_cache_evicts_least_recently_used(setup_info_cache):
+    setup_info_cache.set("key-1", CACHE_ENTRY)
+    entry_size = setup_info_cache._path_for("key-1").stat().st_size
+    setup_info_cache.max_size = entry_size * 2
+    setup_info_cache.set("key-2", CACHE_ENTRY)
+    old = time.time() - 60
+    os.utime(setup_info_cache._path_for("key-1").as_posix(), (old, old))
+    os.utime(setup_info_cache._path_for("key-2").as_posix(), (old - 60, old - 60))
+    # reading an entry marks it as recently used
+    assert setup_info_cache.get("key-2") == CACHE_ENTRY
+    setup_info_cache.set("key-3", CACHE_ENTRY)
+    assert setup_info_cache.get("key-1") is None
+    assert setup_info_cache.get("key-2") == CACHE_ENTRY
+    assert setup_info_cache.get("key-3") == CACHE_ENTRY
+    setup_info_cache.clear()
+    assert setup_info_cache.get("key-3") is None
+
+
+def test_setup_info_cache_disabled(pathlib_tmpdir):
+    cache = SetupInfoCache(cache_dir=pathlib_tmpdir, max_size=0)
+    cache.set("key", CACHE_ENTRY)
+    assert cache.get("key") is None
+    assert not list(pathlib_tmpdir.glob("*.json"))
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        (
+            "https://example.com/pkg-1.0.tar.gz#sha256=abcdef",
+            "archive:sha256=abcdef::",
+        ),
+        (
+            "https://example.com/pkg-1.0.tar.gz#sha256=abcdef&subdirectory=src",
+            "archive:sha256=abcdef:src:",
+        ),
+        (
+            "pkg[b,a] @ git+https://github.com/example/pkg.git@{0}".format("A" * 40),
+            "vcs:{0}::a,b".format("a" * 40),
+        ),
+        ("git+https://github.com/example/pkg.git@main#egg=pkg", None),
+        ("https://example.com/pkg-1.0.tar.gz", None),
+    ],
+)
+def test_setup_info_cache_key(line, expected):
+    ireq = install_req_from_line(line)
+    assert SetupInfoCache.make_key(ireq) == expected
+
+
+def test_setup_info_cache_key_hashes_local_archives(pathlib_tmpdir):
+    archive = pathlib_tmpdir / "pkg-1.0.tar.gz"
+    archive.write_bytes(b"not really a tarball")
+    ireq = install_req_from_line(archive.as_posix())
+    key = SetupInfoCache.make_key(ireq, subdirectory="sub")
+    assert key == "archive:sha256={0}:sub:".format(hash_file(archive.as_posix()))
+
+
+def test_setup_info_from_cache_entry():
+    setup_info = SetupInfo.from_cache_entry(CACHE_ENTRY)
+    assert setup_info.name == "environ-config"
+    assert setup_info.version == "19.1.0"
+    assert sorted(setup_info.requires) == ["attrs"]
+    assert str(setup_info.python_requires) == ">=3.6"
+    assert [str(r) for r in setup_info.extras["tests"]] == ["pytest"]
+    assert setup_info.as_cache_entry() == CACHE_ENTRY
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"name": ["environ-config"]},
+        {"name": None},
+        {"version": None},
+        {"python_requires": "not a specifier"},
+        {"requires": ["not a requirement!"]},
+    ],
+)
+def test_setup_info_from_invalid_cache_entry(changes):
+    entry = dict(CACHE_ENTRY, **changes)
+    with pytest.raises((ValidationError, ValueError)):
+        SetupInfo.from_cache_entry(entry)
+
+
+@pytest.fixture
+def sdist(pathlib_tmpdir):
+    source = pathlib_tmpdir / "source"
+    source.mkdir()
+    source.joinpath("setup.py").write_text(
+        "from setuptools import setup\nsetup(name='environ-config', version='19.1.0')\n"
+    )
+    archive = pathlib_tmpdir / "environ-config-19.1.0.tar.gz"
+    with tarfile.open(archive.as_posix(), "w:gz") as tar:
+        tar.add(source.as_posix(), arcname="environ-config-19.1.0")
+    return archive
+
+
+def test_setup_info_from_ireq_cache_hit_unpacks_source(sdist, monkeypatch):
+    monkeypatch.setattr(SetupInfo, "create", classmethod(lambda cls, *a, **kw: None))
+    ireq = install_req_from_line(sdist.as_posix())
+    SETUP_INFO_CACHE.set(SETUP_INFO_CACHE.make_key(ireq), CACHE_ENTRY)
+    setup_info = SetupInfo.from_ireq(ireq)
+    assert setup_info.as_cache_entry() == CACHE_ENTRY
+    assert ireq.source_dir is not None
+    assert setup_info.base_dir == Path(ireq.source_dir).as_posix()
+    assert setup_info.setup_py == Path(ireq.source_dir) / "setup.py"
+    assert setup_info.pyproject == Path(ireq.source_dir) / "pyproject.toml"
+
+
+def test_setup_info_from_ireq_drops_invalid_cache_entry(sdist, monkeypatch):
+    created = []
+    monkeypatch.setattr(
+        SetupInfo, "create", classmethod(lambda cls, *a, **kw: created.append(a))
+    )
+    ireq = install_req_from_line(sdist.as_posix())
+    key = SETUP_INFO_CACHE.make_key(ireq)
+    SETUP_INFO_CACHE.set(key, dict(CACHE_ENTRY, name=["environ-config"]))
+    assert SetupInfo.from_ireq(ireq) is None
+    assert created == [(ireq.source_dir,)]
+    assert SETUP_INFO_CACHE.get(key) is None
+
+
+class ConditionalJSONAdapter(requests.adapters.BaseAdapter):
+    def __init__(self, documents, cache_control="max-age=600"):
+        super().__init__()
+        self.documents = documents
+        self.cache_control = cache_control
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        document = self.documents.get(request.path_url)
+        if document is None:
+            response.status_code = 404
+            return response
+        etag = '"{0}"'.format(hashlib.sha256(document.encode()).hexdigest())
+        response.headers["Cache-Control"] = self.cache_control
+        if request.headers.get("If-None-Match") == etag:
+            response.status_code = 304
+            response._content = b""
+            return response
+        response.status_code = 200
+        response.headers["ETag"] = etag
+        response.headers["X-PyPI-Last-Serial"] = "42"
+        response._content = document.encode()
+        return response
+
+    def close(self):
+        pass
+
+
+def cache_etag(cache_dir, url):
+    return HTTPCache(cache_dir=cache_dir).get(url)["etag"]
+
+
+@pytest.fixture
+def json_index():
+    def create(documents, cache_control="max-age=600"):
+        adapter = ConditionalJSONAdapter(documents, cache_control=cache_control)
+        session = requests.Session()
+        session.mount("https://index.example.com/", adapter)
+        return adapter, session
+
+    return create
+
+
+def test_http_cache_serves_fresh_responses(json_index, pathlib_tmpdir):
+    adapter, session = json_index({"/pkg/json": '{"last_serial": 1}'})
+    url = "https://index.example.com/pkg/json"
+    cache = HTTPCache(cache_dir=pathlib_tmpdir)
+    assert cache.get_json(url, session=session) == {"last_serial": 1}
+    assert cache.get_json(url, session=session) == {"last_serial": 1}
+    assert len(adapter.requests) == 1
+    entry = cache.get(url)
+    assert entry["etag"] == '"{0}"'.format(
+        hashlib.sha256(b'{"last_serial": 1}').hexdigest()
+    )
+    assert entry["last_serial"] == "42"
+    # a new process reads the still fresh response from disk
+    assert HTTPCache(cache_dir=pathlib_tmpdir).get_json(url, session=session) == {
+        "last_serial": 1
+    }
+    assert len(adapter.requests) == 1
+
+
+def test_http_cache_revalidates_stale_responses(json_index, pathlib_tmpdir):
+    documents = {"/pkg/json": '{"last_serial": 1}'}
+    adapter, session = json_index(documents, cache_control="max-age=0")
+    url = "https://index.example.com/pkg/json"
+    HTTPCache(cache_dir=pathlib_tmpdir).get_json(url, session=session)
+    assert HTTPCache(cache_dir=pathlib_tmpdir).get_json(url, session=session) == {
+        "last_serial": 1
+    }
+    assert len(adapter.requests) == 2
+    assert adapter.requests[1].headers["If-None-Match"] == cache_etag(pathlib_tmpdir, url)
+    documents["/pkg/json"] = '{"last_serial": 2}'
+    assert HTTPCache(cache_dir=pathlib_tmpdir).get_json(url, session=session) == {
+        "last_serial": 2
+    }
+    assert len(adapter.requests) == 3
+
+
+def test_http_cache_memo_is_bounded_and_copied(json_index, pathlib_tmpdir):
+    documents = {
+        "/a/json": '{"releases": ["1.0"]}',
+        "/b/json": '{"releases": ["2.0"]}',
+    }
+    adapter, session = json_index(documents)
+    cache = HTTPCache(cache_dir=pathlib_tmpdir, max_size=1024)
+    url_a, url_b = (
+        "https://index.example.com/a/json",
+        "https://index.example.com/b/json",
+    )
+    cache.get_json(url_a, session=session)["releases"].append("mutated")
+    assert cache.get_json(url_a, session=session) == {"releases": ["1.0"]}
+    assert len(adapter.requests) == 1
+    # only one document fits in the memo, so fetching b evicts a
+    cache.max_size = len(json.dumps({"releases": ["1.0"]}))
+    cache.get_json(url_b, session=session)
+    assert list(cache._memo) == [url_b]
+    assert cache._memo_size <= cache.max_size
+
+
+def test_http_cache_refetches_unexpected_not_modified(json_index, pathlib_tmpdir):
+    document = '{"last_serial": 1}'
+    adapter, session = json_index({"/pkg/json": document})
+    session.headers["If-None-Match"] = '"{0}"'.format(
+        hashlib.sha256(document.encode()).hexdigest()
+    )
+    url = "https://index.example.com/pkg/json"
+    cache = HTTPCache(cache_dir=pathlib_tmpdir)
+    assert cache.get_json(url, session=session) == {"last_serial": 1}
+    assert len(adapter.requests) == 2
+    assert "If-None-Match" not in adapter.requests[1].headers
+    assert cache.get(url)["body"] == {"last_serial": 1}
+
+
+def test_http_cache_raises_http_errors(json_index, pathlib_tmpdir):
+    adapter, session = json_index({})
+    cache = HTTPCache(cache_dir=pathlib_tmpdir)
+    with pytest.raises(requests.exceptions.HTTPError):
+        cache.get_json("https://index.example.com/missing/json", session=session)
+    assert not list(pathlib_tmpdir.glob("*.json"))
+
+
+@pytest.fixture
+def build_env_cache(pathlib_tmpdir):
+    return BuildEnvCache(cache_dir=pathlib_tmpdir / "build-envs", max_size=1024 * 1024)
+
+
+def _fake_pip_install(calls):
+    def pip_install(self, prefix, reqs):
+        calls.append(sorted(reqs))
+        package_dir = os.path.join(prefix, "lib", "fake")
+        os.makedirs(package_dir, exist_ok=True)
+        with open(os.path.join(package_dir, "installed.txt"), "w") as fh:
+            fh.write("\n".join(reqs) * 100)
+        return True
+
+    return pip_install
+
+
+def test_build_env_cache_key():
+    assert BuildEnvCache.make_key(["wheel", "setuptools>=40.8"]) == (
+        BuildEnvCache.make_key(["setuptools >= 40.8", "wheel", "wheel"])
+    )
+    assert BuildEnvCache.make_key(["setuptools"]) != BuildEnvCache.make_key(["flit"])
+
+
+def test_build_env_cache_reuses_environments(build_env_cache, monkeypatch):
+    calls = []
+    monkeypatch.setattr(BuildEnv, "_pip_install", _fake_pip_install(calls))
+    for _ in range(3):
+        with BuildEnv(cache=build_env_cache) as env:
+            env.pip_install(["setuptools>=40.8", "wheel"])
+            prefix = build_env_cache.get(["wheel", "setuptools>=40.8"])
+            assert prefix is not None
+            assert os.environ["PYTHONPATH"].startswith(prefix)
+    assert calls == [["setuptools>=40.8", "wheel"]]
+    assert not list(build_env_cache.cache_dir.glob(".staging-*"))
+
+
+def test_build_env_cache_skips_failed_installs(build_env_cache, monkeypatch):
+    monkeypatch.setattr(BuildEnv, "_pip_install", lambda self, prefix, reqs: False)
+    with BuildEnv(cache=build_env_cache) as env:
+        env.pip_install(["setuptools"])
+        assert list(build_env_cache.cache_dir.glob(".staging-*"))
+    assert build_env_cache.get(["setuptools"]) is None
+    assert not list(build_env_cache.cache_dir.glob(".staging-*"))
+
+
+def test_build_env_cache_evicts_least_recently_used(build_env_cache, monkeypatch):
+    calls = []
+    install = _fake_pip_install(calls)
+    for requires in (["setuptools"], ["flit_core"]):
+        staging_dir = build_env_cache.stage()
+        install(None, staging_dir, requires)
+        build_env_cache.add(requires, staging_dir)
+    old = time.time() - 60
+    for requires, mtime in ((["setuptools"], old), (["flit_core"], old - 60)):
+        marker = Path(build_env_cache.get(requires)) / BuildEnvCache.MARKER
+        os.utime(marker.as_posix(), (mtime, mtime))
+    entry_size = sum(size for _, _, size in build_env_cache._iter_entries()) // 2
+    build_env_cache.max_size = entry_size * 2
+    # reading an environment marks it as recently used
+    assert build_env_cache.get(["flit_core"]) is not None
+    staging_dir = build_env_cache.stage()
+    install(None, staging_dir, ["hatchling"])
+    build_env_cache.add(["hatchling"], staging_dir)
+    assert build_env_cache.get(["setuptools"]) is None
+    assert build_env_cache.get(["flit_core"]) is not None
+    assert build_env_cache.get(["hatchling"]) is not None
+    build_env_cache.clear()
+    assert build_env_cache.get(["hatchling"]) is None
+
+
+def test_build_env_cache_keeps_leased_environments(build_env_cache, monkeypatch):
+    install = _fake_pip_install([])
+    for requires in (["setuptools"], ["flit_core"]):
+        staging_dir = build_env_cache.stage()
+        install(None, staging_dir, requires)
+        build_env_cache.add(requires, staging_dir)
+    old = time.time() - 60
+    marker = Path(build_env_cache.get(["setuptools"])) / BuildEnvCache.MARKER
+    os.utime(marker.as_posix(), (old, old))
+    lease = build_env_cache.lease(["setuptools"])
+    build_env_cache.max_size = 1
+    build_env_cache.evict()
+    # the leased environment survives even though it is the least recently used
+    assert build_env_cache.get(["setuptools"]) is not None
+    assert build_env_cache.get(["flit_core"]) is None
+    build_env_cache.release(lease)
+    build_env_cache.evict()
+    assert build_env_cache.get(["setuptools"]) is None
+    assert not list(build_env_cache.cache_dir.glob(".evicting-*"))
+
+
+def test_build_env_leases_environments_while_active(build_env_cache, monkeypatch):
+    monkeypatch.setattr(BuildEnv, "_pip_install", _fake_pip_install([]))
+    build_env_cache.max_size = 1
+    with BuildEnv(cache=build_env_cache) as env:
+        env.pip_install(["setuptools"])
+        prefix = build_env_cache.get(["setuptools"])
+        assert prefix is not None
+        build_env_cache.evict()
+        assert os.path.isdir(prefix)
+    build_env_cache.evict()
+    assert not os.path.isdir(prefix)
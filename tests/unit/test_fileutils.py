@@ -0,0 +1,62 @@
+import io
+import os
+import zipfile
+
+import pytest
+import requests
+
+from requirementslib.fileutils import HTTPRangeFile, open_file
+from requirementslib.models.metadata import get_remote_wheel_metadata
+
+METADATA = """Metadata-Version: 2.1
+Name: bigpkg
+Version: 1.0
+Requires-Dist: six
+Requires-Dist: requests (>=2.0) ; extra == 'http'
+"""
+
+
+@pytest.fixture
+def large_wheel(pathlib_tmpdir):
+    wheel_path = pathlib_tmpdir / "bigpkg-1.0-py3-none-any.whl"
+    with zipfile.ZipFile(wheel_path, "w", compression=zipfile.ZIP_STORED) as zf:
+        zf.writestr("bigpkg/data.bin", os.urandom(2 * 1024 * 1024))
+        zf.writestr("bigpkg-1.0.dist-info/METADATA", METADATA)
+        zf.writestr("bigpkg-1.0.dist-info/WHEEL", "Wheel-Version: 1.0\n")
+    return wheel_path
+
+
+def test_http_range_file_reads(http_file_server, pathlib_tmpdir):
+    content = bytes(range(256)) * 1024
+    pathlib_tmpdir.joinpath("blob.bin").write_bytes(content)
+    server = http_file_server(pathlib_tmpdir)
+    with requests.Session() as session:
+        with HTTPRangeFile(server.url + "/blob.bin", session, chunk_size=16) as fp:
+            assert len(fp) == len(content)
+            fp.seek(-100, io.SEEK_END)
+            assert fp.read() == content[-100:]
+            fp.seek(1000)
+            assert fp.read(50) == content[1000:1050]
+            fp.seek(990)
+            assert fp.read(100) == content[990:1090]
+            assert fp.tell() == 1090
+    assert server.bytes_sent < len(content)
+
+
+@pytest.mark.parametrize("support_ranges", [True, False])
+def test_remote_wheel_metadata(http_file_server, large_wheel, support_ranges):
+    server = http_file_server(large_wheel.parent, support_ranges=support_ranges)
+    metadata = get_remote_wheel_metadata("{0}/{1}".format(server.url, large_wheel.name))
+    assert metadata.name == "bigpkg"
+    assert metadata.run_requires == ["six", "requests (>=2.0) ; extra == 'http'"]
+    wheel_size = large_wheel.stat().st_size
+    if support_ranges:
+        assert server.bytes_sent < wheel_size / 10
+    else:
+        assert server.bytes_sent == wheel_size
+
+
+def test_open_file_seekable_local(large_wheel):
+    with open_file(large_wheel.as_posix(), seekable=True) as fp:
+        assert fp.seekable()
+        assert zipfile.ZipFile(fp).namelist()[1] == "bigpkg-1.0.dist-info/METADATA"
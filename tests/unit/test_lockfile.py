@@ -1,3 +1,5 @@
+import io
+import json
 import os
 import textwrap
 
@@ -5,7 +7,12 @@ import pytest
 
 from requirementslib.exceptions import MissingParameter, PipfileNotFound
 from requirementslib.fileutils import cd
-from requirementslib.models.lockfile import Lockfile
+from requirementslib.models.lockfile import (
+    Lockfile,
+    dump_lockfile_entries,
+    iter_lockfile_entries,
+)
+from requirementslib.models.records import RequirementRecord
 from requirementslib.models.requirements import Requirement
 from requirementslib.utils import temp_environ
 
@@ -22,6 +29,215 @@ def test_lockfile(tmpdir, fixture_dir):
         assert requires == []
 
 
+def test_lockfile_environment_requirements(tmpdir, fixture_dir):
+    with temp_environ():
+        os.environ["PIPENV_CACHE_DIR"] = tmpdir.strpath
+        lockfile = Lockfile.create(fixture_dir / "lockfile")
+        environments = [
+            {"python_version": "2.7", "sys_platform": "linux"},
+            {"python_version": "3.8", "sys_platform": "win32"},
+        ]
+        py27, py38 = lockfile.as_environment_requirements("develop", environments)
+        assert "enum34==1.1.10" in py27
+        assert "enum34==1.1.10" not in py38
+        assert not any(";" in line for line in py27 + py38)
+        all_lines = lockfile.as_requirements(category="develop")
+        assert len(py27) < len(all_lines) and len(py38) < len(all_lines)
+
+
+def test_lockfile_iterates_records(tmpdir, fixture_dir):
+    with temp_environ():
+        os.environ["PIPENV_CACHE_DIR"] = tmpdir.strpath
+        lockfile = Lockfile.create(fixture_dir / "lockfile")
+        records = list(lockfile.iter_records())
+        assert "path" in dict(lockfile)
+        assert [record.name for record in records] == [
+            req.name for req in lockfile.get_requirements()
+        ]
+        develop = list(lockfile.iter_records(categories=["dev-packages"]))
+        assert [
+            record.as_line(include_hashes=True) for record in develop
+        ] == lockfile.as_requirements(category="develop", include_hashes=True)
+        assert develop == [
+            RequirementRecord.from_requirement(req)
+            for req in lockfile.get_requirements(categories=["develop"])
+        ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_iter_lockfile_entries(fixture_dir, chunk_size):
+    path = fixture_dir / "lockfile" / "Pipfile.lock"
+    data = json.loads(path.read_text())
+    with path.open("rb") as f:
+        entries = list(iter_lockfile_entries(f, chunk_size=chunk_size))
+    assert entries == [
+        (section, name, data[section][name]) for section in data for name in data[section]
+    ]
+
+
+@pytest.mark.parametrize("document", ['{"default": []}', '{"default": {}} {}', '{"a"'])
+def test_iter_lockfile_entries_invalid(document):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_lockfile_entries(io.StringIO(document)))
+
+
+def test_lockfile_write_streams_entries(pathlib_tmpdir, fixture_dir):
+    path = pathlib_tmpdir / "Pipfile.lock"
+    path.write_text((fixture_dir / "lockfile" / "Pipfile.lock").read_text())
+    lockfile = Lockfile.load(path.as_posix())
+    expected = io.StringIO()
+    lockfile.lockfile.dump(expected)
+    lockfile.write()
+    assert path.read_text() == expected.getvalue()
+    out = io.StringIO()
+    dump_lockfile_entries([("develop", "six", {"version": "==1.16.0"})], out)
+    assert json.loads(out.getvalue()) == {
+        "_meta": {},
+        "default": {},
+        "develop": {"six": {"version": "==1.16.0"}},
+    }
+    with pytest.raises(ValueError):
+        dump_lockfile_entries([("a", "x", {}), ("b", "y", {}), ("a", "z", {})], out)
+
+
+def test_lockfile_update_entries(pathlib_tmpdir, fixture_dir):
+    path = pathlib_tmpdir / "Pipfile.lock"
+    original = (fixture_dir / "lockfile" / "Pipfile.lock").read_text()
+    path.write_text(original)
+    lockfile = Lockfile.load(path.as_posix())
+    lockfile.update_entries(
+        {
+            "six": {"version": "==1.16.0", "hashes": ["sha256:abc"]},
+            "a-new-package": {"version": "==1.0"},
+            "alabaster": None,
+        },
+        section="dev-packages",
+    )
+    updated = path.read_text()
+    data = json.loads(updated)
+    assert data["develop"]["six"] == {"version": "==1.16.0", "hashes": ["sha256:abc"]}
+    assert data["develop"]["a-new-package"] == {"version": "==1.0"}
+    assert "alabaster" not in data["develop"]
+    assert list(data["develop"]) == sorted(data["develop"])
+    assert data["_meta"] == json.loads(original)["_meta"]
+    # untouched entries keep their original formatting
+    assert '"extras": ["validation"],' in updated
+    assert len(updated.splitlines()) < len(original.splitlines())
+    assert Lockfile.load(path.as_posix()).lockfile._data == lockfile.lockfile._data
+    assert lockfile.get_entry("A_New_Package") == ("develop", {"version": "==1.0"})
+    assert lockfile.get_entry("alabaster") is None
+
+
+def test_lockfile_update_entries_normalizes_names(pathlib_tmpdir, fixture_dir):
+    path = pathlib_tmpdir / "Pipfile.lock"
+    path.write_text((fixture_dir / "lockfile" / "Pipfile.lock").read_text())
+    lockfile = Lockfile.load(path.as_posix())
+    lockfile.update_entries(
+        {
+            "SIX": {"version": "==1.16.0"},
+            "A_New.Package": {"version": "==1.0"},
+            "Alabaster": None,
+        },
+        section="develop",
+    )
+    data = json.loads(path.read_text())
+    assert data["develop"]["six"] == {"version": "==1.16.0"}
+    assert "SIX" not in data["develop"]
+    assert data["develop"]["a-new-package"] == {"version": "==1.0"}
+    assert "alabaster" not in data["develop"]
+    assert Lockfile.load(path.as_posix()).lockfile._data == lockfile.lockfile._data
+    assert lockfile.get_entry("six", "develop") == ("develop", {"version": "==1.16.0"})
+    assert lockfile.get_entry("alabaster") is None
+
+
+def test_lockfile_update_entries_recomputes_meta_hash(pathlib_tmpdir):
+    pathlib_tmpdir.joinpath("Pipfile").write_text(
+        textwrap.dedent(
+            """
+            [packages]
+            six = "*"
+            """
+        )
+    )
+    lockfile = Lockfile.create(pathlib_tmpdir.as_posix())
+    lockfile.write()
+    path = pathlib_tmpdir / "Pipfile.lock"
+    expected_hash = json.loads(path.read_text())["_meta"]["hash"]
+    pathlib_tmpdir.joinpath("Pipfile").write_text(
+        textwrap.dedent(
+            """
+            [packages]
+            six = "==1.16.0"
+            """
+        )
+    )
+    lockfile.update_entries({"six": {"version": "==1.16.0"}}, update_hash=True)
+    data = json.loads(path.read_text())
+    assert data["default"] == {"six": {"version": "==1.16.0"}}
+    assert data["develop"] == {}
+    assert data["_meta"]["hash"] != expected_hash
+    assert data["_meta"]["hash"] == lockfile.lockfile._data["_meta"]["hash"]
+
+
+def test_lockfile_update_entries_keeps_meta_hash(pathlib_tmpdir):
+    pathlib_tmpdir.joinpath("Pipfile").write_text(
+        textwrap.dedent(
+            """
+            [packages]
+            six = "*"
+            """
+        )
+    )
+    lockfile = Lockfile.create(pathlib_tmpdir.as_posix())
+    lockfile.write()
+    path = pathlib_tmpdir / "Pipfile.lock"
+    expected_hash = json.loads(path.read_text())["_meta"]["hash"]
+    pathlib_tmpdir.joinpath("Pipfile").write_text(
+        textwrap.dedent(
+            """
+            [packages]
+            six = "*"
+            requests = "*"
+            """
+        )
+    )
+    lockfile.update_entries({"six": {"version": "==1.16.0"}})
+    data = json.loads(path.read_text())
+    assert data["default"] == {"six": {"version": "==1.16.0"}}
+    assert data["_meta"]["hash"] == expected_hash
+    assert lockfile._get_pipfile_hash() != expected_hash
+
+
+def test_lockfile_index(tmpdir, fixture_dir):
+    with temp_environ():
+        os.environ["PIPENV_CACHE_DIR"] = tmpdir.strpath
+        lockfile = Lockfile.create(fixture_dir / "lockfile")
+        section, entry = lockfile.get_entry("PyYAML")
+        assert section == "develop"
+        assert entry is lockfile.develop._data["pyyaml"]
+        assert "Zope.Interface" not in lockfile
+        assert "pyyaml" in lockfile and "develop" in lockfile
+        assert lockfile["PyYAML"] is entry
+        with pytest.raises(KeyError):
+            lockfile["zope.interface"]
+        assert lockfile.get_entry("pyyaml", section="default") is None
+
+        lockfile["default"] = {"PyYAML": {"version": "==6.0"}, "Zope_Interface": "*"}
+        assert lockfile.get_entry("pyyaml") == ("default", {"version": "==6.0"})
+        assert lockfile.get_entry("zope.interface") == ("default", "*")
+        lockfile["default"] = {}
+        assert lockfile.get_entry("zope.interface") is None
+        assert lockfile.get_entry("pyyaml")[0] == "develop"
+
+        deps = lockfile.get_deps(dev=True, only=False)
+        assert list(deps) == list(lockfile.develop._data)
+        assert deps["pyyaml"] == lockfile.develop._data["pyyaml"]
+        deps["pyyaml"]["hashes"].append("sha256:abc")
+        assert "sha256:abc" not in lockfile.develop._data["pyyaml"]["hashes"]
+        develop = lockfile.get_deps(dev=True, only=True)
+        assert develop["pyyaml"] is not lockfile.develop._data["pyyaml"]
+
+
 def test_lockfile_requirements(pathlib_tmpdir):
     lockfile = pathlib_tmpdir.joinpath("Pipfile.lock")
     lockfile.write_text(
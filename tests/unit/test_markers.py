@@ -1,9 +1,11 @@
 import pytest
 from pip._vendor.packaging.markers import Marker
+from pip._vendor.packaging.requirements import Requirement as PackagingRequirement
 from pip._vendor.packaging.specifiers import InvalidSpecifier, Specifier, SpecifierSet
 from pip._vendor.packaging.version import Version
 
 import requirementslib.models.markers
+from requirementslib.models.utils import strip_extras_markers_from_requirement
 
 
 @pytest.mark.parametrize(
@@ -209,3 +211,286 @@ def test_contains_extras_or_pyversions(marker, contains_extras, contains_pyversi
 )
 def test_marker_from_specifier(marker, expected):
     assert str(requirementslib.models.markers.marker_from_specifier(marker)) == expected
+
+
+def test_get_marker_interns_equal_markers():
+    markers = requirementslib.models.markers
+    marker = markers.get_marker("python_version >= '3.6' and os_name == 'nt'")
+    assert markers.get_marker("python_version >= '3.6' and os_name == 'nt'") is marker
+    assert markers.get_marker('python_version >= "3.6" and os_name == "nt"') is marker
+    assert markers.get_marker(Marker(str(marker))) is marker
+    assert markers.get_marker("") is None
+    specset = markers.get_specifierset(">=1.0,<2.0")
+    assert markers.get_specifierset(SpecifierSet("<2.0,>=1.0")) is specset
+
+
+def test_stripping_shared_markers_does_not_modify_them():
+    markers = requirementslib.models.markers
+    marker = markers.get_marker("python_version >= '3.6' and extra == 'tests'")
+    stripped = markers.get_without_extra(marker)
+    assert str(stripped) == 'python_version >= "3.6"'
+    assert str(marker) == 'python_version >= "3.6" and extra == "tests"'
+    normalized = markers.normalize_marker_str(marker)
+    assert normalized == "python_version >= '3.6' and extra == 'tests'"
+    assert str(marker) == 'python_version >= "3.6" and extra == "tests"'
+    req = PackagingRequirement("six; python_version >= '3.6' and extra == 'tests'")
+    req.marker = marker
+    stripped_req = strip_extras_markers_from_requirement(req)
+    assert str(stripped_req.marker) == 'python_version >= "3.6"'
+    assert str(marker) == 'python_version >= "3.6" and extra == "tests"'
+
+
+def test_intern_cache_does_not_cache_the_interned_value():
+    cache = requirementslib.models.markers.InternCache(Marker, hash_cons=True)
+    owned = Marker("os_name == 'nt'")
+    interned = cache.intern(owned)
+    assert interned is not owned
+    assert str(interned) == str(owned)
+    owned._markers.clear()
+    assert cache.intern(Marker("os_name == 'nt'")) is interned
+    assert str(interned) == 'os_name == "nt"'
+
+
+def test_intern_cache_is_bounded_and_reports_hit_rate():
+    cache = requirementslib.models.markers.InternCache(Marker, maxsize=2, hash_cons=True)
+    first = cache.get("os_name == 'nt'")
+    assert cache.get("os_name == 'nt'") is first
+    cache.get("os_name == 'posix'")
+    cache.get("sys_platform == 'linux'")
+    info = cache.cache_info()
+    assert info.currsize == 2
+    assert (info.hits, info.misses) == (1, 3)
+    assert info.hit_rate == 0.25
+    assert cache.get("os_name == 'nt'") is not first
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 2, 0, 0.0)
+    assert set(requirementslib.models.markers.get_cache_info()) == {
+        "markers",
+        "specifiers",
+        "normalized_markers",
+        "specifier_markers",
+        "marker_expressions",
+        "pyversion_sets",
+        "contained_pyversions",
+    }
+
+
+@pytest.mark.parametrize(
+    "marker, expected",
+    [
+        (
+            'python_version >= "3.6" and python_version >= "3.7" and os_name == "nt"',
+            'python_version >= "3.7" and os_name == "nt"',
+        ),
+        (
+            '"linux" == sys_platform and sys_platform != "win32"',
+            'sys_platform == "linux"',
+        ),
+        (
+            '(python_version < "3.8" and os_name == "nt") or '
+            '(python_version >= "3.8" and os_name == "nt")',
+            'os_name == "nt"',
+        ),
+        (
+            'sys_platform == "linux" or (sys_platform == "linux" and extra == "tests")',
+            'sys_platform == "linux"',
+        ),
+        ('"arm" in platform_machine', '"arm" in platform_machine'),
+    ],
+)
+def test_marker_expression_simplifies(marker, expected):
+    expression = requirementslib.models.markers.get_marker_expression(marker)
+    assert str(expression) == expected
+    assert str(expression.as_marker()) == expected
+
+
+@pytest.mark.parametrize(
+    "marker, tautology, contradiction",
+    [
+        ('python_version < "3.7" or python_version >= "3.7"', True, False),
+        ('os_name == "nt" or os_name != "nt"', True, False),
+        ('os_name == "nt" and os_name == "posix"', False, True),
+        ('python_version > "3.7" and python_version <= "3.7"', False, True),
+        ('extra == "tests" and extra != "tests"', False, True),
+        # python_full_version can be a pre-release, which fails both comparisons
+        ('python_full_version < "3.7.0" or python_full_version >= "3.7.0"', False, False),
+        ('python_version >= "3.6" and sys_platform == "linux"', False, False),
+    ],
+)
+def test_marker_expression_satisfiability(marker, tautology, contradiction):
+    expression = requirementslib.models.markers.get_marker_expression(marker)
+    assert expression.is_tautology is tautology
+    assert expression.is_contradiction is contradiction
+
+
+def test_marker_expression_evaluates_many_environments():
+    marker = Marker(
+        '(python_version >= "3.7" and sys_platform == "linux") or os_name == "nt"'
+    )
+    expression = requirementslib.models.markers.MarkerExpression.from_marker(marker)
+    environments = [
+        {"python_version": version, "sys_platform": platform, "os_name": os_name}
+        for version in ("3.6", "3.7", "3.11")
+        for platform, os_name in (
+            ("linux", "posix"),
+            ("win32", "nt"),
+            ("darwin", "posix"),
+        )
+    ]
+    expected = [marker.evaluate(env) for env in environments]
+    assert expression.evaluate_many(environments) == expected
+    assert expression.evaluate(environments[1]) is True
+
+
+def test_merge_markers_does_not_grow():
+    markers = requirementslib.models.markers
+    marker = markers.get_marker("python_version >= '3.6' and os_name == 'nt'")
+    merged = marker
+    for _ in range(10):
+        merged = markers.merge_markers(merged, marker)
+    assert merged is marker
+    merged = markers.merge_markers(merged, "python_version >= '3.7'")
+    assert str(merged) == 'python_version >= "3.7" and os_name == "nt"'
+    never = markers.merge_markers("os_name == 'nt'", "os_name == 'posix'")
+    assert never.evaluate({"os_name": "nt"}) is False
+    always = markers.merge_markers(
+        "python_version >= '3.6' or python_version < '3.6'",
+        "os_name == 'nt' or os_name != 'nt'",
+    )
+    assert isinstance(always, Marker)
+    assert always.evaluate({"os_name": "nt", "python_version": "2.7"}) is True
+
+
+@pytest.mark.parametrize(
+    "m1, m2, expected",
+    [
+        (
+            "python_version < '3.7' and python_version < '3.6'",
+            "sys_platform != 'win32'",
+            'python_version < "3.6" and sys_platform != "win32"',
+        ),
+        (
+            "python_version == '3.*'",
+            "python_version < '3.10'",
+            'python_version == "3.*" and python_version < "3.10"',
+        ),
+    ],
+)
+def test_merge_markers_is_not_lossy(m1, m2, expected):
+    assert str(requirementslib.models.markers.merge_markers(m1, m2)) == expected
+
+
+MATRIX_MARKERS = [
+    'python_version < "3"',
+    None,
+    'sys_platform == "win32" or python_version >= "3.8"',
+    '"arm" in platform_machine and os_name == "posix"',
+    'python_full_version >= "3.8.1"',
+]
+MATRIX_ENVIRONMENTS = [
+    {
+        "python_version": version,
+        "python_full_version": "{0}.2".format(version),
+        "sys_platform": platform,
+        "platform_machine": machine,
+        "os_name": "nt" if platform == "win32" else "posix",
+    }
+    for version in ("2.7", "3.8", "3.11")
+    for platform in ("linux", "win32", "darwin")
+    for machine in ("x86_64", "arm64")
+]
+
+
+def test_compiled_markers_evaluate_environment_matrix():
+    compiled = requirementslib.models.markers.CompiledMarkers(MATRIX_MARKERS)
+    assert len(compiled) == 5
+    assert len(compiled.atoms) == 6
+    expected = [
+        [Marker(marker).evaluate(env) if marker else True for env in MATRIX_ENVIRONMENTS]
+        for marker in MATRIX_MARKERS
+    ]
+    assert compiled.evaluate(MATRIX_ENVIRONMENTS) == expected
+    assert compiled.evaluate(MATRIX_ENVIRONMENTS, use_numpy=False) == expected
+
+
+def test_compiled_markers_evaluate_with_numpy():
+    numpy = pytest.importorskip("numpy")
+    compiled = requirementslib.models.markers.CompiledMarkers(MATRIX_MARKERS)
+    matrix = compiled.evaluate(MATRIX_ENVIRONMENTS, use_numpy=True)
+    assert isinstance(matrix, numpy.ndarray)
+    assert matrix.shape == (5, len(MATRIX_ENVIRONMENTS))
+    assert matrix.tolist() == compiled.evaluate(MATRIX_ENVIRONMENTS, use_numpy=False)
+
+
+@pytest.mark.parametrize(
+    "specifier, contained, excluded",
+    [
+        (">=2.7,!=3.0.*,!=3.1.*", ["2.7", "3.2", "4.0"], ["2.6", "3.0.1", "3.1"]),
+        (
+            ">=3.6,<3.10,!=3.8.1",
+            ["3.6", "3.8.0", "3.8.2", "3.9.9"],
+            ["3.5", "3.8.1", "3.10"],
+        ),
+        ("~=3.7", ["3.7", "3.99"], ["3.6", "4.0"]),
+        ("!=3.0*", ["2.7", "3.1"], ["3.0", "3.0.4"]),
+        ("", ["1.0", "3.11"], []),
+    ],
+)
+def test_pyversion_set_from_specifier(specifier, contained, excluded):
+    pyversions = requirementslib.models.markers.get_pyversion_set(specifier)
+    assert requirementslib.models.markers.get_pyversion_set(specifier) is pyversions
+    assert all(version in pyversions for version in contained)
+    assert not any(version in pyversions for version in excluded)
+
+
+def test_pyversion_set_algebra():
+    get_pyversion_set = requirementslib.models.markers.get_pyversion_set
+    py2 = get_pyversion_set("<3")
+    py3 = get_pyversion_set(">=3.6")
+    assert str(py2 | py3) == "<3 || >=3.6"
+    assert (py2 & py3).is_empty
+    assert (py2 | ~py2).is_universal
+    assert ~(py2 | py3) == get_pyversion_set(">=3,<3.6")
+    assert str(get_pyversion_set(">=3.6") & get_pyversion_set("<3.10,!=3.8.1")) == (
+        ">=3.6,<3.8.1 || >3.8.1,<3.10"
+    )
+    assert (py2 | py3).as_specifierset() == SpecifierSet(
+        "!=3.0.*,!=3.1.*,!=3.2.*,!=3.3.*,!=3.4.*,!=3.5.*"
+    )
+
+
+@pytest.mark.parametrize(
+    "marker, pyversions",
+    [
+        (
+            "python_version < '3' or python_version >= '3.6'",
+            SpecifierSet("!=3.0.*,!=3.1.*,!=3.2.*,!=3.3.*,!=3.4.*,!=3.5.*"),
+        ),
+        (
+            "(python_version < '3.8' and sys_platform == 'win32') or python_version > '3.9'",
+            SpecifierSet("!=3.8.*,!=3.9.*"),
+        ),
+        (
+            "python_version == '2.7' or python_version == '3.4'",
+            SpecifierSet(">=2.7,<3.5,!=3.0.*,!=3.1.*,!=3.2.*,!=3.3.*"),
+        ),
+    ],
+)
+def test_get_pyversions_with_or(marker, pyversions):
+    assert requirementslib.models.markers.get_contained_pyversions(marker) == pyversions
+
+
+def test_contained_pyversions_are_not_shared():
+    markers = requirementslib.models.markers
+    marker = "python_version >= '3.6' and python_version < '4'"
+    specset = markers.get_contained_pyversions(marker)
+    specset._specs = frozenset()
+    assert markers.get_contained_pyversions(marker) == SpecifierSet(">=3.6,<4")
+    assert markers.get_contained_pyversions(marker) is not specset
+
+
+def test_marker_from_specifier_intersects_bounds():
+    markers = requirementslib.models.markers
+    assert str(markers.marker_from_specifier(">=2.7,>=3.6,<4")) == (
+        'python_version >= "3.6" and python_version < "4"'
+    )
@@ -1,6 +1,29 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+
 import pytest
+import requests
 
-from requirementslib.models.metadata import Package
+from requirementslib.models import metadata
+from requirementslib.models.cache import HTTPCache
+from requirementslib.models.metadata import (
+    Package,
+    ParsedTag,
+    Release,
+    ReleaseCollection,
+    _parse_tag,
+    _parse_wheel_tags,
+    add_markers_to_dep,
+    aget_package,
+    get_markers_from_tags,
+    get_package,
+    get_releases_from_package,
+    parse_wheel_tags,
+)
+from requirementslib.sessions import SESSION_MANAGER
 
 
 @pytest.mark.parametrize(
@@ -57,3 +80,218 @@ def test_metadata(monkeypatch_wheel_download, package_json):
         "vine==1.3.0",
         "zstandard",
     }
+
+
+FAKEPKG_METADATA = """Metadata-Version: 2.1
+Name: fakepkg
+Version: 1.0
+Requires-Python: >=3.6
+Requires-Dist: six
+Requires-Dist: requests (>=2.0) ; extra == 'http'
+"""
+FAKEPKG_METADATA_SHA256 = hashlib.sha256(FAKEPKG_METADATA.encode("utf-8")).hexdigest()
+
+
+@pytest.mark.parametrize(
+    "core_metadata, serve_metadata, uses_metadata_file",
+    [
+        (True, True, True),
+        ({"sha256": FAKEPKG_METADATA_SHA256}, True, True),
+        ({"sha256": "0" * 64}, True, False),
+        (True, False, False),
+        (None, True, False),
+    ],
+)
+def test_get_dependencies_prefers_metadata_file(
+    fake_index, core_metadata, serve_metadata, uses_metadata_file
+):
+    server, package_json = fake_index(
+        FAKEPKG_METADATA, core_metadata=core_metadata, serve_metadata=serve_metadata
+    )
+    package = Package.from_json(package_json).get_dependencies()
+    assert sorted(str(d.requirement) for d in package.dependencies) == [
+        "requests>=2.0",
+        "six",
+    ]
+    assert package.urls[0].requires_python == ">=3.6"
+    requested_metadata = any(p.endswith(".metadata") for p in server.requested_paths)
+    assert requested_metadata == (core_metadata is not None and serve_metadata)
+    # the wheel itself is only downloaded when the metadata file is unusable
+    requested_wheel = any(p.endswith(".whl") for p in server.requested_paths)
+    assert requested_wheel != uses_metadata_file
+
+
+FAKE_PYPI = {
+    "toplevel": {"1.0": ["middle>=1.0", "leaf"]},
+    "middle": {"1.0": ["leaf<2"], "1.1": ["leaf<2", "other[extra]"]},
+    "leaf": {"1.0": [], "1.5": [], "2.0": []},
+    "other": {"0.9": [], "1.0": ["leaf; extra == 'extra'"]},
+}
+
+
+def fake_pypi_json(name, version):
+    def release_url(version):
+        digest = hashlib.sha256("{0}-{1}".format(name, version).encode()).hexdigest()
+        filename = "{0}-{1}-py3-none-any.whl".format(name, version)
+        day = sorted(FAKE_PYPI[name]).index(version) + 1
+        return {
+            "digests": {"md5": digest[:32], "sha256": digest},
+            "filename": filename,
+            "md5_digest": digest[:32],
+            "packagetype": "bdist_wheel",
+            "python_version": "py3",
+            "size": 1,
+            "upload_time": "2020-01-0{0}T00:00:00".format(day),
+            "upload_time_iso_8601": "2020-01-0{0}T00:00:00Z".format(day),
+            "url": "https://files.example.com/{0}".format(filename),
+            "core-metadata": True,
+        }
+
+    return {
+        "info": {
+            "name": name,
+            "version": version,
+            "package_url": "https://pypi.org/project/{0}".format(name),
+            "requires_dist": FAKE_PYPI[name][version],
+        },
+        "last_serial": 1,
+        "releases": {v: [release_url(v)] for v in FAKE_PYPI[name]},
+        "urls": [release_url(version)],
+    }
+
+
+class FakePyPIAdapter(requests.adapters.BaseAdapter):
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+
+    def send(self, request, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.requests += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.02)
+            response = requests.Response()
+            response.url = request.url
+            response.request = request
+            response.status_code = 200
+            if request.path_url.endswith(".metadata"):
+                name, version = request.path_url.strip("/").split("-")[:2]
+                lines = ["Metadata-Version: 2.1", "Name: " + name, "Version: " + version]
+                lines += ["Requires-Dist: " + r for r in FAKE_PYPI[name][version]]
+                response._content = "\n".join(lines).encode()
+                return response
+            parts = request.path_url.strip("/").split("/")[1:-1]
+            if parts[0] not in FAKE_PYPI:
+                response.status_code = 404
+                response._content = b"{}"
+                return response
+            name = parts[0]
+            version = parts[1] if len(parts) > 1 else max(FAKE_PYPI[name])
+            response._content = json.dumps(fake_pypi_json(name, version)).encode()
+            return response
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_pypi(monkeypatch, pathlib_tmpdir):
+    adapter = FakePyPIAdapter()
+    adapter.cache = HTTPCache(cache_dir=pathlib_tmpdir, max_size=0)
+    monkeypatch.setattr(metadata, "HTTP_CACHE", adapter.cache)
+    session = requests.Session()
+    session.mount("https://pypi.org/", adapter)
+    session.mount("https://files.example.com/", adapter)
+    with SESSION_MANAGER.use_session(session):
+        yield adapter
+
+
+def test_aget_latest_lockfile_matches_sync(fake_pypi):
+    expected = get_package("toplevel").get_latest_lockfile()
+    sync_requests = fake_pypi.requests
+    assert fake_pypi.max_in_flight == 1
+    fake_pypi.requests = 0
+    fake_pypi.cache.clear_memo()
+    package = asyncio.run(aget_package("toplevel"))
+    result = asyncio.run(package.aget_latest_lockfile(concurrency=4))
+    assert result == expected
+    assert list(result) == list(expected)
+    assert fake_pypi.requests == sync_requests
+    assert 1 < fake_pypi.max_in_flight <= 4
+
+
+@pytest.mark.parametrize("package_json", [{"name": "llvmlite"}], indirect=True)
+def test_release_collection_is_lazy(package_json):
+    package = Package.from_json(package_json)
+    releases = package.releases
+    assert len(releases) == len(package_json["releases"])
+    assert not any(isinstance(r, Release) for r in releases._index.values())
+    assert "0.30.0" in releases
+    assert releases.sorted_versions()[0] == "0.30.0"
+    assert releases.get_latest_lockfile()["version"] == "==0.30.0"
+    assert releases["0.29.0"].version == "0.29.0"
+    parsed = [v for v, r in releases._index.items() if isinstance(r, Release)]
+    assert sorted(parsed) == ["0.29.0", "0.30.0"]
+    with pytest.raises(KeyError):
+        releases["0.0.0"]
+    eager = ReleaseCollection(
+        releases=get_releases_from_package(package_json["releases"], name="llvmlite")
+    )
+    assert releases == eager
+    assert [r.version for r in releases.sort_releases()] == [
+        r.version for r in eager.sort_releases()
+    ]
+
+
+@pytest.mark.parametrize(
+    "dep, marker, expected",
+    [
+        (
+            'foo; python_version >= "3.6"',
+            'os_name == "nt"',
+            'foo; python_version >= "3.6" and os_name == "nt"',
+        ),
+        (
+            'foo; python_version >= "3.6" or python_version < "3.6"',
+            'os_name == "nt" or os_name != "nt"',
+            'foo; (python_version >= "3.6" or python_version < "3.6") and '
+            '(os_name == "nt" or os_name != "nt")',
+        ),
+    ],
+)
+def test_add_markers_to_dep(dep, marker, expected):
+    assert add_markers_to_dep(dep, marker) == expected
+
+
+def test_parse_wheel_tags_is_memoized():
+    parse_wheel_tags("pkg-1.0-cp37-cp37m-manylinux1_x86_64.whl")
+    wheel_hits = _parse_wheel_tags.cache_info().hits
+    tags = parse_wheel_tags(
+        "https://example.com/other-2.0-cp37-cp37m-manylinux1_x86_64.whl"
+    )
+    assert _parse_wheel_tags.cache_info().hits == wheel_hits + 1
+    tag_hits = _parse_tag.cache_info().hits
+    parse_wheel_tags("pkg-1.0-cp36.cp37-cp37m-manylinux1_x86_64.whl")
+    assert _parse_tag.cache_info().hits == tag_hits + 1
+    assert tags == (
+        ParsedTag(
+            marker_string=(
+                'platform_system == "Linux" and python_version >= "3.7" '
+                'and python_version < "3.8"'
+            ),
+            python_version="3.7",
+            platform_system="Linux",
+            abi="cp37m",
+        ),
+    )
+    assert get_markers_from_tags(tags) == tags[0].marker_string
+    universal = parse_wheel_tags("pkg-1.0-py2.py3-none-any.whl")
+    assert get_markers_from_tags(universal) == ""
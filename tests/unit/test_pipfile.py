@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 import itertools
+import multiprocessing
 from pathlib import Path
 
 import pytest
 
 from requirementslib.exceptions import RequirementError
+from requirementslib.fileutils import cd
 from requirementslib.models.lockfile import Lockfile
 from requirementslib.models.pipfile import Pipfile
 
@@ -64,3 +66,40 @@ def test_failures(pathlib_tmpdir):
     project_dir.mkdir()
     with pytest.raises(RequirementError):
         Pipfile.load_projectfile(project_dir, create=False)
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_pipfile_parallel_setup_info(monkeypatch, pathlib_tmpdir, start_method):
+    if start_method not in multiprocessing.get_all_start_methods():
+        pytest.skip("{0} is not available on this platform".format(start_method))
+    get_context = multiprocessing.get_context
+    monkeypatch.setattr(
+        multiprocessing, "get_context", lambda method=None: get_context(start_method)
+    )
+    for name in ("alpha", "beta"):
+        project = pathlib_tmpdir.joinpath(name)
+        project.mkdir()
+        project.joinpath("setup.py").write_text(
+            "from setuptools import setup\n"
+            "setup(name={0!r}, version='1.0', install_requires=['six'])\n".format(name)
+        )
+    pipfile_path = pathlib_tmpdir.joinpath("Pipfile")
+    pipfile_path.write_text(
+        "[packages]\n"
+        'alpha = {path = "./alpha", editable = true}\n'
+        'requests = "*"\n'
+        'beta = {path = "./beta"}\n'
+    )
+    with cd(pathlib_tmpdir.as_posix()):
+        serial = Pipfile.load(pipfile_path.as_posix())
+        parallel = Pipfile.load(pipfile_path.as_posix(), parallel=True, max_workers=2)
+        assert parallel._parallel is True
+        assert "parallel" not in parallel.dict()
+        assert [r.name for r in parallel.requirements] == ["alpha", "requests", "beta"]
+        assert [r.as_pipfile() for r in parallel.requirements] == [
+            r.as_pipfile() for r in serial.requirements
+        ]
+        assert parallel.requirements[0].req.setup_info.name == "alpha"
+        beta = parallel.requirements[2].req.setup_info
+        assert beta.name == "beta"
+        assert Path(beta.base_dir).joinpath("setup.py").exists()
@@ -0,0 +1,90 @@
+import pytest
+
+from requirementslib.models.records import RequirementRecord
+from requirementslib.models.requirements import Requirement
+
+HASHES = [
+    "sha256:f7b7ce16570fe9965acd6d30101a28f62fb4a7f9e926b3bbc9b61f8b04247e72",
+    "sha256:6f62d78e2f89b4500b080fe3a81690850cd254227f27f75c3a0c491a1f351ba7",
+]
+
+
+@pytest.mark.parametrize(
+    "name, entry",
+    [
+        ("six", "*"),
+        ("six", "==1.16.0"),
+        ("requests", {"version": "==2.28.1", "extras": ["socks", "security"]}),
+        ("attrs", {"version": "==22.1.0", "hashes": HASHES, "index": "pypi"}),
+        (
+            "enum34",
+            {
+                "version": "==1.1.10",
+                "markers": "python_version < '3.4'",
+                "hashes": HASHES,
+            },
+        ),
+    ],
+)
+def test_record_matches_requirement(name, entry):
+    record = RequirementRecord.from_pipfile(name, entry)
+    requirement = Requirement.from_pipfile(name, entry)
+    assert record.as_line() == requirement.as_line()
+    assert record.as_line(include_hashes=False) == requirement.as_line(
+        include_hashes=False
+    )
+    assert RequirementRecord.from_requirement(requirement) == record
+    assert RequirementRecord.from_requirement(record.as_requirement()) == record
+    assert RequirementRecord.from_pipfile(*record.as_pipfile().popitem()) == record
+
+
+@pytest.mark.parametrize(
+    "name, entry",
+    [
+        ("Django", {"version": ">=3.0, <4.0"}),
+        ("six", {"version": "==1.16.0", "markers": 'python_version >= "3.7"'}),
+        ("Foo_Bar", {"version": "== 1.0", "extras": ["Socks", "a"]}),
+        ("Pkg.Name", {"version": "~=1.0", "sys_platform": '== "win32"'}),
+        ("pkg", {"version": "*", "markers": "os_name=='nt' and python_version<'3'"}),
+        ("PyYAML", {"version": ">= 5.1 , != 5.2.*", "hashes": HASHES}),
+    ],
+)
+def test_record_line_normalization(name, entry):
+    record = RequirementRecord.from_pipfile(name, entry)
+    requirement = Requirement.from_pipfile(name, entry)
+    for include_hashes in (True, False):
+        assert record.as_line(include_hashes=include_hashes) == requirement.as_line(
+            include_hashes=include_hashes
+        )
+    assert record.as_line(include_markers=False) == requirement.as_line(
+        include_markers=False
+    )
+
+
+def test_record_folds_pipenv_markers():
+    record = RequirementRecord.from_pipfile(
+        "pywin32", {"version": "==305", "sys_platform": "== 'win32'", "index": "pypi"}
+    )
+    assert record.markers == "sys_platform == 'win32'"
+    assert record.source == (("index", "pypi"),)
+    assert record.index == "pypi"
+    assert record.is_named and not record.editable and not record.is_vcs
+    assert record.as_line() == "pywin32==305 ; sys_platform == 'win32'"
+
+
+def test_record_is_immutable():
+    record = RequirementRecord.from_pipfile("six", "==1.16.0")
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.specifier = "==1.15.0"
+    assert hash(record) == hash(RequirementRecord.from_pipfile("six", "==1.16.0"))
+
+
+def test_record_locations():
+    editable = RequirementRecord.from_pipfile("pkg", {"path": ".", "editable": True})
+    assert not editable.is_named and editable.editable
+    assert editable.as_line() == "-e ."
+    vcs = RequirementRecord.from_pipfile(
+        "pkg", {"git": "https://github.com/example/pkg.git", "ref": "main"}
+    )
+    assert vcs.is_vcs and not vcs.is_named
@@ -0,0 +1,59 @@
+import pytest
+import requests
+
+from requirementslib.fileutils import open_file
+from requirementslib.models.metadata import get_remote_metadata_sidecar
+from requirementslib.sessions import SESSION_MANAGER, SessionManager, get_session
+
+
+def test_session_manager_reuses_session():
+    manager = SessionManager(pool_size=2, timeout=5)
+    session = manager.session
+    assert manager.session is session
+    assert session.timeout == 5
+    adapter = session.get_adapter("https://pypi.org")
+    assert adapter._pool_maxsize == 2
+    assert adapter.max_retries.total == manager.retries
+    manager.close()
+    assert manager.session is not session
+
+
+def test_open_file_reuses_connections(http_file_server, pathlib_tmpdir):
+    pathlib_tmpdir.joinpath("blob.bin").write_bytes(b"x" * 4096)
+    server = http_file_server(pathlib_tmpdir)
+    with SESSION_MANAGER.use_session(SessionManager().create_session()) as session:
+        for _ in range(5):
+            with open_file(server.url + "/blob.bin") as fp:
+                assert fp.read() == b"x" * 4096
+        session.close()
+    assert server.connections == 1
+
+
+@pytest.mark.parametrize("failures, expected_status", [(2, 200), (5, 503)])
+def test_session_retries_with_backoff(
+    http_file_server, pathlib_tmpdir, failures, expected_status
+):
+    pathlib_tmpdir.joinpath("blob.bin").write_bytes(b"content")
+    server = http_file_server(pathlib_tmpdir, failures=failures)
+    manager = SessionManager(retries=3, backoff_factor=0)
+    with manager.session.get(server.url + "/blob.bin") as resp:
+        assert resp.status_code == expected_status
+    manager.close()
+
+
+def test_injected_session_is_used():
+    class RecordingSession(requests.Session):
+        def __init__(self):
+            super().__init__()
+            self.urls = []
+
+        def get(self, url, **kwargs):
+            self.urls.append(url)
+            raise requests.exceptions.ConnectionError(url)
+
+    session = RecordingSession()
+    with SESSION_MANAGER.use_session(session):
+        assert get_session() is session
+        assert get_remote_metadata_sidecar("https://example.com/pkg.whl") is None
+    assert get_session() is not session
+    assert session.urls == ["https://example.com/pkg.whl.metadata"]
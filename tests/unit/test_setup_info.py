@@ -7,7 +7,7 @@ import pytest
 
 import requirementslib.fileutils
 from requirementslib.models.requirements import Requirement
-from requirementslib.models.setup_info import ast_parse_setup_py
+from requirementslib.models.setup_info import SetupInfo, ast_parse_setup_py
 
 
 @pytest.mark.skipif(os.name == "nt", reason="Building this is broken on windows")
@@ -187,6 +187,213 @@ def test_extras(pathlib_tmpdir, setup_py_dir, setup_py_name, extras, dependencie
         assert sorted(list(setup_dict.get("requires").keys())) == dependencies
 
 
+def _parse_local_setup_info(pathlib_tmpdir, setup_py, setup_cfg=None):
+    setup_dir = pathlib_tmpdir.joinpath("static-package")
+    setup_dir.mkdir()
+    setup_dir.joinpath("setup.py").write_text(setup_py)
+    if setup_cfg is not None:
+        setup_dir.joinpath("setup.cfg").write_text(setup_cfg)
+    with requirementslib.fileutils.cd(pathlib_tmpdir.as_posix()):
+        r = Requirement.from_pipfile("static-package", {"path": "./static-package"})
+        r.req.parse_setup_info()
+        return r.req.setup_info
+
+
+def _fail_setup(self):
+    raise AssertionError("setup.py should not have been run")
+
+
+def test_static_metadata_skips_setup(pathlib_tmpdir, monkeypatch):
+    monkeypatch.setattr(SetupInfo, "run_setup", _fail_setup)
+    monkeypatch.setattr(SetupInfo, "build", _fail_setup)
+    setup_info = _parse_local_setup_info(
+        pathlib_tmpdir,
+        """
+from setuptools import setup
+
+setup(
+    name="static-package",
+    version="1.2.0",
+    install_requires=["six"],
+    extras_require={"socks": ["pysocks"]},
+)
+""",
+    )
+    setup_info.get_info()
+    setup_dict = setup_info.as_dict()
+    assert setup_dict["name"] == "static-package"
+    assert setup_dict["version"] == "1.2.0"
+    assert sorted(setup_dict["requires"]) == ["six"]
+    assert list(setup_dict["extras"]) == ["socks"]
+    assert setup_info.metadata == ("name", "static-package", "version", "1.2.0")
+
+
+def test_static_project_metadata_skips_backend(pathlib_tmpdir, monkeypatch):
+    monkeypatch.setattr(SetupInfo, "run_setup", _fail_setup)
+    monkeypatch.setattr(SetupInfo, "build", _fail_setup)
+    project_dir = pathlib_tmpdir.joinpath("static-package")
+    project_dir.mkdir()
+    project_dir.joinpath("pyproject.toml").write_text(
+        """
+[build-system]
+requires = ["hatchling"]
+build-backend = "hatchling.build"
+
+[project]
+name = "static-package"
+version = "2.0.0"
+dependencies = ["six", "attrs>=21"]
+
+[project.optional-dependencies]
+socks = ["pysocks"]
+"""
+    )
+    with requirementslib.fileutils.cd(pathlib_tmpdir.as_posix()):
+        r = Requirement.from_pipfile("static-package", {"path": "./static-package"})
+        r.req.parse_setup_info()
+        setup_info = r.req.setup_info
+    setup_info.get_info()
+    setup_dict = setup_info.as_dict()
+    assert setup_info.build_backend == "hatchling.build"
+    assert setup_dict["version"] == "2.0.0"
+    assert sorted(setup_dict["requires"]) == ["attrs", "six"]
+    assert list(setup_dict["extras"]) == ["socks"]
+
+
+@pytest.mark.parametrize(
+    "setup_py, setup_cfg",
+    [
+        (
+            "from setuptools import setup\nsetup(name='static-package', "
+            "version=get_version(), install_requires=['six'])\n",
+            None,
+        ),
+        (
+            "from setuptools import setup\nsetup()\n",
+            "[metadata]\nname = static-package\nversion = attr: pkg.__version__\n",
+        ),
+        (
+            "from setuptools import setup\ndeps = ['requests']\ndeps.append('six')\n"
+            "setup(name='static-package', version='1.0', install_requires=deps)\n",
+            None,
+        ),
+        (
+            "from setuptools import setup\ndeps = ['requests']\ndeps += ['six']\n"
+            "setup(name='static-package', version='1.0', install_requires=deps)\n",
+            None,
+        ),
+        (
+            "from setuptools import setup\nextras = {'socks': ['pysocks']}\n"
+            "extras['tests'] = ['pytest']\n"
+            "setup(name='static-package', version='1.0', extras_require=extras)\n",
+            None,
+        ),
+        (
+            "from setuptools import setup\nNAME = 'static-package'\n"
+            "setup(name=NAME, version='1.0', install_requires=['six', NAME])\n",
+            None,
+        ),
+    ],
+)
+def test_static_metadata_incomplete(pathlib_tmpdir, setup_py, setup_cfg):
+    setup_info = _parse_local_setup_info(pathlib_tmpdir, setup_py, setup_cfg)
+    assert setup_info.get_static_metadata() is None
+    assert not setup_info._static_metadata
+
+
+def test_static_metadata_reads_unchanged_variables(pathlib_tmpdir):
+    setup_info = _parse_local_setup_info(
+        pathlib_tmpdir,
+        """
+from setuptools import setup
+
+deps = ["requests", "six"]
+with open("README.md") as fh:
+    long_description = fh.read()
+
+setup(
+    name="static-package",
+    version="1.0",
+    install_requires=deps,
+    long_description=long_description,
+)
+""",
+    )
+    assert setup_info.get_static_metadata()["install_requires"] == ["requests", "six"]
+
+
+def test_static_metadata_dynamic_dependencies(pathlib_tmpdir):
+    project_dir = pathlib_tmpdir.joinpath("static-package")
+    project_dir.mkdir()
+    project_dir.joinpath("requirements.txt").write_text("six>=1.0\n")
+    project_dir.joinpath("pyproject.toml").write_text(
+        """
+[build-system]
+requires = ["setuptools>=61"]
+build-backend = "setuptools.build_meta"
+
+[project]
+name = "static-package"
+version = "1.0.0"
+dynamic = ["dependencies"]
+
+[tool.setuptools]
+py-modules = []
+
+[tool.setuptools.dynamic]
+dependencies = {file = ["requirements.txt"]}
+"""
+    )
+    with requirementslib.fileutils.cd(pathlib_tmpdir.as_posix()):
+        r = Requirement.from_pipfile("static-package", {"path": "./static-package"})
+        r.req.parse_setup_info()
+        setup_info = r.req.setup_info
+    assert setup_info.get_static_metadata() is None
+    assert not setup_info._static_metadata
+    setup_info._is_built = False
+    setup_info.build()
+    assert sorted(setup_info.as_dict()["requires"]) == ["six"]
+
+
+def test_static_metadata_disabled(pathlib_tmpdir, monkeypatch):
+    monkeypatch.setattr(
+        "requirementslib.models.setup_info.REQUIREMENTSLIB_STATIC_METADATA", False
+    )
+    setup_info = _parse_local_setup_info(
+        pathlib_tmpdir,
+        "from setuptools import setup\nsetup(name='static-package', version='1.0')\n",
+    )
+    assert not setup_info._static_metadata
+    assert setup_info.version == "1.0"
+
+
+def test_build_prepares_metadata_without_wheel(pathlib_tmpdir, monkeypatch):
+    monkeypatch.setattr(SetupInfo, "build_wheel", _fail_setup)
+    setup_info = _parse_local_setup_info(
+        pathlib_tmpdir,
+        """
+from setuptools import setup
+
+def get_version():
+    return "3.1"
+
+setup(
+    name="static-package",
+    version=get_version(),
+    install_requires=["six"],
+    extras_require={"socks": ["pysocks"]},
+)
+""",
+    )
+    assert not setup_info._static_metadata
+    setup_info._is_built = False
+    setup_info.build()
+    assert setup_info.version == "3.1"
+    assert sorted(setup_info.as_dict()["requires"]) == ["six"]
+    socks = [item for item in setup_info.metadata if item[:1] == ("socks",)]
+    assert [str(req) for req in socks[0][1]] == ["pysocks"]
+
+
 def test_ast_parser_finds_variables(setup_py_dir):
     target = setup_py_dir.joinpath("package_with_extras_as_variable/setup.py").as_posix()
     parsed = ast_parse_setup_py(target)
@@ -3,6 +3,7 @@ import os
 from pathlib import Path
 
 import pytest
+from pip._vendor.packaging.specifiers import SpecifierSet
 
 from requirementslib import utils as base_utils
 from requirementslib.models import utils
@@ -45,6 +46,13 @@ def test_extras_to_string():
     assert utils.extras_to_string(["security"]) == "[security]"
 
 
+def test_specs_to_string():
+    assert utils.specs_to_string(">=5.1, !=5.2.*") == ">=5.1, !=5.2.*"
+    assert utils.specs_to_string([(">=", "5.1"), ("!=", "5.2.*")]) == ">=5.1,!=5.2.*"
+    for specs in (">=5.1,!=5.2.*", "!=5.2.*,>=5.1", " != 5.2.* , >= 5.1 "):
+        assert utils.specs_to_string(SpecifierSet(specs)) == "!=5.2.*,>=5.1"
+
+
 def test_build_vcs_uri():
     uri = utils.build_vcs_uri(
         "git",
@@ -247,3 +255,69 @@ def test_expand_env_variables():
         assert expand_env_variables("echo ${FOO} ${BAR}") == "echo foo ${BAR}"
         assert expand_env_variables("echo %FOO%") == "echo %FOO%"
         assert expand_env_variables("echo $FOO") == "echo $FOO"
+
+
+def test_merge_items():
+    default = {"six": "*", "requests": {"version": "==2.0", "extras": ["socks"]}}
+    develop = {"requests": {"extras": ["security"], "index": "pypi"}, "pytest": "*"}
+    merged = base_utils.merge_items([default, develop])
+    assert merged == {
+        "six": "*",
+        "requests": {
+            "version": "==2.0",
+            "extras": ["socks", "security"],
+            "index": "pypi",
+        },
+        "pytest": "*",
+    }
+    assert list(merged) == ["six", "requests", "pytest"]
+    assert default["requests"]["extras"] == ["socks"]
+    assert merged["requests"] is not default["requests"]
+    assert base_utils.merge_items([{"a": (1, 2)}, {"a": (3,)}]) == {"a": (3,)}
+
+
+def test_merge_items_sourced():
+    merged, sources = base_utils.merge_items(
+        [("default", {"six": {"version": "*"}}), ("develop", {"six": {"index": "x"}})],
+        sourced=True,
+    )
+    assert merged == {"six": {"version": "*", "index": "x"}}
+    assert sources == {
+        ("six",): "develop",
+        ("six", "version"): "default",
+        ("six", "index"): "develop",
+    }
+
+
+def test_get_pyproject_metadata(tmpdir):
+    project_dir = Path(tmpdir.strpath)
+    assert utils.get_pyproject_metadata(project_dir) is None
+    pyproject = project_dir.joinpath("pyproject.toml")
+    pyproject.write_text('[build-system]\nrequires = ["hatchling"]\n')
+    assert utils.get_pyproject_metadata(project_dir) is None
+    pyproject.write_text(
+        "\n".join(
+            [
+                "[project]",
+                'name = "example"',
+                'version = "1.0"',
+                'requires-python = ">=3.7"',
+                'dependencies = ["six"]',
+                'dynamic = ["optional-dependencies"]',
+            ]
+        )
+    )
+    assert utils.get_pyproject_metadata(pyproject) == (
+        {
+            "name": "example",
+            "version": "1.0",
+            "install_requires": ["six"],
+            "python_requires": ">=3.7",
+        },
+        {"extras_require"},
+    )
+    pyproject.write_text('[project]\nname = "example"\ndynamic = ["version"]\n')
+    assert utils.get_pyproject_metadata(project_dir) == (
+        {"name": "example", "install_requires": [], "extras_require": {}},
+        {"version"},
+    )